@@ -241,6 +241,19 @@ else:
         'default': db_config
     }
 
+# The default cache is in process. The shared cache is used across processes for public responses and
+# the jobs version (see jvapp.utils.response_cache). Any Django cache backend can be used (e.g. memcached)
+# The database cache table is created by a migration (or with "python manage.py createcachetable")
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': env('SHARED_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': env('SHARED_CACHE_LOCATION', default='jvapp_shared_cache'),
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 AUTH_USER_MODEL = 'jvapp.JobVyneUser'
@@ -468,6 +481,9 @@ else:
     LEVER_REDIRECT_BASE = 'https://auth.lever.co/authorize'
     LEVER_AUTH_TOKEN_URL = 'https://auth.lever.co/oauth/token'
 
+# Page views are saved in batches from a background thread. Disable to save them on the request thread
+IS_PAGE_VIEW_BUFFERED = env('IS_PAGE_VIEW_BUFFERED', cast=bool, default=True)
+
 CELERY_BROKER_URL = 'pyamqp://rabbitmq:5672'
 CELERY_RESULT_BACKEND = 'django-db'
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
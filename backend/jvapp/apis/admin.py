@@ -24,6 +24,8 @@ from jvapp.serializers.user import get_serialized_user
 from jvapp.tasks import task_run_job_scrapers
 from jvapp.utils.data import AttributeCfg, coerce_bool, set_object_attributes
 from jvapp.utils.datetime import get_datetime_format_or_none
+from jvapp.utils.job_search import refresh_job_search
+from jvapp.utils.response_cache import response_cache
 from jvapp.utils.taxonomy import get_standardized_job_taxonomy, run_job_title_standardization, update_taxonomies
 from scrape.custom_scraper.workableAts import parse_workable_xml_jobs
 from scrape.scraper import run_job_scrapers
@@ -121,7 +123,8 @@ class AdminJobScrapersView(JobVyneAPIView):
         if is_run_workable:
             parse_workable_xml_jobs()
         else:
-            run_job_scrapers(employer_names=None if is_run_all else employer_names)
+            # Don't spawn worker processes from within a web request
+            run_job_scrapers(employer_names=None if is_run_all else employer_names, is_use_processes=False)
         # res = task_run_job_scrapers.delay(employer_names=employer_names)
         # logger.info(f'Sent add task: ID = {res.id}')
         return Response(status=status.HTTP_200_OK, data={
@@ -340,16 +343,26 @@ class AdminUserCreatedJobApprovalView(JobVyneAPIView):
             job.is_job_approved = is_approved
         
         EmployerJob.objects.bulk_update(jobs, ['is_job_approved'])
+        refresh_job_search(job_filter=Q(id__in=job_ids))
         
         return get_success_response(f'{len(jobs)} jobs were {"approved" if is_approved else "un-approved"}')
     
     
+class AdminResponseCacheView(JobVyneAPIView):
+    permission_classes = [IsAdmin]
+    
+    def get(self, request):
+        # Stats are for the process that handles this request
+        return Response(status=status.HTTP_200_OK, data=response_cache.get_stats())
+    
+    
 class AdminTaxonomyView(JobVyneAPIView):
     permission_classes = [IsAdmin]
     
     def post(self, request):
         update_taxonomies()
         run_job_title_standardization(is_non_standardized_only=not self.data['is_run_all'])
+        refresh_job_search()
         return get_success_response('Taxonomy updated')
     
     
@@ -4,9 +4,11 @@ import hmac
 import json
 import logging
 import re
+import threading
+import time
 import urllib.parse
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
 import requests
 from celery import shared_task
@@ -29,9 +31,10 @@ from jvapp.permissions.employer import IsAdminOrEmployerPermission
 from jvapp.utils.data import coerce_int
 from jvapp.utils.datetime import get_datetime_from_unix, get_datetime_or_none, get_unix_datetime
 from jvapp.utils.file import get_file_name, get_mime_from_file_path, get_safe_file_path
+from jvapp.utils.job_search import refresh_job_search
 from jvapp.utils.money import merge_compensation_data, parse_compensation_text
 from jvapp.utils.response import is_good_response
-from jvapp.utils.sanitize import sanitize_html
+from jvapp.utils.sanitize import get_sanitize_key, sanitize_html_many
 from jvapp.utils.taxonomy import run_job_title_standardization
 
 logger = logging.getLogger(__name__)
@@ -77,6 +80,52 @@ class JobData:
     locations: list = None
 
 
+@dataclass
+class AtsChanges:
+    sync_dt: datetime
+    jobs: list = None  # None if jobs couldn't be fetched
+    # ATS keys of jobs that closed since the last sync
+    # None for a full sync, where any job that isn't in the jobs list is closed
+    closed_job_keys: list = None
+    application_statuses: dict = None  # None if application statuses weren't fetched
+    jobs_error: Exception = None
+    applications_error: Exception = None
+    
+    @property
+    def is_full_jobs_sync(self):
+        return self.closed_job_keys is None
+
+
+class RequestRateLimiter:
+    """Spaces out requests so they stay under an ATS rate limit. Thread safe
+    """
+    
+    def __init__(self, requests_per_second):
+        self.interval_seconds = 1 / requests_per_second
+        self.next_request_ts = 0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            wait_seconds = self.next_request_ts - now
+            self.next_request_ts = max(now, self.next_request_ts) + self.interval_seconds
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+# ATS rate limits apply to each API key so there is one limiter per ATS connection
+rate_limiters = {}
+rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(ats_cfg, requests_per_second):
+    with rate_limiters_lock:
+        if not (rate_limiter := rate_limiters.get(ats_cfg.id)):
+            rate_limiter = rate_limiters[ats_cfg.id] = RequestRateLimiter(requests_per_second)
+        return rate_limiter
+
+
 def is_response_object(obj):
     return isinstance(obj, requests.Response)
 
@@ -86,15 +135,24 @@ class BaseAts:
     BATCH_SIZE = 500
     JOBVYNE_TAG = 'JOBVYNE'
     DEFAULT_APP_LOOKBACK_DAYS = 120  # Number of days to pull applications for status updates
+    REQUESTS_PER_SECOND = 5
+    # Changes are pulled from a little before the last sync in case the ATS and server clocks differ
+    SYNC_OVERLAP_MINUTES = 10
+    # Incremental syncs can miss deleted jobs so all jobs are pulled periodically
+    FULL_SYNC_HOURS = 24
     
     def __init__(self, ats_cfg):
         self.ats_cfg = ats_cfg
         self.location_parser = LocationParser()
+        self.rate_limiter = get_rate_limiter(ats_cfg, self.REQUESTS_PER_SECOND)
         self.ats_user_id = self.get_ats_user_id()
     
     def get_request_headers(self):
         return {}
     
+    def wait_for_rate_limit(self):
+        self.rate_limiter.wait()
+    
     @staticmethod
     def get_resp_data(resp):
         return json.loads(resp.text)
@@ -107,13 +165,19 @@ class BaseAts:
             JobApplication.objects.filter(employer_job__employer_id=self.ats_cfg.employer_id, created_dt__gte=start_dt)
         }
     
-    def get_current_jobs(self):
+    def get_current_jobs(self, ats_job_keys=None):
+        """
+        :param ats_job_keys: If provided, only the jobs with these ATS keys are loaded
+        """
+        job_filter = Q(employer_id=self.ats_cfg.employer_id)
+        if ats_job_keys is not None:
+            job_filter &= Q(ats_job_key__in=ats_job_keys)
         return {
             job.ats_job_key or f'JOBVYNE-{job.id}': job
             for job in
             EmployerJob.objects
                 .prefetch_related('locations')
-                .filter(employer_id=self.ats_cfg.employer_id)
+                .filter(job_filter)
         }
     
     def get_job_departments(self):
@@ -171,21 +235,119 @@ class BaseAts:
     def refresh_ats_credentials(self):
         raise NotImplementedError()
     
-    def save_jobs(self, jobs):
-        current_jobs = self.get_current_jobs()
+    def get_jobs(self):
+        raise NotImplementedError()
+    
+    def get_job_changes(self, updated_after):
+        """
+        :return: Jobs that are open and changed after updated_after and the ATS keys of jobs that closed.
+        The closed job keys are None if the ATS returned all open jobs instead
+        """
+        raise NotImplementedError()
+    
+    def get_application_statuses(self, updated_after=None):
+        raise NotImplementedError()
+    
+    def is_application_webhook_enabled(self):
+        # Application statuses are pushed by the ATS so they only need to be pulled during a full sync
+        return False
+    
+    def get_sync_start_dt(self, sync_dt):
+        return sync_dt - timedelta(minutes=self.SYNC_OVERLAP_MINUTES)
+    
+    def is_full_jobs_sync_due(self, sync_dt):
+        return (
+            not (self.ats_cfg.jobs_sync_dt and self.ats_cfg.jobs_full_sync_dt)
+            or sync_dt - self.ats_cfg.jobs_full_sync_dt >= timedelta(hours=self.FULL_SYNC_HOURS)
+        )
+    
+    def fetch_changes(self, is_full_sync=False):
+        """Pull the jobs and application statuses that changed since the last sync
+        Only ATS requests are made so this can run in a worker thread
+        """
+        changes = AtsChanges(sync_dt=timezone.now())
+        try:
+            if is_full_sync or self.is_full_jobs_sync_due(changes.sync_dt):
+                changes.jobs = self.get_jobs()
+            else:
+                changes.jobs, changes.closed_job_keys = self.get_job_changes(
+                    self.get_sync_start_dt(self.ats_cfg.jobs_sync_dt)
+                )
+        except Exception as e:
+            changes.jobs_error = e
+        
+        if is_full_sync or not self.is_application_webhook_enabled():
+            updated_after = None
+            if (not is_full_sync) and self.ats_cfg.applications_sync_dt:
+                updated_after = max(
+                    self.get_sync_start_dt(self.ats_cfg.applications_sync_dt),
+                    changes.sync_dt - timedelta(days=self.DEFAULT_APP_LOOKBACK_DAYS)
+                )
+            try:
+                changes.application_statuses = self.get_application_statuses(updated_after=updated_after)
+            except Exception as e:
+                changes.applications_error = e
+        
+        return changes
+    
+    def save_job_changes(self, changes):
+        self.save_jobs(changes.jobs, closed_job_keys=changes.closed_job_keys)
+        sync_fields = {'jobs_sync_dt': changes.sync_dt}
+        if changes.is_full_jobs_sync:
+            sync_fields['jobs_full_sync_dt'] = changes.sync_dt
+        self.update_sync_watermarks(sync_fields)
+    
+    def save_application_status_changes(self, changes):
+        self.save_application_statuses(changes.application_statuses)
+        self.update_sync_watermarks({'applications_sync_dt': changes.sync_dt})
+    
+    def update_sync_watermarks(self, sync_fields):
+        # Only the sync fields are saved so credentials refreshed by another process aren't overwritten
+        for field, val in sync_fields.items():
+            setattr(self.ats_cfg, field, val)
+        EmployerAts.objects.filter(id=self.ats_cfg.id).update(**sync_fields)
+    
+    def save_jobs(self, jobs, closed_job_keys=None):
+        """
+        :param closed_job_keys: ATS keys of jobs that closed since the last sync. If None, the jobs are all
+        of the employer's open jobs and any other ATS job is closed
+        """
+        if closed_job_keys is not None and not (jobs or closed_job_keys):
+            return
+        job_data_list = [self.get_normalized_job_data(job) for job in jobs]
+        if closed_job_keys is None:
+            current_jobs = self.get_current_jobs()
+        else:
+            # Incremental syncs only need the jobs in the delta, not every job of the employer
+            current_jobs = self.get_current_jobs(
+                ats_job_keys={job_data.ats_job_key for job_data in job_data_list} | set(closed_job_keys)
+            )
+        known_job_descriptions = {
+            job.description_source_hash: job.job_description for job in current_jobs.values()
+            if job.description_source_hash and job.job_description is not None
+        }
         job_departments = self.get_job_departments()
-        process_count = 0
-        jobs_count = len(jobs)
         JobLocationsModel = EmployerJob.locations.through
-        create_jobs = []
-        update_jobs = []
-        create_job_locations = []
-        clear_location_job_ids = []
+        synced_job_keys = list(closed_job_keys or [])
+        new_job_keys = set()
         now = timezone.now()
-        while process_count < jobs_count:
-            batch_jobs = jobs[process_count:process_count + self.BATCH_SIZE]
-            for job in batch_jobs:
-                job_data = self.get_normalized_job_data(job)
+        for batch_start_idx in range(0, len(job_data_list), self.BATCH_SIZE):
+            batch_job_data = job_data_list[batch_start_idx:batch_start_idx + self.BATCH_SIZE]
+            # Unchanged descriptions were sanitized on a previous sync so only new ones are sanitized
+            job_descriptions = sanitize_html_many(
+                [job_data.job_description for job_data in batch_job_data],
+                known_sanitized_texts=known_job_descriptions
+            )
+            self.add_job_departments(job_departments, batch_job_data)
+            create_jobs = []
+            update_jobs = []
+            # Jobs whose locations are replaced. New jobs are added once they have an ID
+            replace_job_locations = []
+            for job_data, job_description in zip(batch_job_data, job_descriptions):
+                if job_data.ats_job_key in new_job_keys:
+                    logger.warning(f'Skipping duplicate ATS job ({job_data.ats_job_key}) for employer ID ({self.ats_cfg.employer_id})')
+                    continue
+                synced_job_keys.append(job_data.ats_job_key)
                 current_job = current_jobs.get(job_data.ats_job_key) or EmployerJob(
                     employer_id=self.ats_cfg.employer_id,
                     created_dt=now
@@ -194,70 +356,84 @@ class BaseAts:
                 is_new = not bool(current_job.id)
                 current_job.ats_job_key = job_data.ats_job_key
                 current_job.job_title = job_data.job_title
-                if job_data.job_description:
-                    current_job.job_description = sanitize_html(job_data.job_description)
-                else:
-                    current_job.job_description = None
+                current_job.job_description = job_description if job_data.job_description else None
+                current_job.description_source_hash = (
+                    get_sanitize_key(job_data.job_description) if job_data.job_description else None
+                )
                 current_job.open_date = job_data.open_date
                 current_job.close_date = job_data.close_date
-                job_department = None
-                if job_data.department_name and not (job_department := job_departments.get(job_data.department_name.lower())):
-                    job_department = JobDepartment(name=job_data.department_name)
-                    job_department.save()
-                    job_departments[job_data.department_name.lower()] = job_department
-                current_job.job_department = job_department
+                current_job.job_department = (
+                    job_departments.get(job_data.department_name.lower()) if job_data.department_name else None
+                )
                 current_job.employment_type = job_data.employment_type
                 current_job.salary_floor = job_data.salary_floor
                 current_job.salary_ceiling = job_data.salary_ceiling
                 current_job.salary_currency_id = job_data.salary_currency
-                jobs_list = update_jobs
-                if is_new:
-                    # We can't bulk save new jobs because Django doesn't provide the PK after saving
-                    # This would normally be fine, but we also have to bulk save job locations which
-                    # requires the PK of the job
-                    current_job.save()
-                    jobs_list = create_jobs
-                jobs_list.append(current_job)
-                
-                if (not is_new) and {l.id for l in job_data.locations} != {l.id for l in current_job.locations.all()}:
-                    clear_location_job_ids.append(current_job.id)
-                    for location in job_data.locations:
-                        # jobs must be saved before the JobLocationsModel can be saved
-                        # since jobs aren't saved yet, we store a reference to where we can get the job once it is saved
-                        create_job_locations.append((location, is_new, len(jobs_list) - 1))
                 if is_new:
-                    for location in job_data.locations:
-                        create_job_locations.append((location, is_new, len(jobs_list) - 1))
-                
-                process_count += 1
+                    new_job_keys.add(job_data.ats_job_key)
+                    create_jobs.append(current_job)
+                    replace_job_locations.append((current_job, job_data.locations))
+                else:
+                    update_jobs.append(current_job)
+                    if {l.id for l in job_data.locations} != {l.id for l in current_job.locations.all()}:
+                        replace_job_locations.append((current_job, job_data.locations))
             
-            # Update jobs
             EmployerJob.objects.bulk_update(update_jobs, EmployerJob.UPDATE_FIELDS)
+            self.create_jobs(create_jobs)
             
             # Remove and add new locations
-            processed_create_job_locations = []
-            for (location, is_new, job_idx) in create_job_locations:
-                job_list = update_jobs if not is_new else create_jobs
-                job = job_list[job_idx]
-                processed_create_job_locations.append(JobLocationsModel(location=location, employerjob=job))
-            JobLocationsModel.objects.filter(employerjob_id__in=clear_location_job_ids).delete()
-            JobLocationsModel.objects.bulk_create(processed_create_job_locations)
-            
-            create_jobs = []
-            update_jobs = []
-            create_job_locations = []
-            clear_location_job_ids = []
+            JobLocationsModel.objects.filter(employerjob_id__in=[job.id for job, _ in replace_job_locations]).delete()
+            JobLocationsModel.objects.bulk_create([
+                JobLocationsModel(location_id=location.id, employerjob_id=job.id)
+                for job, locations in replace_job_locations for location in locations
+            ])
+        
+        ats_job_filter = Q(employer_id=self.ats_cfg.employer_id) & Q(ats_job_key__isnull=False)
+        if closed_job_keys is None:
+            # Close any jobs that weren't created/updated
+            close_job_filter = ats_job_filter & Q(modified_dt__lt=now)
+        else:
+            close_job_filter = ats_job_filter & Q(ats_job_key__in=closed_job_keys)
+        # Jobs that are already closed keep their original close date
+        close_job_filter &= Q(close_date__isnull=True) | Q(close_date__gt=now.date())
+        EmployerJob.objects.filter(close_job_filter).update(close_date=now.date())
         
-        # Close any jobs that weren't created/updated
-        close_jobs = EmployerJob.objects.filter(modified_dt__lt=now, ats_job_key__isnull=False)
-        for job in close_jobs:
-            job.close_date = now.date()
-        EmployerJob.objects.bulk_update(close_jobs, ['close_date'])
+        run_job_title_standardization(job_filter=ats_job_filter, is_non_standardized_only=True)
+        if closed_job_keys is not None:
+            ats_job_filter &= Q(ats_job_key__in=synced_job_keys)
+        refresh_job_search(job_filter=ats_job_filter)
         
-        run_job_title_standardization(
-            job_filter=Q(employer_id=self.ats_cfg.employer_id) & Q(ats_job_key__isnull=False),
-            is_non_standardized_only=True
+    def create_jobs(self, jobs):
+        if not jobs:
+            return
+        EmployerJob.objects.bulk_create(jobs)
+        # MySQL doesn't return the IDs of bulk created rows so they are looked up by ATS key
+        if any(not job.id for job in jobs):
+            job_ids = dict(
+                EmployerJob.objects
+                .filter(employer_id=self.ats_cfg.employer_id, ats_job_key__in=[job.ats_job_key for job in jobs])
+                .values_list('ats_job_key', 'id')
+            )
+            for job in jobs:
+                job.id = job_ids[job.ats_job_key]
+    
+    @staticmethod
+    def add_job_departments(job_departments, job_data_list):
+        """Create any departments that don't exist yet and add them to job_departments
+        :param job_departments: {<lowercase department name>: JobDepartment}
+        """
+        new_department_names = {}
+        for job_data in job_data_list:
+            if job_data.department_name and (department_key := job_data.department_name.lower()) not in job_departments:
+                new_department_names.setdefault(department_key, job_data.department_name)
+        if not new_department_names:
+            return
+        # Another sync may create the same department at the same time
+        JobDepartment.objects.bulk_create(
+            [JobDepartment(name=name) for name in new_department_names.values()], ignore_conflicts=True
         )
+        for department in JobDepartment.objects.filter(name__in=new_department_names.values()):
+            job_departments[department.name.lower()] = department
         
     def save_application_statuses(self, application_statuses):
         current_applications = self.get_current_applications()
@@ -273,6 +449,7 @@ class BaseAts:
             if application.application_status != new_status:
                 application.application_status = new_status
                 application.application_status_dt = timezone.now()
+                applications_to_update.append(application)
             
             if len(applications_to_update) == self.BATCH_SIZE:
                 JobApplication.objects.bulk_update(applications_to_update, ['application_status', 'application_status_dt'])
@@ -293,11 +470,16 @@ class GreenhouseAts(BaseAts):
     job_stages_url = 'https://harvest.greenhouse.io/v1/job_stages'
     users_url = 'https://harvest.greenhouse.io/v1/users'
     
+    REQUESTS_PER_SECOND = 4  # Harvest allows 50 requests per 10 seconds
+    # Past this many changed jobs, pulling each job's posts takes more requests than a full sync
+    MAX_DELTA_JOBS = 100
+    
     def get_paginated_data(self, url, params):
         data = []
         has_next_page = True
         page = 1
         while has_next_page:
+            self.wait_for_rate_limit()
             resp = requests.get(
                 url,
                 headers=self.get_request_headers(),
@@ -315,6 +497,7 @@ class GreenhouseAts(BaseAts):
         return data
     
     def get_data(self, url, params):
+        self.wait_for_rate_limit()
         resp = requests.get(
             url,
             headers=self.get_request_headers(),
@@ -333,16 +516,36 @@ class GreenhouseAts(BaseAts):
         jobs = self.get_paginated_data(self.jobs_url, {
             'status': 'open'
         })
-        filtered_jobs = []
-        for job in jobs:
-            if job['confidential']:
-                continue
-            if not (post := posts.get(job['id'])):
-                continue
-            job['content'] = post['content']
-            job['questions'] = post['questions']
-            filtered_jobs.append(job)
-        return filtered_jobs
+        return [job for job in jobs if self.add_job_post(job, posts.get(job['id']))]
+    
+    def get_job_changes(self, updated_after):
+        updated_after = self.get_param_datetime_str(updated_after)
+        jobs = {job['id']: job for job in self.get_paginated_data(self.jobs_url, {'updated_after': updated_after})}
+        posts = self.get_paginated_data(self.job_posts_url, {'updated_after': updated_after})
+        job_ids = jobs.keys() | {post['job_id'] for post in posts}
+        if len(job_ids) > self.MAX_DELTA_JOBS:
+            return self.get_jobs(), None
+        
+        open_jobs = []
+        closed_job_keys = []
+        for job_id in job_ids:
+            job = jobs.get(job_id) or self.get_data(f'{self.jobs_url}/{job_id}', {})
+            if job['status'] == 'open' and self.add_job_post(job, self.get_live_job_post(job_id)):
+                open_jobs.append(job)
+            else:
+                closed_job_keys.append(str(job_id))
+        return open_jobs, closed_job_keys
+    
+    @staticmethod
+    def add_job_post(job, post):
+        """
+        :return: False if the job shouldn't be shown
+        """
+        if job['confidential'] or not post:
+            return False
+        job['content'] = post['content']
+        job['questions'] = post['questions']
+        return True
     
     def get_job_posts(self):
         return self.get_paginated_data(
@@ -350,6 +553,11 @@ class GreenhouseAts(BaseAts):
             {'active': 'true', 'live': 'true', 'full_content': 'true'}
         )
     
+    def get_live_job_post(self, job_id):
+        posts = self.get_data(f'{self.jobs_url}/{job_id}/job_posts', {'active': 'true', 'full_content': 'true'})
+        # Match get_jobs, which uses the last live post for each job
+        return next((post for post in reversed(posts) if post['live']), None)
+    
     def get_job_stages(self):
         return self.get_paginated_data(self.job_stages_url, {})
     
@@ -472,8 +680,8 @@ class GreenhouseAts(BaseAts):
         if not is_good_response(resp):
             raise AtsError(f'Could not save the note on candidate: {get_resp_error_message(resp)}')
 
-    def get_application_statuses(self):
-        applications = self.get_applications()
+    def get_application_statuses(self, updated_after=None):
+        applications = self.get_applications(app_start_date=updated_after)
         return {
             app['id']: {
                 'status': self.get_application_status(app)
@@ -518,6 +726,7 @@ class GreenhouseAts(BaseAts):
         return None
     
     def get_ats_user_id(self):
+        self.wait_for_rate_limit()
         resp = requests.get(
             self.users_url,
             headers=self.get_request_headers(),
@@ -538,7 +747,8 @@ class GreenhouseAts(BaseAts):
     
     @staticmethod
     def has_next_page(resp, page):
-        if not hasattr(resp, 'links'):
+        # Small incremental syncs often have a single page, which has no pagination links
+        if not (hasattr(resp, 'links') and 'last' in resp.links):
             return False
         last_page_match = re.match('^.*?page=(?P<page>[0-9]+).*?$', resp.links['last']['url'])
         last_page = int(last_page_match.group('page'))
@@ -547,6 +757,10 @@ class GreenhouseAts(BaseAts):
     def parse_datetime_str(self, dt, as_date=False):
         return get_datetime_or_none(dt, format=self.datetime_format, as_date=as_date)
     
+    @staticmethod
+    def get_param_datetime_str(dt):
+        return dt.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
     def refresh_ats_credentials(self):
         # Greenhouse authentication is managed by API key so there is
         # no need to refresh credentials
@@ -560,6 +774,8 @@ class LeverAts(BaseAts):
     EVENT_HIRED = 'candidateHired'
     EVENT_ARCHIVE_CHANGE = 'candidateArchiveChange'
     EVENT_DELETED = 'candidateDeleted'
+    
+    REQUESTS_PER_SECOND = 8  # Lever allows 10 requests per second
 
     def get_paginated_data(self, relative_url, item_id=None, body_cfg=None):
         has_next = True
@@ -598,6 +814,7 @@ class LeverAts(BaseAts):
         if files:
             request_kwargs['files'] = files
     
+        self.wait_for_rate_limit()
         response = request_method_fn(url, **request_kwargs)
         if not is_good_response(response):
             raise AtsError(f'Could not complete request for {relative_url} endpoint: {get_resp_error_message(response)}')
@@ -614,6 +831,20 @@ class LeverAts(BaseAts):
 
     def get_jobs(self):
         jobs = self.get_paginated_data('postings', body_cfg={'state': 'published'})
+        self.add_job_salaries(jobs)
+        return jobs
+    
+    def get_job_changes(self, updated_after):
+        postings = self.get_paginated_data(
+            'postings', body_cfg={'updated_at_start': self.get_lever_unix_from_datetime(updated_after)}
+        )
+        jobs = [posting for posting in postings if posting['state'] == 'published']
+        self.add_job_salaries(jobs)
+        return jobs, [str(posting['id']) for posting in postings if posting['state'] != 'published']
+    
+    def add_job_salaries(self, jobs):
+        if not jobs:
+            return
         requisitions = self.get_requisitions()
         for job in jobs:
             salary_range = job.get('salaryRange')
@@ -634,8 +865,6 @@ class LeverAts(BaseAts):
                     continue
                 
                 self.add_salary_data(job, salary_range)
-            
-        return jobs
     
     def get_posting_owner_key(self, job_key):
         job = self.get_data(REQUEST_FN_GET, f'postings/{job_key}')
@@ -731,8 +960,11 @@ class LeverAts(BaseAts):
         )
         return data['data']
     
-    def get_application_statuses(self):
-        applications = self.get_applications()
+    def get_application_statuses(self, updated_after=None):
+        if updated_after:
+            applications = self.get_updated_applications(updated_after)
+        else:
+            applications = self.get_applications()
         return {
             app['id']: {
                 'status': app['stage']['text'],
@@ -747,6 +979,10 @@ class LeverAts(BaseAts):
         app_start_date = app_start_date or (timezone.now() - timedelta(days=self.DEFAULT_APP_LOOKBACK_DAYS))
         app_start_timestamp = self.get_lever_unix_from_datetime(app_start_date)
         return self.get_paginated_data(f'opportunities?expand=applications&expand=stage&tag={self.JOBVYNE_TAG}&created_at_start={app_start_timestamp}')
+    
+    def get_updated_applications(self, updated_after):
+        updated_timestamp = self.get_lever_unix_from_datetime(updated_after)
+        return self.get_paginated_data(f'opportunities?expand=applications&expand=stage&tag={self.JOBVYNE_TAG}&updated_at_start={updated_timestamp}')
         
     def get_application(self, opportunity_key):
         data = self.get_data(REQUEST_FN_GET, f'opportunities/{opportunity_key}?expand=applications&expand=stage')
@@ -776,6 +1012,9 @@ class LeverAts(BaseAts):
         
         return user
     
+    def is_application_webhook_enabled(self):
+        return self.ats_cfg.is_webhook_enabled
+    
     def delete_webhooks(self):
         for webhook_key in ('webhook_stage_change_key', 'webhook_archive_key', 'webhook_hire_key', 'webhook_delete_key'):
             if key := getattr(self.ats_cfg, webhook_key):
@@ -1,6 +1,10 @@
+import base64
 import json
 import zoneinfo
 from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import reduce
+from math import ceil
 
 from django.core.paginator import Paginator
 from django.db.models import Count, F, Prefetch, Q, Sum, Value
@@ -9,16 +13,20 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 
-from jvapp.apis._apiBase import JobVyneAPIView
+from jvapp.apis._apiBase import JobVyneAPIView, get_error_response
 from jvapp.models.employer import Employer, EmployerJob, Taxonomy
 from jvapp.models.job_seeker import JobApplication
-from jvapp.models.tracking import MessageThreadContext, PageView
+from jvapp.models.location import Location
+from jvapp.models.tracking import ApplicationRollup, MessageThreadContext, PageView, PageViewRollup
 from jvapp.models.user import JobVyneUser, UserApplicationReview
 from jvapp.permissions.general import IsAdmin
 from jvapp.serializers.location import get_serialized_location
 from jvapp.serializers.tracking import get_serialized_message
 from jvapp.utils.data import coerce_bool, coerce_int
 from jvapp.utils.datetime import get_datetime_format_or_none, get_datetime_or_none
+from jvapp.utils.rollup import get_bucket_dt
+from jvapp.utils.search import APPLICANT_EMAIL_FIELDS, APPLICANT_NAME_FIELDS, JOB_TITLE_FIELDS, get_search_filter, \
+    get_substring_filter
 
 
 class BaseDataView(JobVyneAPIView):
@@ -48,6 +56,59 @@ class BaseDataView(JobVyneAPIView):
         if not any([self.owner_id, self.employer_id]):
             raise ValueError('You must provide an owner ID, or employer ID')
     
+    def get_date_annotations(self, dt_field):
+        return {
+            'date': TruncDate(dt_field, tzinfo=self.timezone),
+            'week': TruncWeek(dt_field, tzinfo=self.timezone),
+            'month': TruncMonth(dt_field, tzinfo=self.timezone),
+            'year': TruncYear(dt_field, tzinfo=self.timezone),
+        }
+    
+    def get_rollup_filters(self, dt_field):
+        """Rollups are hourly UTC buckets. They are used for the whole hours in the date range and the partial
+        hours at the edges are counted from raw rows. A timezone that isn't offset from UTC by whole hours
+        splits buckets across local days so only raw rows can be used
+        :param dt_field: The date field of the raw rows
+        :return: (<bucket filter>, <raw filter or None>) or None if rollups can't be used
+        """
+        range_dts = [dt for dt in (self.start_dt, self.end_dt) if dt] or [timezone.now()]
+        if self.timezone and any(dt.astimezone(self.timezone).utcoffset() % timedelta(hours=1) for dt in range_dts):
+            return None
+        
+        bucket_filter = Q()
+        raw_filters = []
+        rollup_start_dt = rollup_end_dt = None
+        if self.start_dt:
+            rollup_start_dt = get_bucket_dt(self.start_dt)
+            if rollup_start_dt < self.start_dt:
+                rollup_start_dt += timedelta(hours=1)
+                raw_filters.append(Q(**{f'{dt_field}__gte': self.start_dt, f'{dt_field}__lt': rollup_start_dt}))
+            bucket_filter &= Q(bucket_dt__gte=rollup_start_dt)
+        if self.end_dt:
+            rollup_end_dt = get_bucket_dt(self.end_dt)
+            raw_filters.append(Q(**{f'{dt_field}__gte': rollup_end_dt, f'{dt_field}__lte': self.end_dt}))
+            bucket_filter &= Q(bucket_dt__lt=rollup_end_dt)
+        if rollup_start_dt and rollup_end_dt and rollup_start_dt >= rollup_end_dt:
+            # The range doesn't include a whole hour
+            return None
+        
+        raw_filter = reduce(lambda full_filter, edge_filter: full_filter | edge_filter, raw_filters) if raw_filters else None
+        return bucket_filter, raw_filter
+    
+    @staticmethod
+    def merge_grouped_counts(*grouped_rows):
+        """Sum the counts of rows with the same group values (e.g. from rollups and raw rows)
+        """
+        merged_rows = {}
+        for rows in grouped_rows:
+            for row in rows:
+                group_key = tuple((key, val) for key, val in row.items() if key != 'count')
+                if merged_row := merged_rows.get(group_key):
+                    merged_row['count'] += row['count']
+                else:
+                    merged_rows[group_key] = {**row}
+        return list(merged_rows.values())
+    
     @staticmethod
     def get_link_data(social_link):
         if not social_link:
@@ -71,6 +132,12 @@ class ApplicationsView(BaseDataView):
         'recommended': ('feedback_recommend_this_job',),
         'total_user_rating': ('total_user_rating',),
     }
+    # Groups and filters that can be answered from ApplicationRollup
+    ROLLUP_GROUPS = {
+        'date', 'week', 'month', 'year', 'platform_name', 'link_name',
+        'owner_id', 'owner_first_name', 'owner_last_name', 'owner_name'
+    }
+    ROLLUP_FILTERS = {'employees', 'platforms'}
     
     def get(self, request):
         if not self.user.is_admin:
@@ -79,6 +146,20 @@ class ApplicationsView(BaseDataView):
             if self.owner_id and self.user.id != self.owner_id:
                 return Response('You do not have access to this user', status=status.HTTP_401_UNAUTHORIZED)
         is_exclude_job_board = self.query_params.get('is_exclude_job_board', False)
+        if not self.is_raw_data and self.is_rollup_query() and (rollup_filters := self.get_rollup_filters('created_dt')):
+            bucket_filter, raw_filter = rollup_filters
+            grouped_applications = [self.get_grouped_applications(
+                self.get_application_rollups(bucket_filter, is_exclude_job_board), 'application_count'
+            )]
+            if raw_filter:
+                edge_applications = self.get_job_applications(
+                    self.user, start_date=self.start_dt, end_date=self.end_dt,
+                    employer_id=self.employer_id, owner_id=self.owner_id, is_ignore_permission=True,
+                    is_exclude_job_board=is_exclude_job_board
+                ).filter(raw_filter & self.get_rollup_application_filter())
+                grouped_applications.append(self.get_grouped_applications(edge_applications, 'id'))
+            return Response(status=status.HTTP_200_OK, data=self.merge_grouped_counts(*grouped_applications))
+        
         applications = self.get_job_applications(
             self.user, start_date=self.start_dt, end_date=self.end_dt,
             employer_id=self.employer_id, owner_id=self.owner_id, is_ignore_permission=True,
@@ -92,19 +173,17 @@ class ApplicationsView(BaseDataView):
             if platforms_filter := self.filter_by.get('platforms'):
                 app_filter &= Q(platform__name__in=platforms_filter)
             if job_title_search_filter := self.filter_by.get('jobTitle'):
-                app_filter &= Q(employer_job__job_title__iregex=f'^.*{job_title_search_filter}.*$')
+                app_filter &= get_search_filter(JOB_TITLE_FIELDS, job_title_search_filter, field_prefix='employer_job__')
             if name_filter := self.filter_by.get('applicantName'):
-                app_filter &= (
-                        Q(first_name__iregex=f'^.*{name_filter}.*$') |
-                        Q(last_name__iregex=f'^.*{name_filter}.*$')
-                )
+                # Names and emails are often searched by partial words so they use substring matching
+                app_filter &= get_substring_filter(APPLICANT_NAME_FIELDS, name_filter)
             if email_filter := self.filter_by.get('applicantEmail'):
-                app_filter &= Q(email__iregex=f'^.*{email_filter}.*$')
+                app_filter &= get_substring_filter(APPLICANT_EMAIL_FIELDS, email_filter)
             if source_filter := self.filter_by.get('sourceName'):
                 app_filter &= (
-                        Q(social_link__owner__first_name__iregex=f'^.*{source_filter}.*$') |
-                        Q(social_link__owner__last_name__iregex=f'^.*{source_filter}.*$') |
-                        Q(social_link__name__iregex=f'^.*{source_filter}.*$')
+                        Q(social_link__owner__first_name__icontains=source_filter) |
+                        Q(social_link__owner__last_name__icontains=source_filter) |
+                        Q(social_link__name__icontains=source_filter)
                 )
             if locations_filter := self.filter_by.get('locations'):
                 app_filter &= Q(employer_job__locations__in=locations_filter)
@@ -117,68 +196,148 @@ class ApplicationsView(BaseDataView):
                 app_filter &= Q(application_status=application_status_filter)
         
         applications = applications.filter(app_filter)
+        if self.filter_by and self.filter_by.get('locations'):
+            # A job with multiple matching locations would otherwise return the application more than once
+            applications = applications.distinct()
         
         if not self.is_raw_data:
-            if 'owner_name' in self.group_by:
-                self.group_by += ['owner_id', 'owner_first_name', 'owner_last_name']
-            
             applications = applications \
-                .annotate(date=TruncDate('created_dt', tzinfo=self.timezone)) \
-                .annotate(week=TruncWeek('created_dt', tzinfo=self.timezone)) \
-                .annotate(month=TruncMonth('created_dt', tzinfo=self.timezone)) \
-                .annotate(year=TruncYear('created_dt', tzinfo=self.timezone)) \
-                .annotate(platform_name=F('platform__name')) \
-                .annotate(link_name=F('social_link__name')) \
-                .annotate(owner_id=F('social_link__owner_id')) \
-                .annotate(owner_first_name=F('social_link__owner__first_name')) \
-                .annotate(owner_last_name=F('social_link__owner__last_name')) \
-                .annotate(owner_name=Concat(
-                    'social_link__owner__first_name', Value(' '), 'social_link__owner__last_name'
-                )) \
                 .annotate(applicant_name=Concat('first_name', Value(' '), 'last_name')) \
-                .annotate(job_title=F('employer_job__job_title')) \
-                .values(*self.group_by) \
-                .annotate(count=Count('id'))
-            
-            if 'owner_name' in self.group_by:
-                profile_pictures = {
-                    u.id: u.profile_picture.url if u.profile_picture else None
-                    for u in JobVyneUser.objects.filter(id__in=[a['owner_id'] for a in applications])
-                }
-                for app in applications:
-                    app['owner_picture_url'] = profile_pictures.get(app['owner_id'])
-            
-            return Response(status=status.HTTP_200_OK, data=applications)
+                .annotate(job_title=F('employer_job__job_title'))
+            return Response(status=status.HTTP_200_OK, data=self.get_grouped_applications(applications, 'id'))
         
         is_employer = self.user.is_employer and self.employer_id and self.user.employer_id == self.employer_id
         
-        if not self.sort_order:
-            sort_order = ('-created_dt',)
+        # Only the locations are needed for the facet so they are selected in the database
+        # rather than loading every application
+        locations = Location.objects \
+            .select_related('city', 'state', 'country') \
+            .filter(id__in=applications.values('employer_job__locations'))
+        
+        next_cursor = None
+        if self.sort_order in (None, 'created_dt'):
+            try:
+                page_applications, next_cursor = self.get_keyset_page(applications)
+            except ValueError:
+                return get_error_response('The page cursor is invalid')
+            total_application_count = applications.count()
+            total_page_count = max(ceil(total_application_count / self.records_per_page), 1)
         else:
-            sort_keys = self.SORT_MAP[self.sort_order]
-            sort_order = []
-            for key in sort_keys:
-                sort_order.append(f'{"-" if self.is_sort_descending else ""}{key}')
-                
-        paged_applications = Paginator(applications.order_by(*sort_order), per_page=self.records_per_page)
-        locations = set()
-        for app in applications:
-            for location in app.employer_job.locations.all():
-                locations.add(location)
+            if self.sort_order == 'total_user_rating':
+                applications = applications.annotate(total_user_rating=Sum('user_review__rating'))
+            sort_order = [
+                f'{"-" if self.is_sort_descending else ""}{key}' for key in self.SORT_MAP[self.sort_order]
+            ]
+            paged_applications = Paginator(applications.order_by(*sort_order, '-id'), per_page=self.records_per_page)
+            page_applications = paged_applications.get_page(self.page_count)
+            total_application_count = paged_applications.count
+            total_page_count = paged_applications.num_pages
         
         return Response(
             status=status.HTTP_200_OK,
             data={
-                'total_page_count': paged_applications.num_pages,
-                'total_application_count': paged_applications.count,
-                'applications': [
-                    self.serialize_application(app, is_employer)
-                    for app in paged_applications.get_page(self.page_count)
-                ],
-                'locations': [get_serialized_location(l) for l in locations]
+                'total_page_count': total_page_count,
+                'total_application_count': total_application_count,
+                'applications': [self.serialize_application(app, is_employer) for app in page_applications],
+                'locations': [get_serialized_location(l) for l in locations],
+                'next_cursor': next_cursor
             }
         )
     
+    def get_keyset_page(self, applications):
+        """Page through applications by (created_dt, id) so later pages don't need to skip rows
+        Requests without a cursor fall back to the page count
+        :return: The page of applications and the cursor for the next page (None if this is the last page)
+        """
+        is_descending = (not self.sort_order) or self.is_sort_descending
+        lookup = 'lt' if is_descending else 'gt'
+        sort_order = ('-created_dt', '-id') if is_descending else ('created_dt', 'id')
+        offset = 0
+        if cursor := self.query_params.get('cursor'):
+            created_dt, application_id = self.parse_cursor(cursor)
+            applications = applications.filter(
+                Q(**{f'created_dt__{lookup}': created_dt})
+                | Q(created_dt=created_dt, **{f'id__{lookup}': application_id})
+            )
+        else:
+            offset = (max(self.page_count, 1) - 1) * self.records_per_page
+        
+        # Get one extra application to check whether there is another page
+        page_applications = list(applications.order_by(*sort_order)[offset:offset + self.records_per_page + 1])
+        if len(page_applications) <= self.records_per_page:
+            return page_applications, None
+        page_applications = page_applications[:self.records_per_page]
+        return page_applications, self.get_cursor(page_applications[-1])
+    
+    @staticmethod
+    def get_cursor(application):
+        cursor = f'{application.created_dt.isoformat()}|{application.id}'
+        return base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('utf-8')
+    
+    @staticmethod
+    def parse_cursor(cursor):
+        # Decoding and parsing errors are all ValueErrors
+        created_dt, application_id = base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_dt), int(application_id)
+    
+    def is_rollup_query(self):
+        active_filters = {key for key, val in (self.filter_by or {}).items() if val}
+        return set(self.group_by) <= self.ROLLUP_GROUPS and active_filters <= self.ROLLUP_FILTERS
+    
+    def get_rollup_application_filter(self):
+        """Filters that can be applied to both ApplicationRollup and JobApplication rows
+        """
+        app_filter = Q()
+        if self.filter_by:
+            if employee_ids_filter := self.filter_by.get('employees'):
+                app_filter &= Q(social_link__owner_id__in=employee_ids_filter)
+            if platforms_filter := self.filter_by.get('platforms'):
+                app_filter &= Q(platform__name__in=platforms_filter)
+        return app_filter
+    
+    def get_application_rollups(self, bucket_filter, is_exclude_job_board):
+        rollup_filter = bucket_filter & self.get_rollup_application_filter()
+        if self.employer_id:
+            rollup_filter &= Q(referrer_employer_id=self.employer_id)
+        if self.owner_id:
+            rollup_filter &= Q(referrer_user_id=self.owner_id)
+        if is_exclude_job_board:
+            rollup_filter &= Q(social_link__owner_id__isnull=False)
+        return ApplicationRollup.objects.filter(rollup_filter)
+    
+    def get_grouped_applications(self, applications, count_field):
+        """Count applications by the requested groups
+        :param applications: Either raw JobApplication rows or ApplicationRollup rows
+        :param count_field: Summed for rollups and counted for raw rows
+        """
+        is_rollup = applications.model is ApplicationRollup
+        group_by = list(self.group_by)
+        if 'owner_name' in group_by:
+            group_by += ['owner_id', 'owner_first_name', 'owner_last_name']
+        
+        applications = applications \
+            .annotate(**self.get_date_annotations('bucket_dt' if is_rollup else 'created_dt')) \
+            .annotate(platform_name=F('platform__name')) \
+            .annotate(link_name=F('social_link__name')) \
+            .annotate(owner_id=F('social_link__owner_id')) \
+            .annotate(owner_first_name=F('social_link__owner__first_name')) \
+            .annotate(owner_last_name=F('social_link__owner__last_name')) \
+            .annotate(owner_name=Concat(
+                'social_link__owner__first_name', Value(' '), 'social_link__owner__last_name'
+            )) \
+            .values(*group_by) \
+            .annotate(count=Sum(count_field) if is_rollup else Count(count_field, distinct=True))
+        
+        if 'owner_name' in group_by:
+            profile_pictures = {
+                u.id: u.profile_picture.url if u.profile_picture else None
+                for u in JobVyneUser.objects.filter(id__in=[a['owner_id'] for a in applications])
+            }
+            for app in applications:
+                app['owner_picture_url'] = profile_pictures.get(app['owner_id'])
+        
+        return applications
+    
     def serialize_application(self, application, is_employer):
         referrer = application.social_link.owner if application.social_link else application.referrer_user
         is_owner = referrer and (referrer.id == self.user.id)
@@ -299,7 +458,6 @@ class ApplicationsView(BaseDataView):
                 message_thread_prefetch,
                 application_review_prefetch
             ) \
-            .annotate(total_user_rating=Sum('user_review__rating')) \
             .filter(app_filter)
         
         if is_ignore_permission:
@@ -322,8 +480,37 @@ class ApplicationsView(BaseDataView):
 
 
 class PageViewsView(BaseDataView):
+    # Groups that can be answered from PageViewRollup
+    ROLLUP_GROUPS = {'date', 'week', 'month', 'year', 'is_mobile'}
     
     def get(self, request):
+        if (
+            not self.is_raw_data and set(self.group_by) <= self.ROLLUP_GROUPS
+            and (rollup_filters := self.get_rollup_filters('access_dt'))
+        ):
+            bucket_filter, raw_filter = rollup_filters
+            link_views = self.get_link_view_rollups(
+                self.user, bucket_filter, employer_id=self.employer_id, owner_id=self.owner_id
+            )
+            grouped_link_views = [
+                link_views
+                .annotate(**self.get_date_annotations('bucket_dt'))
+                .values(*self.group_by)
+                .annotate(count=Sum('view_count'))
+            ]
+            if raw_filter:
+                grouped_link_views.append(
+                    self.get_link_views(
+                        self.user, self.start_dt, self.end_dt, employer_id=self.employer_id, owner_id=self.owner_id
+                    )
+                    .filter(raw_filter)
+                    .annotate(**self.get_date_annotations('access_dt'))
+                    .values(*self.group_by)
+                    .annotate(count=Count('id'))
+                )
+            
+            return Response(status=status.HTTP_200_OK, data=self.merge_grouped_counts(*grouped_link_views))
+        
         link_views = self.get_link_views(
             self.user, self.start_dt, self.end_dt,
             employer_id=self.employer_id, owner_id=self.owner_id
@@ -331,24 +518,33 @@ class PageViewsView(BaseDataView):
         
         if not self.is_raw_data:
             link_views = link_views \
-                .annotate(date=TruncDate('access_dt', tzinfo=self.timezone)) \
-                .annotate(week=TruncWeek('access_dt', tzinfo=self.timezone)) \
-                .annotate(month=TruncMonth('access_dt', tzinfo=self.timezone)) \
-                .annotate(year=TruncYear('access_dt', tzinfo=self.timezone)) \
+                .annotate(**self.get_date_annotations('access_dt')) \
                 .values(*self.group_by) \
                 .annotate(count=Count('id'))
             
             return Response(status=status.HTTP_200_OK, data=link_views)
         
-        # TODO: Apply group by and then use paginator to return data
+        # TODO: Use paginator to return data
+        # Group in the database and only merge mobile and tablet views here
         views = defaultdict(int)
-        for view in link_views:
-            link_data = tuple(pair for pair in self.get_link_data(view.social_link).items())
+        for view in link_views.values(
+            'access_dt', 'is_mobile', 'is_tablet', 'social_link_id', 'social_link__owner_id',
+            'social_link__owner__first_name', 'social_link__owner__last_name', 'social_link__name'
+        ).annotate(view_count=Count('id')).order_by():
+            link_data = ()
+            if view['social_link_id']:
+                link_data = (
+                    ('link_id', view['social_link_id']),
+                    ('owner_id', view['social_link__owner_id']),
+                    ('owner_first_name', view['social_link__owner__first_name']),
+                    ('owner_last_name', view['social_link__owner__last_name']),
+                    ('link_name', view['social_link__name']),
+                )
             views[(
-                get_datetime_format_or_none(view.access_dt),
-                bool(view.is_mobile or view.is_tablet),
+                get_datetime_format_or_none(view['access_dt']),
+                bool(view['is_mobile'] or view['is_tablet']),
                 link_data
-            )] += 1
+            )] += view['view_count']
         
         serialized_views = []
         for view_key, view_count in views.items():
@@ -362,9 +558,22 @@ class PageViewsView(BaseDataView):
         
         return Response(status=status.HTTP_200_OK, data=serialized_views)
     
+    @staticmethod
+    def get_link_view_rollups(user, bucket_filter, employer_id=None, owner_id=None):
+        view_filter = bucket_filter
+        if employer_id:
+            view_filter &= (Q(social_link__employer_id=employer_id) | Q(employer_id=employer_id))
+        if owner_id:
+            view_filter &= (Q(social_link__owner_id=owner_id) | Q(page_owner_id=owner_id))
+        return PageViewRollup.jv_filter_perm(user, PageViewRollup.objects.filter(view_filter))
+    
     @staticmethod
     def get_link_views(user, start_date, end_date, employer_id=None, owner_id=None):
-        view_filter = Q(access_dt__lte=end_date) & Q(access_dt__gte=start_date)
+        view_filter = Q()
+        if start_date:
+            view_filter &= Q(access_dt__gte=start_date)
+        if end_date:
+            view_filter &= Q(access_dt__lte=end_date)
         if employer_id:
             view_filter &= (Q(social_link__employer_id=employer_id) | Q(employer_id=employer_id))
         if owner_id:
@@ -30,14 +30,14 @@ from jvapp.models.employer import ConnectionTypeBit, Employer, EmployerAuthGroup
     EmployerReferralBonusRule, \
     EmployerReferralRequest, EmployerAts, EmployerSlack, EmployerSubscription, JobDepartment, EmployerJob, \
     EmployerJobApplicationRequirement, EmployerReferralBonusRuleModifier, EmployerPermission, EmployerFile, \
-    EmployerFileTag
+    EmployerFileTag, JobSearch
 from jvapp.models.job_seeker import JobApplication
 from jvapp.models.location import Location
 from jvapp.models.social import SocialLink
 from jvapp.models.tracking import MessageThread, MessageThreadContext
 from jvapp.models.user import JobVyneUser, PermissionName, UserEmployerPermissionGroup
 from jvapp.permissions.employer import IsAdminOrEmployerOrReadOnlyPermission, IsAdminOrEmployerPermission
-from jvapp.serializers.employer import get_serialized_auth_group, get_serialized_employer, \
+from jvapp.serializers.employer import BonusRuleSet, get_serialized_auth_group, get_serialized_employer, \
     get_serialized_employer_billing, get_serialized_employer_bonus_rule, get_serialized_employer_file, \
     get_serialized_employer_file_tag, get_serialized_employer_job, \
     get_serialized_employer_referral_request
@@ -46,7 +46,10 @@ from jvapp.utils.ai import PromptError
 from jvapp.utils.data import AttributeCfg, coerce_bool, coerce_int, is_obfuscated_string, set_object_attributes
 from jvapp.utils.datetime import get_datetime_or_none
 from jvapp.utils.email import ContentPlaceholders, get_domain_from_email, send_django_email
+from jvapp.utils.job_search import refresh_job_search
 from jvapp.utils.sanitize import sanitize_html
+from jvapp.utils.search import JOB_SEARCH_FIELDS, JOB_TITLE_FIELDS, get_fulltext_tokens, get_search_filter, \
+    get_search_rank
 
 __all__ = (
     'EmployerView', 'EmployerJobView', 'EmployerAuthGroupView', 'EmployerUserView', 'EmployerUserActivateView',
@@ -191,6 +194,7 @@ class EmployerAtsView(JobVyneAPIView):
         for job in ats_jobs:
             job.close_date = timezone.now().date()
         EmployerJob.objects.bulk_update(ats_jobs, ['close_date'])
+        refresh_job_search(job_filter=Q(id__in=[job.id for job in ats_jobs]))
         return Response(status=status.HTTP_200_OK, data={
             SUCCESS_MESSAGE_KEY: 'Successfully deleted ATS configuration'
         })
@@ -546,7 +550,7 @@ class EmployerJobView(JobVyneAPIView):
             employer_id = employer_id[0] if isinstance(employer_id, list) else employer_id
             job_filter = Q(employer_id=employer_id)
             if job_title_filter := self.query_params.get('job_title_filter'):
-                job_filter &= Q(job_title__iregex=f'^.*{job_title_filter}.*$')
+                job_filter &= get_search_filter(JOB_TITLE_FIELDS, job_title_filter)
             if city_ids := self.query_params.getlist('city_ids[]'):
                 job_filter &= Q(locations__city_id__in=city_ids)
             if state_ids := self.query_params.getlist('state_ids[]'):
@@ -560,9 +564,15 @@ class EmployerJobView(JobVyneAPIView):
             is_only_closed = coerce_bool(self.query_params.get('is_only_closed'))
             is_include_closed = coerce_bool(self.query_params.get('is_include_closed'))
             jobs, paginated_jobs = self.get_employer_jobs(employer_job_filter=job_filter, is_only_closed=is_only_closed, is_include_closed=is_include_closed)
-            rules = EmployerBonusRuleView.get_employer_bonus_rules(self.user,
-                                                                   employer_id=employer_id) if self.user else None
-            data = [get_serialized_employer_job(j, rules=rules, is_include_bonus=bool(self.user)) for j in jobs]
+            # Rules are compiled and matched once for all jobs on the page
+            rules = BonusRuleSet(
+                EmployerBonusRuleView.get_employer_bonus_rules(self.user, employer_id=employer_id)
+            ) if self.user else None
+            job_rules = rules.match_jobs(jobs) if rules else None
+            data = [
+                get_serialized_employer_job(j, rules=rules, job_rules=job_rules, is_include_bonus=bool(self.user))
+                for j in jobs
+            ]
         else:
             return Response('A job ID or employer ID is required', status=status.HTTP_400_BAD_REQUEST)
         
@@ -655,6 +665,7 @@ class EmployerJobView(JobVyneAPIView):
             [job_location_model(location_id=l, employerjob=employer_job) for l in location_ids],
             ignore_conflicts=True
         )
+        refresh_job_search(job_filter=Q(id=employer_job.id))
         
         return employer_job
     
@@ -685,8 +696,8 @@ class EmployerJobView(JobVyneAPIView):
     
     @staticmethod
     def get_employer_jobs(
-            employer_job_id=None, employer_job_filter=None, order_by=None, applicant_user=None,
-            is_include_fetch=True, is_only_closed=False, is_include_closed=False, is_include_future=False,
+            employer_job_id=None, employer_job_filter=None, job_search_filter=None, job_search_text=None,
+            order_by=None, applicant_user=None, is_include_fetch=True, is_only_closed=False, is_include_closed=False, is_include_future=False,
             is_allow_unapproved=False, lookback_days=None, jobs_per_page=25, page_count=1
     ):
         # NOTE: Be careful adding the order_by argument since it may cause a full table scan if not on an index
@@ -695,20 +706,41 @@ class EmployerJobView(JobVyneAPIView):
             is_include_future=is_include_future, is_allow_unapproved=is_allow_unapproved, lookback_days=lookback_days
         )
         
-        jobs = EmployerJob.objects.filter(standard_job_filter)
-        if employer_job_filter:
-            jobs = jobs.filter(employer_job_filter)
+        # The job search table only has open jobs
+        is_closed_jobs = is_only_closed or is_include_closed
+        if (job_search_filter is not None) and is_closed_jobs:
+            raise ValueError('job_search_filter can only be used for open jobs')
+        
+        if ((job_search_filter is not None) or job_search_text) and not (employer_job_id or is_closed_jobs):
+            # Filter on the denormalized search table to avoid joining employer, taxonomy, and location tables
+            # The standard filter fields are the same for EmployerJob and JobSearch
+            jobs = JobSearch.objects.filter(standard_job_filter & (job_search_filter or Q()))
+            if employer_job_filter:
+                jobs = jobs.filter(job_id__in=EmployerJob.objects.filter(employer_job_filter).values('id'))
+            if job_search_text:
+                jobs = jobs.filter(get_search_filter(JOB_SEARCH_FIELDS, job_search_text))
+                if get_fulltext_tokens(job_search_text):
+                    order_by = [get_search_rank(JOB_SEARCH_FIELDS, job_search_text).desc(), '-open_date', '-job_id']
+            job_id_key = 'job_id'
+        else:
+            jobs = EmployerJob.objects.filter(standard_job_filter)
+            if employer_job_filter:
+                jobs = jobs.filter(employer_job_filter)
+            if job_search_text:
+                # Only the job title has a full text index on EmployerJob
+                jobs = jobs.filter(get_search_filter(JOB_TITLE_FIELDS, job_search_text))
+            job_id_key = 'id'
         
         # Jobs can be duplicated when we filter based on location
         # Calling "distinct" on the entire data set is extremely inefficient
         # Instead we get unique job ids and then re-query the database with a much smaller paginated subset
-        jobs = jobs.values('id')
+        jobs = jobs.values(job_id_key)
         if order_by:
             jobs = jobs.order_by(*order_by)
         paginated_jobs = Paginator(jobs, per_page=jobs_per_page)
         page_count = min(page_count, paginated_jobs.num_pages)
         jobs = paginated_jobs.get_page(page_count)
-        job_ids = {job['id'] for job in jobs}
+        job_ids = [job[job_id_key] for job in jobs]
         
         if is_include_fetch:
             locations_prefetch = Prefetch(
@@ -739,6 +771,11 @@ class EmployerJobView(JobVyneAPIView):
                 )
                 jobs = jobs.prefetch_related(user_application_prefetch)
             
+            if order_by:
+                # Keep the page order since re-querying uses the default ordering
+                job_order = {job_id: idx for idx, job_id in enumerate(job_ids)}
+                jobs = sorted(jobs, key=lambda job: job_order[job.id])
+            
         if employer_job_id:
             if not jobs:
                 raise EmployerJob.DoesNotExist
@@ -1766,16 +1803,22 @@ class EmployerInfoView(JobVyneAPIView):
             employer_idx += EmployerInfoView.CONCURRENT_REQUESTS
 
     @staticmethod
-    async def summarize_employer(queue):
+    def get_description_prompt(employer):
+        website_domains = employer.email_domains.split(',')[0] if employer.email_domains else None
+        return [
+            {'role': 'system', 'content': EmployerInfoView.DESCRIPTION_PROMPT},
+            {'role': 'user', 'content': f'Company: {employer.employer_name}\nWebsite domains: {website_domains}'}
+        ]
+
+    @staticmethod
+    async def summarize_employer(queue, cached_requests):
         while True:
             employer = await queue.get()
             logger.info(f'Running employer description for {employer.employer_name}')
             try:
-                website_domains = employer.email_domains.split(',')[0] if employer.email_domains else None
-                resp, tracker = await ai.ask([
-                    {'role': 'system', 'content': EmployerInfoView.DESCRIPTION_PROMPT},
-                    {'role': 'user', 'content': f'Company: {employer.employer_name}\nWebsite domains: {website_domains}'}
-                ], is_test=False)
+                resp, tracker = await ai.ask(
+                    EmployerInfoView.get_description_prompt(employer), is_test=False, cached_requests=cached_requests
+                )
                 employer.description = resp.get('description')
                 employer.description_long = resp.get('description_long')
             except (PromptError, RateLimitError):
@@ -1786,8 +1829,11 @@ class EmployerInfoView(JobVyneAPIView):
     @staticmethod
     async def process_employers(employers):
         queue = asyncio.Queue()
+        cached_requests = await ai.get_cached_requests(
+            [EmployerInfoView.get_description_prompt(employer) for employer in employers]
+        )
         workers = [
-            asyncio.create_task(EmployerInfoView.summarize_employer(queue))
+            asyncio.create_task(EmployerInfoView.summarize_employer(queue, cached_requests))
             for _ in range(EmployerInfoView.CONCURRENT_REQUESTS)
         ]
     
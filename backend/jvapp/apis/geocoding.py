@@ -1,5 +1,8 @@
 import json
 import re
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from django.conf import settings
@@ -166,34 +169,146 @@ def save_raw_location(location_dict: dict, is_remote: bool, raw_location_text=No
     return location
 
 
+class LocationResolver:
+    """Process-wide cache of raw location text to Location
+    Hot location strings are kept in an LRU cache. Cold strings are looked up in the LocationLookup
+    table on demand and any remaining misses are geocoded concurrently and saved with one bulk insert
+    """
+    MAX_CACHE_SIZE = 10000
+    MAX_GEOCODE_WORKERS = 8
+    REMOTE_PATTERN = re.compile('^.*?(remote|anywhere|virtual).*?$', re.IGNORECASE)
+    
+    def __init__(self, max_cache_size=MAX_CACHE_SIZE):
+        self.max_cache_size = max_cache_size
+        self.location_lookups = OrderedDict()
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def get_is_remote(cls, location_text):
+        return bool(cls.REMOTE_PATTERN.match(location_text))
+    
+    @staticmethod
+    def get_lookup_text(location_text):
+        return location_text.lower()[:200]
+    
+    def get_cached_location(self, lookup_text):
+        with self.lock:
+            location = self.location_lookups.get(lookup_text)
+            if location:
+                self.location_lookups.move_to_end(lookup_text)
+            return location
+    
+    def set_cached_location(self, lookup_text, location):
+        with self.lock:
+            self.location_lookups[lookup_text] = location
+            self.location_lookups.move_to_end(lookup_text)
+            while len(self.location_lookups) > self.max_cache_size:
+                self.location_lookups.popitem(last=False)
+    
+    def clear(self):
+        with self.lock:
+            self.location_lookups.clear()
+    
+    def get_location(self, location_text, is_zip_code=False, is_use_location_caching=True):
+        return self.get_locations(
+            [location_text], is_zip_code=is_zip_code, is_use_location_caching=is_use_location_caching
+        )[location_text]
+    
+    def get_locations(self, location_texts, is_zip_code=False, is_use_location_caching=True):
+        """Resolve many raw location strings at once
+        :return {<location_text>: Location}
+        """
+        # Lookup texts are truncated to fit the LocationLookup table so remote is checked against the full text
+        texts_by_key = defaultdict(list)
+        for location_text in location_texts:
+            texts_by_key[(self.get_lookup_text(location_text), self.get_is_remote(location_text))].append(location_text)
+        
+        locations_by_key = {}
+        if is_use_location_caching:
+            for key in texts_by_key.keys():
+                lookup_text, is_remote = key
+                location = self.get_cached_location(lookup_text)
+                if location and location.is_remote == is_remote:
+                    locations_by_key[key] = location
+            
+            cold_keys = [k for k in texts_by_key.keys() if k not in locations_by_key]
+            if cold_keys:
+                location_lookups = {
+                    self.get_lookup_text(location_lookup.text): location_lookup.location
+                    for location_lookup in LocationLookup.objects.select_related('location').filter(
+                        text__in={lookup_text for lookup_text, _ in cold_keys}
+                    )
+                }
+                for key in cold_keys:
+                    lookup_text, is_remote = key
+                    location = location_lookups.get(lookup_text)
+                    if location and location.is_remote == is_remote:
+                        locations_by_key[key] = location
+                        self.set_cached_location(lookup_text, location)
+        
+        missing_keys = [k for k in texts_by_key.keys() if k not in locations_by_key]
+        if missing_keys:
+            locations_by_key.update(self.geocode_locations(
+                {key: texts_by_key[key][0] for key in missing_keys}, is_zip_code, is_use_location_caching
+            ))
+        
+        return {
+            location_text: locations_by_key[key]
+            for key, texts in texts_by_key.items() for location_text in texts
+        }
+    
+    def geocode_locations(self, location_texts_by_key, is_zip_code, is_use_location_caching):
+        """
+        :param location_texts_by_key: {(<lookup text>, <is remote>): <location text>}
+        """
+        def geocode(location_text):
+            address = re.sub('remote|anywhere|virtual|:', '', location_text.lower(), flags=re.IGNORECASE).strip()
+            return get_raw_location(address, zip_code=address if is_zip_code else None)
+        
+        keys = list(location_texts_by_key.keys())
+        with ThreadPoolExecutor(max_workers=min(self.MAX_GEOCODE_WORKERS, len(keys))) as executor:
+            raw_locations = list(executor.map(geocode, location_texts_by_key.values()))
+        
+        locations_by_key = {}
+        location_lookups = {}
+        for key, (location_dict, raw_data) in zip(keys, raw_locations):
+            lookup_text, is_remote = key
+            location = save_raw_location(location_dict or {}, is_remote, is_save_location_lookup=False)
+            locations_by_key[key] = location
+            if is_use_location_caching:
+                self.set_cached_location(lookup_text, location)
+                # Texts that only differ after the lookup text length share a lookup row
+                location_lookups[lookup_text] = LocationLookup(text=lookup_text, location=location, raw_result=raw_data)
+        
+        if location_lookups:
+            LocationLookup.objects.bulk_create(
+                list(location_lookups.values()), update_conflicts=True, update_fields=['location', 'raw_result']
+            )
+        
+        return locations_by_key
+
+
+location_resolver = LocationResolver()
+
+
 class LocationParser:
     
     def __init__(self, is_use_location_caching=True):
         self.is_use_location_caching = is_use_location_caching
-        self.location_lookups = {}
-        if is_use_location_caching:
-            self.location_lookups = {l.text.lower(): l.location for l in LocationLookup.objects.select_related('location').all()}
 
     def get_location(self, location_text, is_zip_code=False):
-        location_text = location_text.lower()
-        is_remote = bool(re.match('^.*?(remote|anywhere|virtual).*?$', location_text, re.IGNORECASE))
-        if location := self.location_lookups.get(location_text):
-            if location.is_remote == is_remote:
-                return location
-        
-        address = re.sub('remote|anywhere|virtual|:', '', location_text, flags=re.IGNORECASE).strip()
-        zip_code = None
-        if is_zip_code:
-            zip_code = address
-        location, raw_data = get_raw_location(address, zip_code=zip_code)
-        location = location or {}
-        location = save_raw_location(location, is_remote, raw_location_text=location_text, raw_data=raw_data, is_save_location_lookup=self.is_use_location_caching)
-        self.location_lookups[location_text] = location
-        return location
+        return location_resolver.get_location(
+            location_text, is_zip_code=is_zip_code, is_use_location_caching=self.is_use_location_caching
+        )
+    
+    def get_locations(self, location_texts, is_zip_code=False):
+        return location_resolver.get_locations(
+            location_texts, is_zip_code=is_zip_code, is_use_location_caching=self.is_use_location_caching
+        )
     
     @classmethod
     def get_is_remote(cls, location_text):
-        return bool(re.match('^.*?(remote|anywhere|virtual).*?$', location_text, re.IGNORECASE))
+        return LocationResolver.get_is_remote(location_text)
         
     
 class LocationSearchView(JobVyneAPIView):
@@ -1,7 +1,9 @@
 import asyncio
 import logging
+import time
 from itertools import groupby
 
+from asgiref.sync import sync_to_async
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status
@@ -13,6 +15,8 @@ from jvapp.models.location import Location
 from jvapp.serializers.location import get_serialized_location
 from jvapp.utils import ai
 from jvapp.utils.ai import PromptError
+from jvapp.utils.job_search import get_description_fingerprint
+from jvapp.utils.response_cache import bump_jobs_version
 
 logger = logging.getLogger(__name__)
 
@@ -56,12 +60,64 @@ class LocationView(JobVyneAPIView):
         }
 
 
+class JobClassificationStats:
+    """Throughput and cost counters for a job classification run
+    """
+    
+    def __init__(self):
+        self.start_time = time.monotonic()
+        self.job_count = 0
+        self.classified_count = 0
+        self.cached_count = 0
+        self.copied_count = 0
+        self.skipped_count = 0
+        self.failed_count = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0
+    
+    def add_request(self, request_tracker):
+        self.classified_count += 1
+        if getattr(request_tracker, 'is_cached', False):
+            # Cached responses don't cost anything
+            self.cached_count += 1
+            return
+        prompt_tokens, completion_tokens, cost = ai.get_request_usage(request_tracker)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost += cost
+    
+    @property
+    def jobs_per_minute(self):
+        elapsed_minutes = (time.monotonic() - self.start_time) / 60
+        processed_count = self.classified_count + self.copied_count + self.skipped_count + self.failed_count
+        return (processed_count / elapsed_minutes) if elapsed_minutes else 0
+    
+    def __str__(self):
+        return (
+            f'Jobs: {self.job_count} | Classified: {self.classified_count} (cached: {self.cached_count}) | '
+            f'Copied from same description: {self.copied_count} | '
+            f'Skipped: {self.skipped_count} | Failed: {self.failed_count} | '
+            f'Jobs/min: {self.jobs_per_minute:.1f} | '
+            f'Tokens: {self.prompt_tokens} prompt, {self.completion_tokens} completion | Cost: ${self.cost:.4f}'
+        )
+
+
 class JobClassificationView(JobVyneAPIView):
     DESCRIPTION_CHAR_LIMIT = 4500  # Prevent exceeding token limit in OpenAI. 1 token = 4 chars
     RESPONSIBILITY_LIMIT = 5
     QUALIFICATION_LIMIT = 10
     TECH_QUALIFICATION_LIMIT = 10
     CONCURRENT_REQUESTS = 10
+    FETCH_BATCH_SIZE = 200
+    SAVE_BATCH_SIZE = 100
+    CLASSIFICATION_VALUE_FIELDS = [
+        'qualifications_prompt_id', 'qualifications', 'technical_qualifications', 'responsibilities', 'job_description_summary'
+    ]
+    CLASSIFICATION_FIELDS = [
+        'qualifications_prompt', 'qualifications', 'technical_qualifications', 'responsibilities', 'job_description_summary',
+        'description_fingerprint'
+    ]
     
     def get(self, request):
         taxonomies = Taxonomy.objects.all().order_by('tax_type')
@@ -88,17 +144,6 @@ class JobClassificationView(JobVyneAPIView):
     
     @staticmethod
     def classify_jobs(limit, is_test=True):
-        # Find jobs that have not had their properties set
-        jobs = EmployerJob.objects.filter(
-            responsibilities__isnull=True,
-            qualifications__isnull=True,
-            technical_qualifications__isnull=True,
-            qualifications_prompt__isnull=True,
-        ).filter(Q(close_date__isnull=True) | Q(close_date__gt=timezone.now().date()))
-
-        if limit:
-            jobs = jobs[:limit]
-
         system_prompt = (
             'You are helping categorize job descriptions. The user will provide an individual job description for you to categorize.\n'
             f'Analyze the job description and categorize up to {JobClassificationView.RESPONSIBILITY_LIMIT} job responsibilities, up to {JobClassificationView.QUALIFICATION_LIMIT} required job qualifications, and up to {JobClassificationView.TECH_QUALIFICATION_LIMIT} technical qualifications. Examples of technical qualifications include software coding languages, industry certifications, and software tools. Do not list technical qualifications in the job qualifications.\n'
@@ -110,74 +155,200 @@ class JobClassificationView(JobVyneAPIView):
             f'{{"JOB_RESPONSIBILITIES": [], "JOB_QUALIFICATIONS": [], "TECHNICAL_QUALIFICATIONS": [], "JOB_DESCRIPTION": ""}}\n'
         )
         
-        job_idx = 0
-        while job_idx < len(jobs):
-            jobs_to_process = jobs[job_idx:job_idx+JobClassificationView.CONCURRENT_REQUESTS]
-            asyncio.run(
-                JobClassificationView.process_jobs(jobs_to_process, system_prompt, is_test)
+        stats = asyncio.run(JobClassificationView.run_classification(limit, system_prompt, is_test))
+        logger.info(f'Completed job classification. {stats}')
+        return stats
+    
+    @staticmethod
+    def get_unclassified_jobs(last_job_id, batch_size):
+        # Jobs are read by ID instead of by offset. Classified jobs drop out of the filter so offsets would skip jobs
+        return list(
+            EmployerJob.objects
+            .filter(
+                responsibilities__isnull=True,
+                qualifications__isnull=True,
+                technical_qualifications__isnull=True,
+                qualifications_prompt__isnull=True,
+                id__gt=last_job_id
             )
-
-            if not is_test:
-                EmployerJob.objects.bulk_update(
-                    jobs_to_process,
-                    ['qualifications_prompt', 'qualifications', 'technical_qualifications', 'responsibilities', 'job_description_summary']
-                )
+            .filter(Q(close_date__isnull=True) | Q(close_date__gt=timezone.now().date()))
+            .only('id', 'job_description')
+            .order_by('id')[:batch_size]
+        )
+    
+    @staticmethod
+    async def run_classification(limit, system_prompt, is_test):
+        """Keep a steady number of model requests in flight until all unclassified jobs (or the limit) are processed
+        One worker per concurrent request pulls jobs from a bounded queue which is refilled one batch at a time
+        Employers often post the same description for many jobs so only the first job with a description fingerprint
+        is sent to the model. The other jobs get a copy of its classification
+        """
+        stats = JobClassificationStats()
+        queue = asyncio.Queue(maxsize=JobClassificationView.CONCURRENT_REQUESTS * 2)
+        classified_jobs = []
+        # Fingerprint to the jobs waiting on the classification of the first job in the list
+        fingerprint_jobs = {}
+        # Fingerprint to the classification values of descriptions classified during this run
+        classifications = {}
+        workers = [
+            asyncio.create_task(JobClassificationView.summarize_job(
+                system_prompt, is_test, queue, fingerprint_jobs, classifications, classified_jobs, stats
+            ))
+            for _ in range(JobClassificationView.CONCURRENT_REQUESTS)
+        ]
+        
+        try:
+            last_job_id = 0
+            while not limit or stats.job_count < limit:
+                batch_size = JobClassificationView.FETCH_BATCH_SIZE
+                if limit:
+                    batch_size = min(batch_size, limit - stats.job_count)
+                jobs = await sync_to_async(JobClassificationView.get_unclassified_jobs)(last_job_id, batch_size)
+                if not jobs:
+                    break
+                last_job_id = jobs[-1].id
+                stats.job_count += len(jobs)
                 
-            job_idx += JobClassificationView.CONCURRENT_REQUESTS
+                new_jobs = []
+                for job in jobs:
+                    if not job.job_description:
+                        logger.info(f'No job description for job ID = {job.id}. Skipping.')
+                        stats.skipped_count += 1
+                        continue
+                    job.description_fingerprint = get_description_fingerprint(job.job_description)
+                    if same_description_jobs := fingerprint_jobs.get(job.description_fingerprint):
+                        # The first job with this description is still being classified
+                        same_description_jobs.append(job)
+                    else:
+                        fingerprint_jobs[job.description_fingerprint] = [job]
+                        new_jobs.append(job)
                 
+                # Descriptions that were classified earlier in this run or in a previous run
+                classifications.update(await sync_to_async(JobClassificationView.get_fingerprint_classifications)(
+                    [job.description_fingerprint for job in new_jobs if job.description_fingerprint not in classifications]
+                ))
+                jobs_to_classify = []
+                for job in new_jobs:
+                    if classification := classifications.get(job.description_fingerprint):
+                        same_description_jobs = fingerprint_jobs.pop(job.description_fingerprint)
+                        stats.copied_count += len(same_description_jobs)
+                        await JobClassificationView.add_classified_jobs(
+                            classification, same_description_jobs, classified_jobs, is_test
+                        )
+                    else:
+                        jobs_to_classify.append(job)
+                
+                # One query for all previous requests in the batch instead of one per job
+                cached_requests = await ai.get_cached_requests([
+                    JobClassificationView.get_job_prompt(job, system_prompt) for job in jobs_to_classify
+                ])
+                for job in jobs_to_classify:
+                    # Waits while the workers are busy
+                    await queue.put((job, cached_requests))
+                logger.info(f'Queued {stats.job_count} jobs for classification. {stats}')
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            # Wait until all workers are cancelled
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        await JobClassificationView.save_classified_jobs(classified_jobs, is_test)
+        return stats
+    
     @staticmethod
-    async def summarize_job(system_prompt, is_test, queue):
+    async def summarize_job(system_prompt, is_test, queue, fingerprint_jobs, classifications, classified_jobs, stats):
         while True:
-            job = await queue.get()
-            logger.info(f'Running job classification for job ID = {job.id}')
-            if not job.job_description:
-                logger.info(f'No job description for job ID = {job.id}. Skipping.')
-                queue.task_done()
-                continue
-            trunc_job_description = job.job_description[:JobClassificationView.DESCRIPTION_CHAR_LIMIT]
+            job, cached_requests = await queue.get()
             try:
-                if is_test:
-                    logger.info('----- SYSTEM PROMPT')
-                    logger.info(system_prompt)
-                    logger.info('----- USER PROMPT')
-                    logger.info(trunc_job_description)
-                resp, tracker = await ai.ask([
-                    {'role': 'system', 'content': system_prompt},
-                    {'role': 'user', 'content': trunc_job_description}
-                ], is_test=is_test)
-                job.qualifications_prompt = tracker
-                job.qualifications = resp.get('JOB_QUALIFICATIONS')
-                job.technical_qualifications = resp.get('TECHNICAL_QUALIFICATIONS')
-                job.responsibilities = resp.get('JOB_RESPONSIBILITIES')
-                job.job_description_summary = resp.get('JOB_DESCRIPTION')
-            except PromptError:
-                pass
-        
-            queue.task_done()
-        
+                is_classified = await JobClassificationView.classify_job(job, system_prompt, is_test, stats, cached_requests)
+            except Exception as e:
+                is_classified = False
+                stats.failed_count += 1
+                logger.exception(f'Unable to classify job ID = {job.id}: {e}')
+            
+            # Jobs with the same description that were fetched while this job was classified
+            same_description_jobs = fingerprint_jobs.pop(job.description_fingerprint, None) or [job]
+            try:
+                if is_classified:
+                    classification = {field: getattr(job, field) for field in JobClassificationView.CLASSIFICATION_VALUE_FIELDS}
+                    classifications[job.description_fingerprint] = classification
+                    stats.copied_count += len(same_description_jobs) - 1
+                    await JobClassificationView.add_classified_jobs(
+                        classification, same_description_jobs, classified_jobs, is_test
+                    )
+                else:
+                    # The waiting jobs stay unclassified so a later run will try their description again
+                    stats.failed_count += len(same_description_jobs) - 1
+            except Exception as e:
+                logger.exception(f'Unable to save classification for job ID = {job.id}: {e}')
+            finally:
+                queue.task_done()
+    
     @staticmethod
-    async def process_jobs(jobs, system_prompt, is_test):
-        queue = asyncio.Queue()
-        workers = [
-            asyncio.create_task(JobClassificationView.summarize_job(system_prompt, is_test, queue))
-            for _ in range(JobClassificationView.CONCURRENT_REQUESTS)
+    async def classify_job(job, system_prompt, is_test, stats, cached_requests=None):
+        """
+        :return: True if the classification fields were set on the job
+        """
+        logger.info(f'Running job classification for job ID = {job.id}')
+        prompt = JobClassificationView.get_job_prompt(job, system_prompt)
+        if is_test:
+            logger.info('----- SYSTEM PROMPT')
+            logger.info(system_prompt)
+            logger.info('----- USER PROMPT')
+            logger.info(prompt[1]['content'])
+        try:
+            resp, tracker = await ai.ask(prompt, is_test=is_test, cached_requests=cached_requests)
+        except PromptError:
+            stats.failed_count += 1
+            return False
+        stats.add_request(tracker)
+        job.qualifications_prompt = tracker
+        job.qualifications = resp.get('JOB_QUALIFICATIONS')
+        job.technical_qualifications = resp.get('TECHNICAL_QUALIFICATIONS')
+        job.responsibilities = resp.get('JOB_RESPONSIBILITIES')
+        job.job_description_summary = resp.get('JOB_DESCRIPTION')
+        return True
+    
+    @staticmethod
+    def get_job_prompt(job, system_prompt):
+        return [
+            {'role': 'system', 'content': system_prompt},
+            {'role': 'user', 'content': job.job_description[:JobClassificationView.DESCRIPTION_CHAR_LIMIT]}
         ]
-        
+    
+    @staticmethod
+    def get_fingerprint_classifications(fingerprints):
+        """
+        :return: Dict of description fingerprint to the classification values of a job that has that fingerprint
+        """
+        if not fingerprints:
+            return {}
+        classifications = {}
+        for classification in (
+            EmployerJob.objects
+            .filter(description_fingerprint__in=fingerprints, qualifications_prompt__isnull=False)
+            .values('description_fingerprint', *JobClassificationView.CLASSIFICATION_VALUE_FIELDS)
+        ):
+            classifications.setdefault(classification.pop('description_fingerprint'), classification)
+        return classifications
+    
+    @staticmethod
+    async def add_classified_jobs(classification, jobs, classified_jobs, is_test):
         for job in jobs:
-            await queue.put(job)
-
-        # Wait until the queue is fully processed
-        if not queue.empty():
-            logger.info(f'Waiting for job queue to finish - Currently {queue.qsize()}')
-            done, _ = await asyncio.wait([queue.join(), *workers], return_when=asyncio.FIRST_COMPLETED)
-            consumers_raised = set(done) & set(workers)
-            if consumers_raised:
-                logger.info(f'Found {len(consumers_raised)} consumers that raised exceptions')
-                await consumers_raised.pop()  # propagate the exception
-
-        for worker in workers:
-            worker.cancel()
-        
-        # Wait until all workers are cancelled
-        await asyncio.gather(*workers, return_exceptions=True)
-        logger.info(f'Completed summarizing {len(jobs)} jobs')
+            for field, val in classification.items():
+                setattr(job, field, val)
+        classified_jobs += jobs
+        if len(classified_jobs) >= JobClassificationView.SAVE_BATCH_SIZE:
+            jobs_to_save = classified_jobs[:]
+            classified_jobs.clear()
+            await JobClassificationView.save_classified_jobs(jobs_to_save, is_test)
+    
+    @staticmethod
+    async def save_classified_jobs(jobs, is_test):
+        if is_test or not jobs:
+            return
+        await sync_to_async(EmployerJob.objects.bulk_update)(jobs, JobClassificationView.CLASSIFICATION_FIELDS)
+        # Job summaries are part of cached job board responses
+        await sync_to_async(bump_jobs_version)()
+        logger.info(f'Saved classifications for {len(jobs)} jobs')
@@ -13,6 +13,7 @@ from jvapp.models.employer import Employer
 from jvapp.serializers.employer import get_serialized_employer_job
 from jvapp.serializers.location import get_serialized_location
 from jvapp.utils.data import coerce_bool
+from jvapp.utils.search import JOB_TITLE_FIELDS, get_search_filter
 
 
 class JobsView(JobVyneAPIView):
@@ -50,7 +51,7 @@ class JobsView(JobVyneAPIView):
         if job_department_ids := filter_params.get('job_departments'):
             job_filter &= Q(job_department_id__in=job_department_ids)
         if job_title := filter_params.get('job_title'):
-            job_filter &= Q(job_title__iregex=f'^.*{job_title}.*$')
+            job_filter &= get_search_filter(JOB_TITLE_FIELDS, job_title)
         if location_ids := filter_params.get('locations'):
             job_filter &= Q(locations_id__in=location_ids)
         if employment_types_filter := filter_params.get('employment_types'):
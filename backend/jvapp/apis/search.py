@@ -4,11 +4,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from jvapp.apis.taxonomy import TaxonomyJobProfessionView
+from jvapp.utils.response_cache import cache_public_response
 
 
 class SearchEntityView(APIView):
     permission_classes = [AllowAny]
     
+    @cache_public_response('search_entity')
     def get(self, request):
         search_text = request.query_params.get('search_text')
         
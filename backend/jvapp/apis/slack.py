@@ -2,13 +2,16 @@ import hashlib
 import hmac
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from json import JSONDecodeError
 from typing import Union
 
 from django.conf import settings
 from django.db import IntegrityError
 from django.db.models import F, Q
-from django.db.transaction import atomic
 from django.http import JsonResponse
 from django.utils import timezone
 from rest_framework import status
@@ -16,6 +19,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
 
 from jobVyne.multiPartJsonParser import RawFormParser
 from jvapp.apis._apiBase import JobVyneAPIView, SUCCESS_MESSAGE_KEY, get_error_response
@@ -68,40 +72,63 @@ class SlackBasePoster:
         self.slack_user_id = slack_user_id
         self.slack_post_responses = []
     
-    @atomic
     def send_slack_job_post(self, *args, **kwargs) -> Union[str, None]:
         """Return False if the post was successful"""
         if error_msg := self.has_error():
             return error_msg
         
         jobs = self.get_jobs_for_post(*args, **kwargs)
+        if error_msg := self.get_no_jobs_error(jobs):
+            return error_msg
+        
+        job_posts = self.send_messages(self.build_messages(jobs))
+        if not self.is_test:
+            JobPost.objects.bulk_create(job_posts)
+    
+    def get_no_jobs_error(self, jobs):
         if not jobs and not self.is_test:
             msg = 'No new jobs to post to Slack'
             logger.info(msg)
             return msg
-        
-        job_posts = []
+        return None
+    
+    def build_messages(self, jobs):
+        """Building messages can write to the database (e.g. job links) so it is done before anything is sent
+        :return: A list of (jobs in message, message blocks)
+        """
         if self.IS_PER_JOB_POST:
-            for job in jobs:
-                message = self.build_message(job, **self.message_data)
-                resp = self.send_slack_post(message)
-                raise_slack_exception_if_error(resp)
-                job_posts.append(self.generate_job_post(job, resp, message))
-        else:
-            message = self.build_message(jobs, **self.message_data)
-            resp = self.send_slack_post(message)
+            return [([job], self.build_message(job, **self.message_data)) for job in jobs]
+        return [(jobs, self.build_message(jobs, **self.message_data))]
+    
+    def send_messages(self, messages, call_slack=None):
+        """Send built messages. This doesn't use the database so it is safe to run on another thread
+        :param call_slack: Called with the send function and message. Used to rate limit sends
+        :return: Unsaved JobPosts for the jobs that were sent
+        """
+        call_slack = call_slack or (lambda send_fn, message: send_fn(message))
+        job_posts = []
+        for jobs, message in messages:
+            resp = call_slack(self.send_slack_post, message)
             raise_slack_exception_if_error(resp)
-            for job in jobs:
-                job_posts.append(self.generate_job_post(job, resp, message))
-        
-        if not self.is_test:
-            JobPost.objects.bulk_create(job_posts)
+            job_posts += [self.generate_job_post(job, resp, message) for job in jobs]
+        return job_posts
     
     def get_jobs_for_post(self, *args, **kwargs):
-        return SocialLinkPostJobsView.get_jobs_for_post(
-            self.max_jobs, self.post_channel,
-            employer_id=self.employer_id, owner_id=self.owner_id, recipient_id=self.recipient_id
-        )
+        return self.get_post_jobs(SocialLinkPostJobsView.get_jobs_for_post(**self.get_post_request()))
+    
+    def get_post_request(self):
+        return {
+            'max_job_count': self.max_jobs,
+            'social_channel': self.post_channel,
+            'employer_id': self.employer_id,
+            'owner_id': self.owner_id,
+            'recipient_id': self.recipient_id
+        }
+    
+    def get_post_jobs(self, jobs):
+        """Adjust the jobs selected for the post request
+        """
+        return jobs
     
     def generate_job_post(self, job, resp, message_blocks):
         meta_data = {
@@ -389,8 +416,7 @@ class SlackReferralPoster(SlackBasePoster):
         
         return blocks
     
-    def get_jobs_for_post(self):
-        jobs = super().get_jobs_for_post()
+    def get_post_jobs(self, jobs):
         if self.is_test:
             jobs = jobs[:1] if jobs else []
         return jobs
@@ -435,6 +461,148 @@ class SlackJobRecipientPoster(SlackBasePoster):
         )
 
 
+class SlackRateLimiter:
+    """Spaces out calls to one Slack workspace. All threads sending to the workspace share the limiter
+    """
+    
+    def __init__(self, calls_per_second):
+        self.interval_seconds = 1 / calls_per_second
+        self.next_call_ts = 0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            call_ts = max(now, self.next_call_ts)
+            self.next_call_ts = call_ts + self.interval_seconds
+        if call_ts > now:
+            time.sleep(call_ts - now)
+    
+    def pause(self, seconds):
+        with self.lock:
+            self.next_call_ts = max(self.next_call_ts, time.monotonic() + seconds)
+
+
+class SlackPostFanOut:
+    """Send posts for many posters at once
+    1. Jobs and messages are built for every poster on the calling thread. This is where all database work happens
+    2. Messages are sent concurrently. Each workspace has its own rate limit and a rate limited
+       response pauses that workspace for the Retry-After period
+    3. JobPosts for every successful send are saved in one insert
+    """
+    MAX_WORKERS = 10
+    # Slack allows bursts above 1 post per second per channel, but limits posts per workspace
+    WORKSPACE_CALLS_PER_SECOND = 5
+    MAX_RATE_LIMIT_RETRIES = 3
+    
+    def __init__(self, posters, max_workers=MAX_WORKERS):
+        self.posters = posters
+        self.max_workers = max_workers
+        self.rate_limiters = {}
+    
+    def run(self):
+        """
+        :return: The number of posters that sent successfully
+        """
+        prepared_posts = self.prepare_posts()
+        successful_posts = 0
+        job_posts = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.send_messages, poster, messages): poster
+                for poster, messages in prepared_posts
+            }
+            for future in as_completed(futures):
+                poster = futures[future]
+                try:
+                    poster_job_posts = future.result()
+                except Exception as e:
+                    logger.exception(f'Unable to send Slack post for Slack config (ID={poster.slack_cfg.id}): {e}')
+                    continue
+                successful_posts += 1
+                if not poster.is_test:
+                    job_posts += poster_job_posts
+        
+        JobPost.objects.bulk_create(job_posts)
+        logger.info(f'Sent {successful_posts} of {len(self.posters)} Slack posts')
+        return successful_posts
+    
+    def prepare_posts(self):
+        prepared_posts = []
+        for poster, jobs in zip(self.posters, self.get_posters_jobs()):
+            if jobs is None or poster.get_no_jobs_error(jobs):
+                continue
+            try:
+                messages = poster.build_messages(jobs)
+            except Exception as e:
+                logger.exception(f'Unable to build Slack post for Slack config (ID={poster.slack_cfg.id}): {e}')
+                continue
+            if poster.slack_cfg.id not in self.rate_limiters:
+                self.rate_limiters[poster.slack_cfg.id] = SlackRateLimiter(self.WORKSPACE_CALLS_PER_SECOND)
+            prepared_posts.append((poster, messages))
+        return prepared_posts
+    
+    def get_posters_jobs(self):
+        """
+        :return: The jobs for each poster. None if the poster can't post
+        """
+        posters_jobs = {}
+        batch_posters = []
+        for poster in self.posters:
+            if poster.has_error():
+                continue
+            if type(poster).get_jobs_for_post is SlackBasePoster.get_jobs_for_post:
+                batch_posters.append(poster)
+                continue
+            try:
+                posters_jobs[id(poster)] = poster.get_jobs_for_post()
+            except Exception as e:
+                logger.exception(f'Unable to get jobs for Slack config (ID={poster.slack_cfg.id}): {e}')
+        
+        # Candidate jobs and previous posts are queried once for all posters
+        try:
+            batch_jobs = SocialLinkPostJobsView.get_jobs_for_posts(
+                [poster.get_post_request() for poster in batch_posters]
+            )
+        except Exception as e:
+            logger.exception(f'Unable to get jobs for {len(batch_posters)} Slack posts: {e}')
+            batch_jobs = [None] * len(batch_posters)
+        for poster, jobs in zip(batch_posters, batch_jobs):
+            posters_jobs[id(poster)] = None if jobs is None else poster.get_post_jobs(jobs)
+        
+        return [posters_jobs.get(id(poster)) for poster in self.posters]
+    
+    def send_messages(self, poster, messages):
+        rate_limiter = self.rate_limiters[poster.slack_cfg.id]
+        
+        def call_slack(send_fn, message):
+            for retry_count in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+                rate_limiter.wait()
+                try:
+                    return send_fn(message)
+                except SlackApiError as e:
+                    is_rate_limited = e.response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+                    if not is_rate_limited or retry_count == self.MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    retry_after_seconds = self.get_retry_after_seconds(e.response)
+                    logger.warning(
+                        f'Slack rate limit for Slack config (ID={poster.slack_cfg.id}). '
+                        f'Retrying in {retry_after_seconds} seconds'
+                    )
+                    rate_limiter.pause(retry_after_seconds)
+        
+        return poster.send_messages(messages, call_slack=call_slack)
+    
+    @staticmethod
+    def get_retry_after_seconds(slack_response):
+        retry_after = next(
+            (val for key, val in (slack_response.headers or {}).items() if key.lower() == 'retry-after'), None
+        )
+        if isinstance(retry_after, list):
+            retry_after = retry_after[0] if retry_after else None
+        return coerce_int(retry_after, default=1)
+
+
 class SlackBaseView(JobVyneAPIView):
     permission_classes = [IsAdminOrEmployerPermission]
     
@@ -645,14 +813,9 @@ class SlackJobsMessageView(SlackBaseView):
             is_enabled=True,
             jobs_post_channel__isnull=False
         ).filter(post_filter)
-        successful_posts = 0
-        for slack_cfg in slack_cfgs:
-            slack_poster = SlackJobsMessageView.get_slack_poster(slack_cfg, False)
-            error_msg = slack_poster.send_slack_job_post()
-            if not error_msg:
-                successful_posts += 1
-        
-        return successful_posts
+        return SlackPostFanOut([
+            SlackJobsMessageView.get_slack_poster(slack_cfg, False) for slack_cfg in slack_cfgs
+        ]).run()
 
 
 class SlackReferralsMessageView(SlackBaseView):
@@ -681,14 +844,9 @@ class SlackReferralsMessageView(SlackBaseView):
             is_enabled=True,
             referrals_post_channel__isnull=False
         )
-        successful_posts = 0
-        for slack_cfg in slack_cfgs:
-            slack_poster = SlackReferralsMessageView.get_slack_poster(slack_cfg, False)
-            error_msg = slack_poster.send_slack_job_post()
-            if not error_msg:
-                successful_posts += 1
-        
-        return successful_posts
+        return SlackPostFanOut([
+            SlackReferralsMessageView.get_slack_poster(slack_cfg, False) for slack_cfg in slack_cfgs
+        ]).run()
 
 
 class SlackJobSeekerJobsView(SlackBaseView):
@@ -703,25 +861,22 @@ class SlackJobSeekerJobsView(SlackBaseView):
             subscription_type=UserSocialSubscription.SubscriptionType.jobs.value
         )
         slack_cfgs = {
-            sc.id: sc for sc in EmployerSlack.objects.filter(
+            sc.id: sc for sc in EmployerSlack.objects.select_related('employer').filter(
                 id__in=[sub.subscription_data['slack_cfg_id'] for sub in job_message_subscriptions]
             )
         }
         
-        successful_posts = 0
+        slack_posters = []
         for job_message_subscription in job_message_subscriptions:
             subscription_data = job_message_subscription.subscription_data
             slack_cfg = slack_cfgs[subscription_data['slack_cfg_id']]
-            slack_poster = SlackJobRecipientPoster(
+            slack_posters.append(SlackJobRecipientPoster(
                 slack_cfg, JobPost.PostChannel.SLACK_JOB.value,
                 employer_id=slack_cfg.employer_id, recipient_id=subscription_data['user_id'], is_test=is_test,
                 slack_user_id=subscription_data['slack_user_id'], message_data={'user': job_message_subscription.user}
-            )
-            error_msg = slack_poster.send_slack_job_post()
-            if not error_msg:
-                successful_posts += 1
+            ))
         
-        return successful_posts
+        return SlackPostFanOut(slack_posters).run()
 
 
 class SlackChannelView(SlackBaseView):
@@ -2,7 +2,7 @@ __all__ = ('SocialPlatformView', 'SocialLinkView', 'SocialLinkJobsView', 'ShareS
 
 import json
 import logging
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import timedelta
 from typing import Union
 
@@ -18,7 +18,8 @@ from jvapp.apis._apiBase import JobVyneAPIView, SUCCESS_MESSAGE_KEY, WARNING_MES
 from jvapp.apis.taxonomy import TaxonomyJobProfessionView
 from jvapp.models import JobVyneUser
 from jvapp.models.abstract import PermissionTypes
-from jvapp.models.employer import ConnectionTypeBit, Employer, EmployerConnection, Taxonomy
+from jvapp.models.content import JobPost
+from jvapp.models.employer import ConnectionTypeBit, Employer, EmployerConnection, EmployerJob, JobTaxonomy, Taxonomy
 from jvapp.models.job_seeker import JobApplication
 from jvapp.models.job_subscription import JobSubscription
 from jvapp.models.location import Location, REMOTE_TYPES
@@ -32,10 +33,14 @@ from jvapp.utils.data import AttributeCfg, coerce_bool, coerce_int, set_object_a
 from jvapp.utils.datetime import get_datetime_format_or_none
 from jvapp.utils.email import send_django_email
 from jvapp.utils.message import send_sms_message
+from jvapp.utils.response_cache import cache_public_response
 from jvapp.utils.sanitize import sanitize_html
 
 logger = logging.getLogger(__name__)
 
+# The fields needed to pick jobs for a post. Full jobs are only fetched for the jobs that are picked
+PostJobCandidate = namedtuple('PostJobCandidate', ('id', 'employer_id', 'job_title'))
+
 
 class SocialPlatformView(JobVyneAPIView):
     
@@ -300,6 +305,7 @@ class SocialLinkJobsView(JobVyneAPIView):
     LOOKBACK_DAYS = 90
     JOBS_PER_PAGE = 36
     
+    @cache_public_response('social_link_jobs')
     def get(self, request):
         from jvapp.apis.job_subscription import JobSubscriptionView
         from jvapp.apis.employer import EmployerJobView  # Avoid circular import
@@ -333,23 +339,18 @@ class SocialLinkJobsView(JobVyneAPIView):
                 warning_message = 'This link is no longer active.'
         
         jobs_filter = Q()
+        search_text = None
         if job_filters := self.query_params.get('job_filters'):
             job_filters = json.loads(job_filters)
+            search_text = job_filters.get('search_regex')
             if job_ids := job_filters.get('job_ids'):
-                jobs_filter &= Q(id__in=job_ids)
+                jobs_filter &= Q(job_id__in=job_ids)
             if job_profession_ids := job_filters.get('job_profession_ids'):
                 if not isinstance(job_profession_ids, list):
                     job_profession_ids = [job_profession_ids]
                 job_professions = Taxonomy.objects.prefetch_related('sub_taxonomies').filter(id__in=job_profession_ids)
                 total_professions = JobSubscriptionView.get_parent_and_child_professions(job_professions)
-                jobs_filter &= (
-                    Q(taxonomy__taxonomy_id__in=[p.id for p in total_professions])
-                )
-            if search_regex := job_filters.get('search_regex'):
-                jobs_filter &= (
-                        Q(job_title__iregex=f'^.*{search_regex}.*$') |
-                        Q(employer__employer_name__iregex=f'^.*{search_regex}.*$')
-                )
+                jobs_filter &= SocialLinkJobsView.get_profession_filter([p.id for p in total_professions])
             if minimum_salary := job_filters.get('minimum_salary'):
                 # Some jobs have a salary floor but no ceiling so we check for both
                 jobs_filter &= (Q(salary_ceiling__gte=minimum_salary) | Q(salary_floor__gte=minimum_salary))
@@ -357,7 +358,8 @@ class SocialLinkJobsView(JobVyneAPIView):
             jobs_filter &= SocialLinkJobsView.get_location_filter(
                 job_filters.get('location'),
                 coerce_int(job_filters.get('remote_type_bit')),
-                job_filters.get('range_miles')
+                job_filters.get('range_miles'),
+                is_job_search=True
             )
         
         no_results_data = {
@@ -381,21 +383,22 @@ class SocialLinkJobsView(JobVyneAPIView):
         )
         if not any((link_id, profession_key, employer_key, user_key, job_key, job_subscription_ids)):
             jobs, paginated_jobs = EmployerJobView.get_employer_jobs(
-                employer_job_filter=jobs_filter, lookback_days=self.LOOKBACK_DAYS, **common_job_getter_kwargs
+                job_search_filter=jobs_filter, lookback_days=self.LOOKBACK_DAYS,
+                job_search_text=search_text, **common_job_getter_kwargs
             )
             
         if job_subscription_ids:
             job_subscriptions = JobSubscriptionView.get_job_subscriptions(
                 subscription_filter=Q(id__in=job_subscription_ids))
             job_subscription_filter = JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions)
-            jobs_filter &= job_subscription_filter
             
             # User entered jobs may be posted to social channels like Slack with a link
             # They might not yet be approved, but we still want users to have access to the job
             # As long as this is a direct link to the job, we will display it
             is_single_job = len(job_subscriptions) == 1 and job_subscriptions[0].is_single_job_subscription
             jobs, paginated_jobs = EmployerJobView.get_employer_jobs(
-                employer_job_filter=jobs_filter, **common_job_getter_kwargs
+                employer_job_filter=job_subscription_filter, job_search_filter=jobs_filter or None,
+                job_search_text=search_text, **common_job_getter_kwargs
             )
             if not jobs and all((j.is_job_subscription for j in job_subscriptions)):
                 is_jobs_closed = True
@@ -407,23 +410,25 @@ class SocialLinkJobsView(JobVyneAPIView):
                 profession_ids = [profession['id']] + [sp['id'] for sp in profession['sub_professions']]
             except Taxonomy.DoesNotExist:
                 return Response(status=status.HTTP_200_OK, data=no_results_data)
-            jobs_filter &= Q(taxonomy__taxonomy_id__in=profession_ids)
+            jobs_filter &= SocialLinkJobsView.get_profession_filter(profession_ids)
             jobs, paginated_jobs = EmployerJobView.get_employer_jobs(
-                employer_job_filter=jobs_filter, lookback_days=self.LOOKBACK_DAYS, **common_job_getter_kwargs
+                job_search_filter=jobs_filter, lookback_days=self.LOOKBACK_DAYS,
+                job_search_text=search_text, **common_job_getter_kwargs
             )
         elif employer_key:
             try:
                 employer = Employer.objects.get(employer_key=employer_key)
             except Employer.DoesNotExist:
                 return Response(status=status.HTTP_200_OK, data=no_results_data)
+            job_subscription_filter = None
             if coerce_bool(self.query_params.get('is_employer')):
                 jobs_filter &= Q(employer=employer)
             else:
                 job_subscriptions = JobSubscriptionView.get_job_subscriptions(employer_id=employer.id)
                 job_subscription_filter = JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions)
-                jobs_filter &= job_subscription_filter
             jobs, paginated_jobs = EmployerJobView.get_employer_jobs(
-                employer_job_filter=jobs_filter, **common_job_getter_kwargs
+                employer_job_filter=job_subscription_filter, job_search_filter=jobs_filter,
+                job_search_text=search_text, **common_job_getter_kwargs
             )
         elif user_key:
             try:
@@ -462,11 +467,13 @@ class SocialLinkJobsView(JobVyneAPIView):
                             'country': user.home_location.country.name if user.home_location.country else None
                         },
                         0,
-                        None
+                        None,
+                        is_job_search=True
                     )
                 
                 jobs, paginated_jobs = EmployerJobView.get_employer_jobs(
-                    employer_job_filter=jobs_filter, lookback_days=self.LOOKBACK_DAYS, **common_job_getter_kwargs
+                    job_search_filter=jobs_filter, lookback_days=self.LOOKBACK_DAYS,
+                    job_search_text=search_text, **common_job_getter_kwargs
                 )
             except JobVyneUser.DoesNotExist:
                 return Response(status=status.HTTP_200_OK, data=no_results_data)
@@ -475,7 +482,7 @@ class SocialLinkJobsView(JobVyneAPIView):
                 no_results_data[WARNING_MESSAGES_KEY] = [warning_message]
                 return Response(status=status.HTTP_200_OK, data=no_results_data)
             jobs, paginated_jobs = self.get_jobs_from_social_link(
-                link, extra_filter=jobs_filter, is_include_fetch=True, user=self.user,
+                link, job_search_filter=jobs_filter or None, job_search_text=search_text, is_include_fetch=True, user=self.user,
                 jobs_per_page=self.JOBS_PER_PAGE, page_count=page_count
             )
         elif job_key:
@@ -516,6 +523,11 @@ class SocialLinkJobsView(JobVyneAPIView):
         
         return Response(status=status.HTTP_200_OK, data=data)
     
+    @staticmethod
+    def get_profession_filter(profession_ids):
+        # A job can have more than one profession so all of its taxonomies are checked, not just JobSearch.profession
+        return Q(job_id__in=JobTaxonomy.objects.filter(taxonomy_id__in=profession_ids).values('job_id'))
+    
     @staticmethod
     def get_serialized_job(job, employer_connections, user_connections, user):
         from jvapp.apis.community import JobConnectionsView
@@ -619,7 +631,10 @@ class SocialLinkJobsView(JobVyneAPIView):
         return job_data
     
     @staticmethod
-    def get_jobs_from_social_link(link, extra_filter=None, is_include_fetch=True, user=None, jobs_per_page=25, page_count=1):
+    def get_jobs_from_social_link(
+        link, extra_filter=None, job_search_filter=None, job_search_text=None, is_include_fetch=True, user=None,
+        jobs_per_page=25, page_count=1
+    ):
         from jvapp.apis.employer import EmployerJobView
         from jvapp.apis.job_subscription import JobSubscriptionView
         
@@ -630,12 +645,36 @@ class SocialLinkJobsView(JobVyneAPIView):
         
         logger.info('Fetching jobs')
         return EmployerJobView.get_employer_jobs(
-            employer_job_filter=job_filter, is_include_fetch=is_include_fetch, applicant_user=user,
+            employer_job_filter=job_filter, job_search_filter=job_search_filter, job_search_text=job_search_text,
+            is_include_fetch=is_include_fetch, applicant_user=user,
             jobs_per_page=jobs_per_page, page_count=page_count
         )
     
+    # Location lookups for EmployerJob and the denormalized JobSearch table
+    JOB_LOCATION_FIELDS = {
+        'geometry': 'locations__geometry',
+        'is_remote': 'locations__is_remote',
+        'city': 'locations__city__name',
+        'state': 'locations__state__name',
+        'country': 'locations__country__name',
+    }
+    JOB_SEARCH_LOCATION_FIELDS = {
+        'geometry': 'locations__geometry',
+        'is_remote': 'locations__is_remote',
+        'city': 'locations__city',
+        'state': 'locations__state',
+        'country': 'locations__country',
+    }
+    
     @staticmethod
-    def get_location_filter(location_dict: Union[dict, None], remote_type_bit: int, range_miles: Union[int, None]):
+    def get_location_filter(
+        location_dict: Union[dict, None], remote_type_bit: int, range_miles: Union[int, None], is_job_search=False
+    ):
+        fields = SocialLinkJobsView.JOB_SEARCH_LOCATION_FIELDS if is_job_search else SocialLinkJobsView.JOB_LOCATION_FIELDS
+        
+        def location_q(field_key, lookup=None, value=None):
+            return Q(**{f'{fields[field_key]}__{lookup}' if lookup else fields[field_key]: value})
+        
         location_filter = None
         remote_type_bit = remote_type_bit or 0
         location_dict = location_dict or {}
@@ -645,30 +684,30 @@ class SocialLinkJobsView(JobVyneAPIView):
         if city and range_miles:
             start_point = Location.get_geometry_point(location_dict['latitude'], location_dict['longitude'])
             location_filter = (
-                    Q(locations__geometry__within_miles=(start_point, range_miles)) |
-                    (Q(locations__city__name__isnull=True) & Q(locations__state__name=state)) |
-                    (Q(locations__city__name__isnull=True) & Q(locations__state__name__isnull=True) & Q(
-                        locations__country__name=country))
+                    location_q('geometry', 'within_miles', (start_point, range_miles)) |
+                    (location_q('city', 'isnull', True) & location_q('state', value=state)) |
+                    (location_q('city', 'isnull', True) & location_q('state', 'isnull', True) & location_q(
+                        'country', value=country))
             )
         elif state or country:
             if state:
                 location_filter = (
-                        Q(locations__state__name=state) |
-                        (Q(locations__state__name__isnull=True) & Q(locations__country__name=country))
+                        location_q('state', value=state) |
+                        (location_q('state', 'isnull', True) & location_q('country', value=country))
                 )
             elif country:
-                location_filter = Q(locations__country__name=country)
+                location_filter = location_q('country', value=country)
         
         remote_filter = None
         if (not remote_type_bit and location_filter) or (remote_type_bit & REMOTE_TYPES.YES.value):
-            remote_filter = Q(locations__is_remote=True)
+            remote_filter = location_q('is_remote', value=True)
             if country:
                 # Some remote jobs don't have a country. In this case, we assume it's a global remote job
-                remote_filter &= (Q(locations__country__name=country) | Q(locations__country__name__isnull=True))
+                remote_filter &= (location_q('country', value=country) | location_q('country', 'isnull', True))
         
         if remote_type_bit and (remote_type_bit & REMOTE_TYPES.NO.value) and not (
                 remote_type_bit & REMOTE_TYPES.YES.value):
-            remote_filter = Q(locations__is_remote=False)
+            remote_filter = location_q('is_remote', value=False)
         
         if remote_filter and location_filter:
             if remote_type_bit:
@@ -681,11 +720,64 @@ class SocialLinkJobsView(JobVyneAPIView):
             location_filter = Q()
         
         return location_filter
+    
+    @staticmethod
+    def get_location_matcher(location_dict: Union[dict, None], remote_type_bit: int, range_miles: Union[int, None]):
+        """Same rules as get_location_filter, applied in memory to a job location with its city, state, and country loaded
+        :return: A function that returns True if a location matches or None if locations aren't filtered
+        """
+        remote_type_bit = remote_type_bit or 0
+        location_dict = location_dict or {}
+        city = location_dict.get('city')
+        state = location_dict.get('state')
+        country = location_dict.get('country')
+        
+        def get_name(location_part):
+            return location_part.name if location_part else None
+        
+        location_match = None
+        if city and range_miles:
+            def location_match(location):
+                distance = Location.get_distance_miles(
+                    location_dict['latitude'], location_dict['longitude'], location.latitude, location.longitude
+                )
+                return (
+                    (distance is not None and distance < range_miles) or
+                    (not location.city and get_name(location.state) == state) or
+                    (not location.city and not location.state and get_name(location.country) == country)
+                )
+        elif state:
+            def location_match(location):
+                return get_name(location.state) == state or (
+                    not location.state and get_name(location.country) == country
+                )
+        elif country:
+            def location_match(location):
+                return get_name(location.country) == country
+        
+        remote_match = None
+        if (not remote_type_bit and location_match) or (remote_type_bit & REMOTE_TYPES.YES.value):
+            def remote_match(location):
+                # Some remote jobs don't have a country. In this case, we assume it's a global remote job
+                return location.is_remote and (not country or get_name(location.country) in (country, None))
+        
+        if remote_type_bit and (remote_type_bit & REMOTE_TYPES.NO.value) and not (
+                remote_type_bit & REMOTE_TYPES.YES.value):
+            def remote_match(location):
+                return not location.is_remote
+        
+        if remote_match and location_match:
+            if remote_type_bit:
+                return lambda location: location_match(location) and remote_match(location)
+            return lambda location: location_match(location) or remote_match(location)
+        return location_match or remote_match
 
 
 class SocialLinkPostJobsView(JobVyneAPIView):
     JOB_LOOKBACK_DAYS = 20
     MAX_JOBS = 10
+    # Most recent jobs considered for each post before picking unique and evenly distributed jobs
+    MAX_CANDIDATE_JOBS = 100
     
     def get(self, request):
         max_jobs = self.query_params.get('max_job_count') or self.MAX_JOBS
@@ -714,9 +806,6 @@ class SocialLinkPostJobsView(JobVyneAPIView):
     @staticmethod
     def get_jobs_for_post(max_job_count, social_channel, employer_id=None, owner_id=None, recipient_id=None,
                           job_subscriptions=None):
-        from jvapp.apis.employer import EmployerJobView
-        from jvapp.apis.job_subscription import JobSubscriptionView
-        
         """
         Owners and employers create job subscriptions which filter the relevant jobs to them and their users
         Recipients are part of a channel that an owner or employer uses (e.g. a recipient is part of a Slack group
@@ -726,48 +815,64 @@ class SocialLinkPostJobsView(JobVyneAPIView):
             (1a) The employer or owner has not PUSHED a post to a given channel
             (1b) The recipient has not RECEIVED a post to a given channel
         """
+        return SocialLinkPostJobsView.get_jobs_for_posts([{
+            'max_job_count': max_job_count,
+            'social_channel': social_channel,
+            'employer_id': employer_id,
+            'owner_id': owner_id,
+            'recipient_id': recipient_id,
+            'job_subscriptions': job_subscriptions
+        }], is_raise_error=True)[0]
+    
+    @staticmethod
+    def get_jobs_for_posts(post_requests, is_raise_error=False):
+        """Get the jobs for many posts at once (e.g. every recipient of a Slack channel)
+        Candidate jobs and previous posts are queried once for all posts and then matched in memory
+        :param post_requests: List of dicts with the same keys as the get_jobs_for_post arguments
+        :param is_raise_error: If False, a post that is missing its subscriptions or recipient gets no jobs
+        :return: A list of jobs for each post request, in the same order
+        """
+        from jvapp.apis.employer import EmployerJobView
         
-        if not any((employer_id, owner_id, recipient_id)):
-            raise ValueError('An employer ID, owner ID, or recipient ID is required')
-        
-        # Get job subscriptions
-        if not job_subscriptions:
-            if owner_id:
-                job_subscriptions = JobSubscriptionView.get_job_subscriptions(user_id=owner_id)
-                jobs_filter = JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions)
-                if not jobs_filter:
-                    raise ValueError('User does not have any job subscriptions')
-            else:
-                jobs_filter = Q(employer_id=employer_id)
-                job_subscriptions = JobSubscriptionView.get_job_subscriptions(employer_id=employer_id)
-                if job_subscription_filter := JobSubscriptionView.get_combined_job_subscription_filter(
-                        job_subscriptions):
-                    jobs_filter = (jobs_filter | job_subscription_filter)
-        else:
-            jobs_filter = JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions)
+        if not post_requests:
+            return []
         
         # Only post recent jobs
-        recent_jobs_filter = Q(
-            open_date__gte=timezone.now().date() - timedelta(days=SocialLinkPostJobsView.JOB_LOOKBACK_DAYS))
+        lookback_date = timezone.now().date() - timedelta(days=SocialLinkPostJobsView.JOB_LOOKBACK_DAYS)
+        recent_jobs_filter = EmployerJobView.get_employer_job_filter() & Q(open_date__gte=lookback_date)
         
-        # Don't post jobs that have already been posted
-        job_post_filter = Q(job_post__channel=social_channel)
-        if recipient_id:
-            job_post_filter &= Q(job_post__recipient_id=recipient_id)
-        elif owner_id:
-            job_post_filter &= Q(job_post__owner_id=owner_id)
-        else:
-            job_post_filter &= Q(job_post__employer_id=employer_id)
+        # Many posts share the same subscriptions (e.g. all recipients of one employer's channel)
+        # so each distinct jobs filter is only queried once
+        candidate_jobs = {}
+        source_job_ids = {}
+        post_source_keys = []
+        for post_request in post_requests:
+            try:
+                source_key, jobs_filter = SocialLinkPostJobsView.get_post_jobs_filter(post_request)
+            except ValueError as e:
+                if is_raise_error:
+                    raise e
+                logger.warning(f'Unable to get jobs for post: {e}')
+                source_key = None
+            else:
+                if source_key not in source_job_ids:
+                    source_job_ids[source_key] = SocialLinkPostJobsView.get_candidate_job_ids(
+                        recent_jobs_filter & jobs_filter, candidate_jobs
+                    )
+            post_source_keys.append(source_key)
         
         # Recipients may have their own preferred jobs which will be different than an
         # employer or owner's subscriptions. We prioritize these jobs first
-        preferred_jobs = []
-        if recipient_id:
+        recipient_ids = {post_request['recipient_id'] for post_request in post_requests if post_request.get('recipient_id')}
+        recipients = {}
+        preferred_job_ids = {}
+        if recipient_ids:
             home_location_prefetch = Prefetch(
                 'home_location',
                 queryset=Location.objects.select_related('city', 'state', 'country')
             )
-            owner = (
+            recipients = {
+                recipient.id: recipient for recipient in
                 JobVyneUser.objects
                 .prefetch_related(
                     'membership_employers',
@@ -775,29 +880,187 @@ class SocialLinkPostJobsView(JobVyneAPIView):
                     'job_search_professions__sub_taxonomies',
                     home_location_prefetch
                 )
-                .get(id=recipient_id)
+                .filter(id__in=recipient_ids)
+            }
+            preferred_job_ids = SocialLinkPostJobsView.get_preferred_job_ids(
+                recipients.values(), recent_jobs_filter, candidate_jobs
             )
-            preferred_jobs_filter = owner.preferred_jobs_filter
-            preferred_jobs_filter &= recent_jobs_filter
-            preferred_jobs_filter &= ~job_post_filter
-            preferred_jobs, _ = EmployerJobView.get_employer_jobs(employer_job_filter=preferred_jobs_filter, jobs_per_page=100)
-            preferred_jobs = SocialLinkPostJobsView.get_unique_jobs(preferred_jobs)[:max_job_count]
-            preferred_jobs = SocialLinkPostJobsView.get_even_employer_distribution_jobs(preferred_jobs, max_job_count)
+        
+        # Don't post jobs that have already been posted
+        posted_jobs = SocialLinkPostJobsView.get_posted_jobs(post_requests, lookback_date)
+        
+        post_jobs = []
+        for post_request, source_key in zip(post_requests, post_source_keys):
+            max_job_count = post_request['max_job_count']
+            post_key = (post_request['social_channel'], *SocialLinkPostJobsView.get_post_owner_key(post_request))
+            
+            def get_new_jobs(job_ids):
+                job_ids = [job_id for job_id in job_ids if (*post_key, job_id) not in posted_jobs]
+                return [candidate_jobs[job_id] for job_id in job_ids[:SocialLinkPostJobsView.MAX_CANDIDATE_JOBS]]
+            
+            preferred_jobs = []
+            if recipient_id := post_request.get('recipient_id'):
+                if recipient_id not in recipients:
+                    if is_raise_error:
+                        raise JobVyneUser.DoesNotExist(f'Recipient with ID {recipient_id} does not exist')
+                    logger.warning(f'Unable to get jobs for post: Recipient with ID {recipient_id} does not exist')
+                    post_jobs.append([])
+                    continue
+                preferred_jobs = get_new_jobs(preferred_job_ids.get(recipient_id, []))
+                preferred_jobs = SocialLinkPostJobsView.get_unique_jobs(preferred_jobs)[:max_job_count]
+                preferred_jobs = SocialLinkPostJobsView.get_even_employer_distribution_jobs(preferred_jobs, max_job_count)
+                
+                # If we already have the max number of jobs we stop here
+                if len(preferred_jobs) == max_job_count:
+                    post_jobs.append(preferred_jobs)
+                    continue
             
-            # If we already have the max number of jobs we stop here
-            if len(preferred_jobs) == max_job_count:
-                return preferred_jobs
+            if source_key is None:
+                post_jobs.append(preferred_jobs)
+                continue
+            
+            # Add in other (less relevant) jobs
+            jobs = SocialLinkPostJobsView.get_unique_jobs(get_new_jobs(source_job_ids[source_key]))
+            max_non_preferred_jobs = max_job_count - len(preferred_jobs)
+            jobs = SocialLinkPostJobsView.get_even_employer_distribution_jobs(jobs, max_non_preferred_jobs)
+            post_jobs.append(preferred_jobs + jobs[:max_non_preferred_jobs])
+        
+        # Fetch the full jobs for all posts with a single query
+        selected_job_ids = {job.id for jobs in post_jobs for job in jobs}
+        full_jobs = {}
+        if selected_job_ids:
+            jobs, _ = EmployerJobView.get_employer_jobs(
+                employer_job_filter=Q(id__in=selected_job_ids), jobs_per_page=len(selected_job_ids)
+            )
+            full_jobs = {job.id: job for job in jobs}
+        return [[full_jobs[job.id] for job in jobs if job.id in full_jobs] for jobs in post_jobs]
+    
+    @staticmethod
+    def get_post_jobs_filter(post_request):
+        """
+        :return: A key that is the same for posts with the same filter and the jobs filter
+        """
+        from jvapp.apis.job_subscription import JobSubscriptionView
+        
+        employer_id = post_request.get('employer_id')
+        owner_id = post_request.get('owner_id')
+        if not any((employer_id, owner_id, post_request.get('recipient_id'))):
+            raise ValueError('An employer ID, owner ID, or recipient ID is required')
+        if job_subscriptions := post_request.get('job_subscriptions'):
+            job_subscriptions = list(job_subscriptions)
+            return (
+                ('subscriptions', tuple(sorted(job_subscription.id for job_subscription in job_subscriptions))),
+                JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions)
+            )
+        if owner_id:
+            job_subscriptions = JobSubscriptionView.get_job_subscriptions(user_id=owner_id)
+            jobs_filter = JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions)
+            if not jobs_filter:
+                raise ValueError('User does not have any job subscriptions')
+            return ('owner', owner_id), jobs_filter
+        
+        jobs_filter = Q(employer_id=employer_id)
+        job_subscriptions = JobSubscriptionView.get_job_subscriptions(employer_id=employer_id)
+        if job_subscription_filter := JobSubscriptionView.get_combined_job_subscription_filter(job_subscriptions):
+            jobs_filter = (jobs_filter | job_subscription_filter)
+        return ('employer', employer_id), jobs_filter
+    
+    @staticmethod
+    def get_post_owner_key(post_request):
+        # Recipients track jobs they RECEIVED. Employers and owners track jobs they PUSHED
+        if recipient_id := post_request.get('recipient_id'):
+            return 'recipient', recipient_id
+        if owner_id := post_request.get('owner_id'):
+            return 'owner', owner_id
+        return 'employer', post_request.get('employer_id')
+    
+    @staticmethod
+    def get_candidate_job_ids(jobs_filter, candidate_jobs):
+        """Get the IDs of jobs matching the filter, newest first
+        Only the fields used to pick jobs are fetched. They are added to candidate_jobs
+        """
+        job_ids = {}
+        for job_id, employer_id, job_title in (
+            EmployerJob.objects.filter(jobs_filter).values_list('id', 'employer_id', 'job_title')
+        ):
+            # Jobs can be duplicated when filtering on taxonomies or locations
+            job_ids[job_id] = True
+            if job_id not in candidate_jobs:
+                candidate_jobs[job_id] = PostJobCandidate(job_id, employer_id, job_title)
+        return list(job_ids.keys())
+    
+    @staticmethod
+    def get_preferred_job_ids(recipients, recent_jobs_filter, candidate_jobs):
+        """Match recipients to their preferred jobs. Same rules as JobVyneUser.preferred_jobs_filter
+        :return: Dict of recipient ID to preferred job IDs, newest first
+        """
+        from jvapp.apis.job_subscription import JobSubscriptionView
+        
+        employer_ids = {employer.id for recipient in recipients for employer in recipient.membership_employers.all()}
+        if not employer_ids:
+            return {}
+        pool_filter = recent_jobs_filter & Q(employer_id__in=employer_ids)
+        pool_job_ids = SocialLinkPostJobsView.get_candidate_job_ids(pool_filter, candidate_jobs)
+        pool_jobs = EmployerJob.objects.filter(pool_filter).values('id')
         
-        # Add in other (less relevant) jobs
-        jobs_filter &= recent_jobs_filter
-        jobs_filter &= ~job_post_filter
+        job_profession_ids = defaultdict(set)
+        for job_id, taxonomy_id in JobTaxonomy.objects.filter(job_id__in=pool_jobs).values_list('job_id', 'taxonomy_id'):
+            job_profession_ids[job_id].add(taxonomy_id)
         
-        jobs, _ = EmployerJobView.get_employer_jobs(employer_job_filter=jobs_filter, jobs_per_page=100)
-        jobs = SocialLinkPostJobsView.get_unique_jobs(jobs)
-        max_non_preferred_jobs = max_job_count - len(preferred_jobs)
-        jobs = SocialLinkPostJobsView.get_even_employer_distribution_jobs(jobs, max_non_preferred_jobs)
+        job_locations = defaultdict(list)
+        if any(recipient.home_location_id for recipient in recipients):
+            for job_location in (
+                EmployerJob.locations.through.objects
+                .select_related('location__city', 'location__state', 'location__country')
+                .filter(employerjob_id__in=pool_jobs)
+            ):
+                job_locations[job_location.employerjob_id].append(job_location.location)
+        
+        preferred_job_ids = {}
+        for recipient in recipients:
+            recipient_employer_ids = {employer.id for employer in recipient.membership_employers.all()}
+            profession_ids = {
+                profession.id for profession in
+                JobSubscriptionView.get_parent_and_child_professions(recipient.job_search_professions.all())
+            }
+            location_matcher = None
+            if recipient.home_location_id:
+                location_matcher = SocialLinkJobsView.get_location_matcher(
+                    get_serialized_location(recipient.home_location), recipient.work_remote_type_bit,
+                    recipient.DEFAUL_JOB_SEARCH_RANGE_MILES
+                )
+            preferred_job_ids[recipient.id] = [
+                job_id for job_id in pool_job_ids
+                if candidate_jobs[job_id].employer_id in recipient_employer_ids
+                and job_profession_ids[job_id] & profession_ids
+                and (not location_matcher or any(location_matcher(location) for location in job_locations[job_id]))
+            ]
+        return preferred_job_ids
+    
+    @staticmethod
+    def get_posted_jobs(post_requests, lookback_date):
+        """
+        :return: Set of (channel, owner type, owner ID, job ID) for jobs that have already been posted
+        """
+        owner_ids = defaultdict(set)
+        for post_request in post_requests:
+            owner_type, owner_id = SocialLinkPostJobsView.get_post_owner_key(post_request)
+            owner_ids[owner_type].add(owner_id)
+        owner_filter = Q()
+        for owner_type, ids in owner_ids.items():
+            owner_filter |= Q(**{f'{owner_type}_id__in': ids})
         
-        return preferred_jobs + jobs[:max_non_preferred_jobs]
+        posted_jobs = set()
+        # Jobs outside the lookback window are never candidates so their posts aren't needed
+        for job_post in JobPost.objects.filter(
+            owner_filter,
+            channel__in={post_request['social_channel'] for post_request in post_requests},
+            job__open_date__gte=lookback_date
+        ).values('channel', 'recipient_id', 'owner_id', 'employer_id', 'job_id'):
+            for owner_type in ('recipient', 'owner', 'employer'):
+                if owner_id := job_post[f'{owner_type}_id']:
+                    posted_jobs.add((job_post['channel'], owner_type, owner_id, job_post['job_id']))
+        return posted_jobs
     
     @staticmethod
     def get_unique_jobs(jobs):
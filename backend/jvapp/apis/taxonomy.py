@@ -1,17 +1,19 @@
-from django.db.models import Count, Prefetch, Q
-from django.utils import timezone
+from django.db.models import Prefetch, Q
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
 from jvapp.apis._apiBase import JobVyneAPIView, get_success_response, get_warning_response
-from jvapp.models.employer import JobTaxonomy, Taxonomy
+from jvapp.models.employer import ProfessionJobCount, Taxonomy
 from jvapp.permissions.general import IsAdminOrRead
+from jvapp.utils.response_cache import cache_public_response
+from jvapp.utils.search import TAXONOMY_NAME_FIELDS, get_search_filter
 
 
 class TaxonomyJobProfessionView(JobVyneAPIView):
     permission_classes = [IsAdminOrRead]
     
+    @cache_public_response('job_profession_taxonomy')
     def get(self, request):
         return Response(status=status.HTTP_200_OK, data=self.get_job_profession_taxonomy(is_include_subs=True))
     
@@ -39,8 +41,10 @@ class TaxonomyJobProfessionView(JobVyneAPIView):
         elif tax_key:
             tax_filter &= Q(key=tax_key)
         elif search_text:
-            tax_filter &= Q(name__iregex=f'^.*{search_text}.*$') | Q(
-                sub_taxonomies__name__iregex=f'^.*{search_text}.*$')
+            tax_filter &= (
+                get_search_filter(TAXONOMY_NAME_FIELDS, search_text)
+                | get_search_filter(TAXONOMY_NAME_FIELDS, search_text, field_prefix='sub_taxonomies__')
+            )
         else:
             tax_filter &= Q(parent_taxonomy__isnull=True)
         
@@ -48,7 +52,7 @@ class TaxonomyJobProfessionView(JobVyneAPIView):
         if is_include_subs:
             sub_taxonomy_filter = Q()
             if search_text:
-                sub_taxonomy_filter = Q(name__iregex=f'^.*{search_text}.*$')
+                sub_taxonomy_filter = get_search_filter(TAXONOMY_NAME_FIELDS, search_text)
             sub_profession_prefetch = Prefetch(
                 'sub_taxonomies',
                 queryset=Taxonomy.objects.filter(sub_taxonomy_filter),
@@ -63,19 +67,14 @@ class TaxonomyJobProfessionView(JobVyneAPIView):
             for sub_tax in sub_taxes:
                 taxonomy_ids.append(sub_tax.id)
         
-        # Running two queries for the taxonomies and taxonomy jobs is more efficient
-        # than using Django's prefetch with a filter/annotate/count for jobs
+        # Job counts are maintained by the job search refresh so they don't need to be aggregated per request
         taxonomy_job_count_map = {}
         if is_include_job_count:
-            current_job_filter = Q(job__close_date__isnull=True) | Q(job__close_date__gt=timezone.now().date())
-            taxonomy_job_count_map = {
-                t['taxonomy_id']: t['job_count'] for t in (
-                    JobTaxonomy.objects
-                    .filter(current_job_filter)
-                    .values('taxonomy_id')
-                    .annotate(job_count=Count('taxonomy_id'))
-                )
-            }
+            taxonomy_job_count_map = dict(
+                ProfessionJobCount.objects
+                .filter(taxonomy_id__in=taxonomy_ids, country__isnull=True, is_remote__isnull=True)
+                .values_list('taxonomy_id', 'job_count')
+            )
         
         serialized_professions = []
         for tax, sub_taxes in taxonomy_map.items():
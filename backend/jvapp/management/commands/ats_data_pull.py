@@ -1,45 +1,83 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from time import sleep
 
 from django.core.management import BaseCommand
+from django.db import connections
 
 from jvapp.apis.ats import get_ats_api
 from jvapp.models.employer import EmployerAts
 
 logger = logging.getLogger(__name__)
 
+MAX_FETCH_WORKERS = 8
 
-def save_ats_data(writer=None, success_style=None):
+
+def fetch_ats_changes(ats_cfg, is_full_sync=False):
+    # Runs in a worker thread. Only ATS requests happen here so all saving stays on the calling thread
+    try:
+        ats_api = get_ats_api(ats_cfg)
+        return ats_api, ats_api.fetch_changes(is_full_sync=is_full_sync)
+    finally:
+        # Lever token refreshes use a database connection from this thread
+        connections.close_all()
+
+
+def save_ats_data(writer=None, success_style=None, is_full_sync=False, max_workers=MAX_FETCH_WORKERS):
+    """Fetch ATS changes for all employers concurrently and save each employer's changes as they arrive
+    :param is_full_sync: If True, all jobs and application statuses are pulled instead of changes since the last sync
+    """
     if not writer:
         writer = lambda x: print(x)
     if not success_style:
         success_style = lambda x: x
-    ats_cfgs = EmployerAts.objects.select_related('employer').all()
-    for ats in ats_cfgs:
-        writer(f'Starting to save jobs for {ats.employer.employer_name}')
-        ats_api = get_ats_api(ats)
-        try:
-            jobs = ats_api.get_jobs()
-            ats_api.save_jobs(jobs)
-        except Exception as e:
-            logger.error(f'Error saving jobs for {ats.employer.employer_name}', exc_info=e)
-            writer(f'Error saving jobs for {ats.employer.employer_name}')
-            writer(str(e))
-        writer(f'Successfully saved jobs for {ats.employer.employer_name}')
-
-        writer(f'Starting to save application statuses for {ats.employer.employer_name}')
-        try:
-            application_statuses = ats_api.get_application_statuses()
-            ats_api.save_application_statuses(application_statuses)
-        except Exception as e:
-            logger.error(f'Error saving application statuses for {ats.employer.employer_name}', exc_info=e)
-            writer(f'Error saving application statuses for {ats.employer.employer_name}')
-            writer(str(e))
-        writer(f'Successfully saved application statuses for {ats.employer.employer_name}')
-        
+    ats_cfgs = list(EmployerAts.objects.select_related('employer').all())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_ats_changes, ats, is_full_sync): ats for ats in ats_cfgs}
+        for future in as_completed(futures):
+            ats = futures[future]
+            try:
+                ats_api, changes = future.result()
+            except Exception as e:
+                logger.error(f'Error connecting to ATS for {ats.employer.employer_name}', exc_info=e)
+                writer(f'Error connecting to ATS for {ats.employer.employer_name}')
+                writer(str(e))
+                continue
+            save_ats_changes(ats, ats_api, changes, writer)
+
     writer(success_style(f'Updated data from ATS for {len(ats_cfgs)} employers'))
 
 
+def save_ats_changes(ats, ats_api, changes, writer):
+    writer(f'Starting to save jobs for {ats.employer.employer_name}')
+    try:
+        if changes.jobs_error:
+            raise changes.jobs_error
+        ats_api.save_job_changes(changes)
+        writer(
+            f'Successfully saved {len(changes.jobs)} jobs for {ats.employer.employer_name}'
+            + ('' if changes.is_full_jobs_sync else f' ({len(changes.closed_job_keys)} closed)')
+        )
+    except Exception as e:
+        logger.error(f'Error saving jobs for {ats.employer.employer_name}', exc_info=e)
+        writer(f'Error saving jobs for {ats.employer.employer_name}')
+        writer(str(e))
+
+    if changes.application_statuses is None and not changes.applications_error:
+        writer(f'Application statuses for {ats.employer.employer_name} are updated by webhooks')
+        return
+    writer(f'Starting to save application statuses for {ats.employer.employer_name}')
+    try:
+        if changes.applications_error:
+            raise changes.applications_error
+        ats_api.save_application_status_changes(changes)
+        writer(f'Successfully saved application statuses for {ats.employer.employer_name}')
+    except Exception as e:
+        logger.error(f'Error saving application statuses for {ats.employer.employer_name}', exc_info=e)
+        writer(f'Error saving application statuses for {ats.employer.employer_name}')
+        writer(str(e))
+
+
 class Command(BaseCommand):
     help = 'Update JobVyne data with ATS jobs and application statuses'
     
@@ -49,15 +87,21 @@ class Command(BaseCommand):
             type=int,
             help='Minutes between when task is run',
         )
+        parser.add_argument(
+            '--full_sync',
+            action='store_true',
+            help='Pull all jobs and application statuses instead of changes since the last sync',
+        )
     
     def handle(self, *args, **options):
         writer = self.stdout.write
         success_style = self.style.SUCCESS
         schedule_minutes = options['schedule_minutes']
+        is_full_sync = options['full_sync']
         if schedule_minutes:
             while True:
-                save_ats_data(writer, success_style)
+                save_ats_data(writer, success_style, is_full_sync=is_full_sync)
                 writer(f'Waiting {schedule_minutes} minutes for next run')
                 sleep(schedule_minutes*60)
         else:
-            save_ats_data(writer, success_style)
+            save_ats_data(writer, success_style, is_full_sync=is_full_sync)
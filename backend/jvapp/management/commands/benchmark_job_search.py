@@ -0,0 +1,50 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db.models import Q
+
+from jvapp.models.employer import JobSearch
+from jvapp.utils.search import JOB_SEARCH_FIELDS, get_search_filter, get_search_rank
+
+
+def time_query(queryset, page_size):
+    start_time = time.perf_counter()
+    count = queryset.count()
+    list(queryset[:page_size])
+    return count, time.perf_counter() - start_time
+
+
+class Command(BaseCommand):
+    help = 'Compare job search latency of regex filters and the full text index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--search_texts',
+            nargs='+',
+            default=['engineer', 'data sci', 'product manager', 'nurse', 'python developer'],
+            help='Search terms to benchmark',
+        )
+        parser.add_argument('--page_size', type=int, default=36)
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        self.stdout.write(f'Searching {JobSearch.objects.count()} job search rows')
+        for search_text in options['search_texts']:
+            regex_jobs = JobSearch.objects.filter(
+                Q(job_title__iregex=f'^.*{search_text}.*$') | Q(employer_name__iregex=f'^.*{search_text}.*$')
+            ).values('job_id')
+            regex_count, regex_seconds = time_query(regex_jobs, page_size)
+
+            full_text_jobs = (
+                JobSearch.objects
+                .filter(get_search_filter(JOB_SEARCH_FIELDS, search_text))
+                .order_by(get_search_rank(JOB_SEARCH_FIELDS, search_text).desc(), '-open_date', '-job_id')
+                .values('job_id')
+            )
+            full_text_count, full_text_seconds = time_query(full_text_jobs, page_size)
+            self.stdout.write(
+                f'"{search_text}" | Regex: {regex_count} jobs in {regex_seconds * 1000:.0f}ms | '
+                f'Full text: {full_text_count} jobs in {full_text_seconds * 1000:.0f}ms'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Completed job search benchmark'))
@@ -0,0 +1,82 @@
+import re
+import time
+from functools import reduce
+from unittest.mock import patch
+
+from django.core.management import BaseCommand
+
+from jvapp.models.currency import currencies, currency_lookup
+from jvapp.models.employer import EmployerJob
+from jvapp.utils import money
+from jvapp.utils.money import compensation_data_template, currency_characters, get_best_compensation_group, \
+    get_grouped_compensation_matches, salary_extractor
+from jvapp.utils.sanitize import sanitize_html, sanitize_html_many
+
+# Compensation pattern without the lookahead
+REFERENCE_COMPENSATION_PATTERN = f'(?P<currency>{currency_characters})?\\s?(?P<first_numbers>[0-9]+((\\.?[0-9]+)|([0-9]*?))),?(?P<second_numbers>[0-9]+(\\.?[0-9]+)?)?\\s?(?P<thousand_marker>[kK])?'
+
+
+def parse_compensation_text_reference(text, salary_interval='year'):
+    """parse_compensation_text before the salary extractor. Every number in the text is grouped
+    Run it with money.compensation_pattern patched to REFERENCE_COMPENSATION_PATTERN
+    """
+    if not text:
+        return {**compensation_data_template}
+    text = sanitize_html(text)
+    bad_salary_floor = 40000 if salary_interval == 'year' else 1
+    bad_salary_ceiling = 500000
+    best_compensation_match = get_best_compensation_group(
+        get_grouped_compensation_matches(text, bad_salary_floor, bad_salary_ceiling), bad_salary_floor, bad_salary_ceiling
+    )
+    currency_pattern = reduce(lambda full_str, currency: f'{full_str}|{currency}', currencies)
+    currency = None
+    if best_compensation_match and best_compensation_match['currency']:
+        currency = currency_lookup.get(best_compensation_match['currency'], None)
+    elif currency_match := re.search(f'({currency_pattern})\\s', text):
+        currency = currency_match.group(0).strip()
+    if not all((best_compensation_match, currency)):
+        return {**compensation_data_template}
+    return {
+        'salary_interval': salary_interval,
+        'salary_currency': currency,
+        'salary_floor': best_compensation_match['salary'][0],
+        'salary_ceiling': best_compensation_match['salary'][-1]
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare salary extraction speed of the original compensation parser and the salary extractor'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=10000,
+            help='Maximum number of job descriptions to parse',
+        )
+
+    def handle(self, *args, **options):
+        job_descriptions = list(
+            EmployerJob.objects
+            .filter(job_description__isnull=False)
+            .values_list('job_description', flat=True)[:options['limit']]
+        )
+        # Sanitize up front so both parsers are timed on the same text
+        job_descriptions = sanitize_html_many(job_descriptions)
+
+        with patch.object(money, 'compensation_pattern', re.compile(REFERENCE_COMPENSATION_PATTERN)):
+            start_time = time.perf_counter()
+            reference_results = [parse_compensation_text_reference(description) for description in job_descriptions]
+            reference_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        extractor_results = [
+            salary_extractor.extract(description, is_sanitized=True) for description in job_descriptions
+        ]
+        extractor_seconds = time.perf_counter() - start_time
+
+        mismatch_count = sum(1 for a, b in zip(reference_results, extractor_results) if a != b)
+        self.stdout.write(
+            f'{len(job_descriptions)} descriptions | '
+            f'Reference: {reference_seconds:.2f}s | Salary extractor: {extractor_seconds:.2f}s | '
+            f'{mismatch_count} mismatched salaries'
+        )
+        self.stdout.write(self.style.SUCCESS('Completed salary extraction benchmark'))
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from django.core.management import BaseCommand
+
+from scrape.employer_scrapers import all_scrapers
+from scrape.scraper import run_scraper
+
+
+async def benchmark_scraper(scraper_class, is_share_client_session):
+    benchmark_class = type(
+        scraper_class.__name__, (scraper_class,), {'IS_SHARE_CLIENT_SESSION': is_share_client_session}
+    )
+    start_time = time.perf_counter()
+    scraper = await run_scraper(benchmark_class(None, None, []))
+    await scraper.close_connections()
+    return {
+        'pages': scraper.job_page_count,
+        'seconds': time.perf_counter() - start_time,
+        **scraper.connection_stats
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare HTTP connection handshakes for scrapers with and without a shared client session'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employer_names',
+            nargs='+',
+            help='Names of the employers to scrape. Scrapers that require a browser are skipped',
+        )
+
+    def handle(self, *args, **options):
+        writer = self.stdout.write
+        for employer_name in options['employer_names'] or []:
+            scraper_class = all_scrapers.get(employer_name)
+            if not scraper_class:
+                writer(self.style.ERROR(f'No scraper found for {employer_name}'))
+                continue
+            if scraper_class.is_browser_required():
+                writer(f'Skipping {employer_name}. Scraper requires a browser')
+                continue
+
+            for label, is_share_client_session in (('Before (session per page)', False), ('After (shared session)', True)):
+                stats = asyncio.run(benchmark_scraper(scraper_class, is_share_client_session))
+                writer(
+                    f'{employer_name} | {label}: {stats["pages"]} pages in {stats["seconds"]:.1f}s | '
+                    f'{stats["connections_created"]} handshakes | {stats["connections_reused"]} reused connections'
+                )
+
+        self.stdout.write(self.style.SUCCESS('Completed scrape connection benchmark'))
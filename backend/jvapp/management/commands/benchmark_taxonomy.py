@@ -0,0 +1,63 @@
+import re
+import time
+
+from django.core.management import BaseCommand
+
+from jvapp.models.employer import EmployerJob
+from jvapp.utils.taxonomy import JOB_TAXONOMY_TESTS, JobTitleClassifier
+
+
+def get_uncompiled_profession_key(job_title):
+    # The original classifier which matches every taxonomy test pattern without compiling it
+    profession_weights = {}
+    for tax_test in JOB_TAXONOMY_TESTS:
+        is_match = bool(re.match(tax_test.test_pattern, job_title, re.IGNORECASE))
+        if tax_test.test_negate_pattern:
+            is_match = is_match and not bool(re.match(tax_test.test_negate_pattern, job_title, re.IGNORECASE))
+        if not is_match:
+            continue
+        for idx, confidence_weight in enumerate(tax_test.confidence_weights):
+            weight = confidence_weight.weight + len(tax_test.confidence_weights) - idx
+            profession_weights[confidence_weight.taxonomy_key] = profession_weights.get(confidence_weight.taxonomy_key, 0) + weight
+    if not profession_weights:
+        return None
+    return sorted(profession_weights.items(), key=lambda x: x[1], reverse=True)[0][0]
+
+
+class Command(BaseCommand):
+    help = 'Compare job title classification speed of the uncompiled and compiled taxonomy classifiers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles_file',
+            help='Path to a file with one job title per line. Defaults to job titles in the database',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=100000,
+            help='Maximum number of job titles to classify',
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        if titles_file := options.get('titles_file'):
+            with open(titles_file) as f:
+                job_titles = [line.strip() for line in f if line.strip()][:limit]
+        else:
+            job_titles = list(EmployerJob.objects.values_list('job_title', flat=True)[:limit])
+
+        start_time = time.perf_counter()
+        uncompiled_keys = [get_uncompiled_profession_key(job_title) for job_title in job_titles]
+        uncompiled_seconds = time.perf_counter() - start_time
+
+        classifier = JobTitleClassifier()
+        start_time = time.perf_counter()
+        compiled_keys = [classifier.get_profession_key(job_title) for job_title in job_titles]
+        compiled_seconds = time.perf_counter() - start_time
+
+        mismatch_count = sum(1 for a, b in zip(uncompiled_keys, compiled_keys) if a != b)
+        self.stdout.write(
+            f'{len(job_titles)} titles ({len(classifier.profession_keys)} unique) | '
+            f'Uncompiled: {uncompiled_seconds:.2f}s | Compiled: {compiled_seconds:.2f}s | '
+            f'{mismatch_count} mismatched classifications'
+        )
+        self.stdout.write(self.style.SUCCESS('Completed taxonomy benchmark'))
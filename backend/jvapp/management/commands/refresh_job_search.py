@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+from django.db.models import Q
+
+from jvapp.utils.job_search import refresh_job_search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized job search table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employer_ids',
+            nargs='+',
+            type=int,
+            help='Only refresh jobs for these employers',
+        )
+
+    def handle(self, *args, **options):
+        job_filter = None
+        if employer_ids := options.get('employer_ids'):
+            job_filter = Q(employer_id__in=employer_ids)
+        refresh_job_search(job_filter=job_filter)
+        self.stdout.write(self.style.SUCCESS('Job search refreshed'))
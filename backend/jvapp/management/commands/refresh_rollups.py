@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from jvapp.utils.datetime import get_datetime_or_none
+from jvapp.utils.rollup import refresh_all_rollups
+
+
+class Command(BaseCommand):
+    help = 'Backfill or correct the page view and application rollup tables from the raw rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start_dt', help='Defaults to the earliest raw row')
+        parser.add_argument('--end_dt', help='Defaults to now')
+
+    def handle(self, *args, **options):
+        start_dt, end_dt = (
+            get_datetime_or_none(options.get(dt_key)) for dt_key in ('start_dt', 'end_dt')
+        )
+        start_dt, end_dt = (
+            timezone.make_aware(dt) if dt and timezone.is_naive(dt) else dt for dt in (start_dt, end_dt)
+        )
+        refresh_all_rollups(start_dt=start_dt, end_dt=end_dt)
+        self.stdout.write(self.style.SUCCESS('Rollups refreshed'))
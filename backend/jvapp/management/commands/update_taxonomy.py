@@ -1,5 +1,6 @@
 from django.core.management import BaseCommand
 
+from jvapp.utils.job_search import refresh_job_search
 from jvapp.utils.taxonomy import run_job_title_standardization, update_taxonomies
 
 
@@ -15,4 +16,5 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         update_taxonomies()
         run_job_title_standardization(is_non_standardized_only=options.get('is_non_standardized_only'))
+        refresh_job_search()
         self.stdout.write(self.style.SUCCESS('Jobs standardized'))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.1 on 2023-09-15 14:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0258_alter_emailunsubscribe_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapedPageCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_dt', models.DateTimeField()),
+                ('modified_dt', models.DateTimeField()),
+                ('url', models.CharField(max_length=300, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=200, null=True)),
+                ('last_modified', models.CharField(blank=True, max_length=50, null=True)),
+                ('content_hash', models.CharField(max_length=40)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jvapp.employer')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='scrapedpagecache',
+            index=models.Index(models.F('modified_dt'), name='page_cache_modified_dt_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.1 on 2023-09-18 10:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+import jvapp.models.location
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0259_scrapedpagecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearch',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search', serialize=False, to='jvapp.employerjob')),
+                ('employer_name', models.CharField(max_length=150)),
+                ('job_title', models.CharField(max_length=200)),
+                ('is_remote', models.BooleanField(default=False)),
+                ('salary_floor', models.FloatField(blank=True, null=True)),
+                ('salary_ceiling', models.FloatField(blank=True, null=True)),
+                ('open_date', models.DateField(blank=True, null=True)),
+                ('close_date', models.DateField(blank=True, null=True)),
+                ('is_job_approved', models.BooleanField(default=True)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_search', to='jvapp.employer')),
+                ('profession', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_search', to='jvapp.taxonomy')),
+            ],
+            options={
+                'ordering': ('-open_date', '-job_id'),
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSearchLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_remote', models.BooleanField(default=False)),
+                ('city', models.CharField(blank=True, max_length=50, null=True)),
+                ('state', models.CharField(blank=True, max_length=50, null=True)),
+                ('country', models.CharField(blank=True, max_length=50, null=True)),
+                ('geometry', jvapp.models.location.SridGeometryField(null=True, srid=4326)),
+                ('job_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locations', to='jvapp.jobsearch')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_search', to='jvapp.location')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobsearch',
+            index=models.Index(models.F('open_date'), models.F('job'), name='job_search_open_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsearch',
+            index=models.Index(models.F('profession'), models.F('open_date'), models.F('job'), name='job_search_profession_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsearch',
+            index=models.Index(models.F('employer'), models.F('open_date'), models.F('job'), name='job_search_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsearch',
+            index=models.Index(models.F('salary_ceiling'), models.F('salary_floor'), name='job_search_salary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsearchlocation',
+            index=models.Index(models.F('country'), models.F('state'), models.F('city'), name='job_search_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsearchlocation',
+            index=models.Index(models.F('is_remote'), models.F('country'), name='job_search_remote_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobsearchlocation',
+            constraint=models.UniqueConstraint(fields=('job_search', 'location'), name='job_search_unique_location'),
+        ),
+    ]
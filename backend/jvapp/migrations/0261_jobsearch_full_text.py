@@ -0,0 +1,44 @@
+# Generated by Django 4.2.1 on 2023-09-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0260_jobsearch_jobsearchlocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobsearch',
+            name='job_department',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobsearch',
+            name='job_description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        # Django doesn't support FULLTEXT indexes. These are used by jvapp.utils.search
+        migrations.RunSQL(
+            'create fulltext index job_search_text_idx on jvapp_jobsearch (job_title, employer_name, job_department, job_description)',
+            reverse_sql='drop index job_search_text_idx on jvapp_jobsearch',
+        ),
+        migrations.RunSQL(
+            'create fulltext index job_title_text_idx on jvapp_employerjob (job_title)',
+            reverse_sql='drop index job_title_text_idx on jvapp_employerjob',
+        ),
+        migrations.RunSQL(
+            'create fulltext index application_name_text_idx on jvapp_jobapplication (first_name, last_name)',
+            reverse_sql='drop index application_name_text_idx on jvapp_jobapplication',
+        ),
+        migrations.RunSQL(
+            'create fulltext index application_email_text_idx on jvapp_jobapplication (email)',
+            reverse_sql='drop index application_email_text_idx on jvapp_jobapplication',
+        ),
+        migrations.RunSQL(
+            'create fulltext index taxonomy_name_text_idx on jvapp_taxonomy (name)',
+            reverse_sql='drop index taxonomy_name_text_idx on jvapp_taxonomy',
+        ),
+    ]
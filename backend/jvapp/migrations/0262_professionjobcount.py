@@ -0,0 +1,28 @@
+# Generated by Django 4.2.1 on 2023-09-20 11:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0261_jobsearch_full_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfessionJobCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country', models.CharField(blank=True, max_length=50, null=True)),
+                ('is_remote', models.BooleanField(blank=True, null=True)),
+                ('job_count', models.IntegerField(default=0)),
+                ('taxonomy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_counts', to='jvapp.taxonomy')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='professionjobcount',
+            index=models.Index(models.F('country'), models.F('is_remote'), models.F('taxonomy'), name='profession_job_count_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.1 on 2023-09-22 09:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import jvapp.models.abstract
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0262_professionjobcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rollup_key', models.CharField(max_length=100, unique=True)),
+                ('bucket_dt', models.DateTimeField()),
+                ('application_count', models.IntegerField(default=0)),
+                ('referrer_employer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jvapp.employer')),
+                ('referrer_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('platform', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jvapp.socialplatform')),
+                ('social_link', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jvapp.sociallink')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PageViewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rollup_key', models.CharField(max_length=100, unique=True)),
+                ('bucket_dt', models.DateTimeField()),
+                ('is_mobile', models.BooleanField(blank=True, null=True)),
+                ('is_tablet', models.BooleanField(blank=True, null=True)),
+                ('view_count', models.IntegerField(default=0)),
+                ('employer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jvapp.employer')),
+                ('page_owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('platform', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jvapp.socialplatform')),
+                ('social_link', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jvapp.sociallink')),
+            ],
+            bases=(models.Model, jvapp.models.abstract.JobVynePermissionsMixin),
+        ),
+        migrations.AddIndex(
+            model_name='pageview',
+            index=models.Index(models.F('access_dt'), name='page_view_access_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationrollup',
+            index=models.Index(models.F('bucket_dt'), name='application_rollup_bucket_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationrollup',
+            index=models.Index(models.F('referrer_employer'), models.F('bucket_dt'), name='application_rollup_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationrollup',
+            index=models.Index(models.F('referrer_user'), models.F('bucket_dt'), name='application_rollup_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pageviewrollup',
+            index=models.Index(models.F('bucket_dt'), name='page_view_rollup_bucket_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pageviewrollup',
+            index=models.Index(models.F('employer'), models.F('bucket_dt'), name='page_view_rollup_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pageviewrollup',
+            index=models.Index(models.F('page_owner'), models.F('bucket_dt'), name='page_view_rollup_owner_idx'),
+        ),
+    ]
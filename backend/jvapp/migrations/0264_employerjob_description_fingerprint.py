@@ -0,0 +1,18 @@
+# Generated by Django 4.2.1 on 2023-09-25 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0263_pageviewrollup_applicationrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerjob',
+            name='description_fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=40, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.1 on 2023-09-27 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0264_employerjob_description_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerats',
+            name='applications_sync_dt',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='employerats',
+            name='jobs_full_sync_dt',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='employerats',
+            name='jobs_sync_dt',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2023-09-28 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0265_employerats_sync_watermarks'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='scrapedpagecache',
+            name='page_cache_modified_dt_idx',
+        ),
+        migrations.AddIndex(
+            model_name='scrapedpagecache',
+            index=models.Index(fields=['employer', 'modified_dt'], name='page_cache_employer_modified_idx'),
+        ),
+    ]
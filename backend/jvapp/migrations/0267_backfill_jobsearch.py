@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2023-09-28 16:45
+
+from django.db import migrations
+
+from jvapp.utils.job_search import refresh_job_search
+
+
+def backfill_job_search(apps, schema_editor):
+    # The job board reads only from JobSearch so it must be populated before the new code serves requests
+    refresh_job_search()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0266_scrapedpagecache_employer_modified_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_job_search, migrations.RunPython.noop)
+    ]
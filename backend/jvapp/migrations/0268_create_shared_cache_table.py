@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2023-09-28 17:05
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # The shared cache defaults to the database backend. This does nothing for other backends
+    # or if the table already exists
+    call_command('createcachetable')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0267_backfill_jobsearch'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop)
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.1 on 2023-10-02 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jvapp', '0268_create_shared_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerjob',
+            name='description_source_hash',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+    ]
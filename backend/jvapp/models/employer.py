@@ -10,13 +10,15 @@ from django.utils import timezone
 
 from jvapp.models._customDjangoField import LowercaseCharField, SeparatedValueField
 from jvapp.models.abstract import ALLOWED_UPLOADS_ALL, AuditFields, JobVynePermissionsMixin, OwnerFields
+from jvapp.models.location import SRID, SridGeometryField
 
 __all__ = (
     'Employer', 'EmployerAts', 'EmployerJob', 'JobDepartment',
     'EmployerAuthGroup', 'EmployerPermission', 'EmployerFile', 'EmployerFileTag',
     'EmployerReferralBonusRule', 'EmployerReferralBonusRuleModifier',
     'EmployerSubscription', 'EmployerReferralRequest', 'EmployerJobApplicationRequirement',
-    'EmployerSlack', 'Taxonomy', 'JobTaxonomy',
+    'EmployerSlack', 'Taxonomy', 'JobTaxonomy', 'JobSearch', 'JobSearchLocation',
+    'ProfessionJobCount',
 )
 
 from jvapp.models.user import JobVyneUser, PermissionName
@@ -204,6 +206,11 @@ class EmployerAts(AuditFields, JobVynePermissionsMixin):
     webhook_delete_key = models.CharField(max_length=50, null=True, blank=True)
     webhook_delete_token = models.CharField(max_length=50, null=True, blank=True)
     
+    # Sync watermarks. Only data that changed after these times is pulled from the ATS
+    jobs_sync_dt = models.DateTimeField(null=True, blank=True)
+    jobs_full_sync_dt = models.DateTimeField(null=True, blank=True)
+    applications_sync_dt = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         unique_together = ('employer', 'name')
     
@@ -221,7 +228,7 @@ class EmployerJob(AuditFields, OwnerFields, JobVynePermissionsMixin):
     UPDATE_FIELDS = [
         'job_title', 'job_description', 'job_department', 'open_date', 'close_date',
         'salary_currency', 'salary_interval', 'salary_floor', 'salary_ceiling', 'employment_type',
-        'ats_job_key', 'modified_dt'
+        'ats_job_key', 'description_source_hash', 'modified_dt'
     ]
     
     class SalaryInterval(Enum):
@@ -260,6 +267,10 @@ class EmployerJob(AuditFields, OwnerFields, JobVynePermissionsMixin):
     application_url = models.CharField(max_length=300, null=True, blank=True)  # Used as a fallback when we don't have an ATS integration with an employer
     is_scraped = models.BooleanField(default=False, blank=True)
     qualifications_prompt = models.ForeignKey('AIRequest', null=True, on_delete=models.SET_NULL)
+    # Fingerprint of the description that was classified. Jobs with the same description share a classification
+    description_fingerprint = models.CharField(max_length=40, null=True, blank=True, db_index=True)
+    # Hash of the unsanitized description. When it hasn't changed, the saved description is reused without sanitizing
+    description_source_hash = models.CharField(max_length=40, null=True, blank=True)
 
     ats_job_key = models.CharField(max_length=50, null=True, blank=True)
 
@@ -463,6 +474,70 @@ class JobTaxonomy(AuditFields):
             models.constraints.UniqueConstraint(fields=('job', 'taxonomy'), name='job_unique_taxonomy'),
         ]
 
+class JobSearch(models.Model):
+    """Denormalized copy of open jobs used to filter and paginate the job board without joining
+    employer, taxonomy, and location tables. Rows are refreshed by jvapp.utils.job_search
+    Job title, employer name, department, and description have a FULLTEXT index (see jvapp.utils.search)
+    """
+    job = models.OneToOneField(EmployerJob, primary_key=True, on_delete=models.CASCADE, related_name='search')
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='job_search')
+    employer_name = models.CharField(max_length=150)
+    job_title = models.CharField(max_length=200)
+    job_department = models.CharField(max_length=100, null=True, blank=True)
+    job_description = models.TextField(null=True, blank=True)  # Plain text without HTML tags
+    profession = models.ForeignKey(Taxonomy, null=True, blank=True, on_delete=models.SET_NULL, related_name='job_search')
+    is_remote = models.BooleanField(default=False)
+    salary_floor = models.FloatField(null=True, blank=True)
+    salary_ceiling = models.FloatField(null=True, blank=True)
+    open_date = models.DateField(null=True, blank=True)
+    close_date = models.DateField(null=True, blank=True)
+    is_job_approved = models.BooleanField(default=True)
+    
+    class Meta:
+        # Match the EmployerJob ordering so pages are the same as before
+        ordering = ('-open_date', '-job_id')
+        indexes = [
+            models.Index('open_date', 'job', name='job_search_open_date_idx'),
+            models.Index('profession', 'open_date', 'job', name='job_search_profession_idx'),
+            models.Index('employer', 'open_date', 'job', name='job_search_employer_idx'),
+            models.Index('salary_ceiling', 'salary_floor', name='job_search_salary_idx'),
+        ]
+
+
+class JobSearchLocation(models.Model):
+    job_search = models.ForeignKey(JobSearch, on_delete=models.CASCADE, related_name='locations')
+    location = models.ForeignKey('Location', on_delete=models.CASCADE, related_name='job_search')
+    is_remote = models.BooleanField(default=False)
+    city = models.CharField(max_length=50, null=True, blank=True)
+    state = models.CharField(max_length=50, null=True, blank=True)
+    country = models.CharField(max_length=50, null=True, blank=True)
+    geometry = SridGeometryField(null=True, srid=SRID)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('job_search', 'location'), name='job_search_unique_location'),
+        ]
+        indexes = [
+            models.Index('country', 'state', 'city', name='job_search_location_idx'),
+            models.Index('is_remote', 'country', name='job_search_remote_idx'),
+        ]
+
+
+class ProfessionJobCount(models.Model):
+    """Open job counts per profession from JobTaxonomy and JobSearch, maintained by jvapp.utils.job_search
+    Rows with a null country or null is_remote count jobs across all values of that field
+    """
+    taxonomy = models.ForeignKey(Taxonomy, on_delete=models.CASCADE, related_name='job_counts')
+    country = models.CharField(max_length=50, null=True, blank=True)
+    is_remote = models.BooleanField(null=True, blank=True)
+    job_count = models.IntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index('country', 'is_remote', 'taxonomy', name='profession_job_count_idx'),
+        ]
+
+
 # TODO: Implement model and use in prediction
 # class AiPrompt():
 #     '''An AI prompt'''
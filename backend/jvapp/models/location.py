@@ -1,3 +1,4 @@
+import math
 from enum import IntEnum
 
 from django.contrib.gis.geos import Point
@@ -65,6 +66,7 @@ class WithinMiles(Lookup):
 
 SridGeometryField.register_lookup(WithinMiles)
 SRID = 4326
+EARTH_RADIUS_MILES = 3958.8
 
 
 class Location(models.Model):
@@ -93,6 +95,19 @@ class Location(models.Model):
             return None
         return Point(coerce_float(latitude), coerce_float(longitude), srid=SRID)
     
+    @classmethod
+    def get_distance_miles(cls, latitude, longitude, other_latitude, other_longitude):
+        """Great circle (spherical) distance in memory without a database query
+        This approximates the within_miles lookup, which MySQL measures on the ellipsoid. The two can differ
+        by up to about 0.5%, so locations right at the edge of a range may match differently
+        """
+        coordinates = [coerce_float(val) for val in (latitude, longitude, other_latitude, other_longitude)]
+        if any(val is None for val in coordinates):
+            return None
+        lat1, lng1, lat2, lng2 = (math.radians(val) for val in coordinates)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+    
 
 # Store results of geocoding lookup for efficiency and to avoid charges
 class LocationLookup(models.Model):
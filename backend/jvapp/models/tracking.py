@@ -6,7 +6,7 @@ from django.utils import timezone
 
 from jvapp.models.abstract import AuditFields, JobVynePermissionsMixin
 
-__all__ = ('PageView', 'Message', 'MessageRecipient', 'MessageAttachment', 'MessageThread', 'MessageThreadContext')
+__all__ = ('PageView', 'PageViewRollup', 'ApplicationRollup', 'Message', 'MessageRecipient', 'MessageAttachment', 'MessageThread', 'MessageThreadContext')
 
 
 class PageView(models.Model, JobVynePermissionsMixin):
@@ -54,6 +54,64 @@ class PageView(models.Model, JobVynePermissionsMixin):
     
         return query.filter(filter)
     
+    class Meta:
+        indexes = [
+            models.Index('access_dt', name='page_view_access_dt_idx')
+        ]
+
+
+class RollupFields(models.Model):
+    """Hourly counts maintained by jvapp.utils.rollup. Daily and longer periods are summed from the hourly
+    buckets so they can be grouped in any timezone
+    rollup_key identifies the bucket and dimensions. It is unique because MySQL treats NULL foreign keys as distinct
+    """
+    rollup_key = models.CharField(max_length=100, unique=True)
+    bucket_dt = models.DateTimeField()
+    social_link = models.ForeignKey('SocialLink', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    platform = models.ForeignKey('SocialPlatform', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    class Meta:
+        abstract = True
+
+
+class PageViewRollup(RollupFields, JobVynePermissionsMixin):
+    employer = models.ForeignKey('Employer', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    page_owner = models.ForeignKey('JobVyneUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    is_mobile = models.BooleanField(null=True, blank=True)
+    is_tablet = models.BooleanField(null=True, blank=True)
+    view_count = models.IntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index('bucket_dt', name='page_view_rollup_bucket_idx'),
+            models.Index('employer', 'bucket_dt', name='page_view_rollup_employer_idx'),
+            models.Index('page_owner', 'bucket_dt', name='page_view_rollup_owner_idx'),
+        ]
+    
+    @classmethod
+    def _jv_filter_perm_query(cls, user, query):
+        if user.is_admin:
+            return query
+        
+        filter = (Q(social_link__owner_id=user.id) | Q(page_owner_id=user.id))
+        if user.is_employer:
+            filter |= (Q(social_link__employer_id=user.employer_id) | Q(employer_id=user.employer_id))
+        
+        return query.filter(filter)
+
+
+class ApplicationRollup(RollupFields):
+    referrer_employer = models.ForeignKey('Employer', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    referrer_user = models.ForeignKey('JobVyneUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    application_count = models.IntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index('bucket_dt', name='application_rollup_bucket_idx'),
+            models.Index('referrer_employer', 'bucket_dt', name='application_rollup_employer_idx'),
+            models.Index('referrer_user', 'bucket_dt', name='application_rollup_owner_idx'),
+        ]
+    
     
 class Message(models.Model):
     class MessageType(Enum):
@@ -167,6 +225,22 @@ class AIRequest(AuditFields):
     result_status = models.CharField(max_length=20)
     response = models.JSONField(null=True)
     
+
+class ScrapedPageCache(AuditFields):
+    """HTTP validators and a content hash from the last time a job page was scraped.
+    modified_dt is updated on every cache hit so the least recently used pages can be evicted
+    """
+    employer = models.ForeignKey('Employer', on_delete=models.CASCADE)
+    url = models.CharField(max_length=300, unique=True)
+    etag = models.CharField(max_length=200, null=True, blank=True)
+    last_modified = models.CharField(max_length=50, null=True, blank=True)
+    content_hash = models.CharField(max_length=40)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['employer', 'modified_dt'], name='page_cache_employer_modified_idx')
+        ]
+    
     
 class UserEmailInvite(models.Model):
     invite_email = models.EmailField()
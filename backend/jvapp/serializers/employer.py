@@ -1,3 +1,4 @@
+import logging
 import re
 from enum import Enum
 
@@ -9,9 +10,11 @@ from jvapp.models.employer import is_default_auth_group
 from jvapp.models.user import JobVyneUser
 from jvapp.serializers.location import get_serialized_location
 from jvapp.serializers.user import reduce_user_type_bits
-from jvapp.utils.data import get_list_intersection, obfuscate_string
+from jvapp.utils.data import obfuscate_string
 from jvapp.utils.datetime import get_datetime_format_or_none
 
+logger = logging.getLogger(__name__)
+
 
 def get_serialized_currency(currency: Currency, is_allow_none=True):
     if is_allow_none and not currency:
@@ -159,7 +162,88 @@ def calculate_bonus_amount(employer_job, bonus_rule=None):
     }
 
 
-def get_serialized_employer_job(employer_job: EmployerJob, is_include_bonus=False, rules=None):
+class CompiledBonusRule:
+    """Inclusion and exclusion criteria of a serialized bonus rule as sets and compiled regexes
+    """
+    LOCATION_CRITERIA_KEYS = ('cities', 'states', 'countries')
+    
+    def __init__(self, rule):
+        self.rule = rule
+        self.is_valid = True
+        self.inclusion_criteria = self.get_compiled_criteria(rule['inclusion_criteria'])
+        self.exclusion_criteria = self.get_compiled_criteria(rule['exclusion_criteria'])
+    
+    def get_compiled_criteria(self, criteria):
+        # Criteria without values don't apply to the rule so they are left out
+        compiled_criteria = {
+            criteria_key: set(criteria_vals) for criteria_key, criteria_vals in criteria.items()
+            if criteria_key != 'job_titles_regex' and criteria_vals
+        }
+        if job_titles_regex := criteria.get('job_titles_regex'):
+            try:
+                compiled_criteria['job_titles_regex'] = re.compile(job_titles_regex, flags=re.IGNORECASE)
+            except re.error as e:
+                # The rule can't be evaluated so it shouldn't match any job
+                logger.error(f'Invalid job title regex for bonus rule ({self.rule["id"]}): {e}')
+                self.is_valid = False
+        return compiled_criteria
+    
+    def is_match(self, job_props):
+        return self.is_valid and (
+            all(self.is_criteria_match(key, val, job_props) for key, val in self.inclusion_criteria.items())
+            and not any(self.is_criteria_match(key, val, job_props) for key, val in self.exclusion_criteria.items())
+        )
+    
+    def is_criteria_match(self, criteria_key, criteria_val, job_props):
+        if criteria_key == 'departments':
+            return job_props['department_id'] in criteria_val
+        if criteria_key in self.LOCATION_CRITERIA_KEYS:
+            return not criteria_val.isdisjoint(job_props[criteria_key])
+        if criteria_key == 'job_titles_regex':
+            return bool(criteria_val.search(job_props['job_title']))
+        return False
+
+
+class BonusRuleSet:
+    """An employer's referral bonus rules, serialized and compiled once so they can be matched against many jobs
+    """
+    
+    def __init__(self, rules):
+        # Serialize the rules so inclusion/exclusion criteria are grouped
+        serialized_rules = [get_serialized_employer_bonus_rule(r, is_ids_only=True) for r in rules]
+        serialized_rules.sort(key=lambda x: x['order_idx'])
+        self.rules = [CompiledBonusRule(rule) for rule in serialized_rules]
+    
+    def __bool__(self):
+        return bool(self.rules)
+    
+    def match_job(self, employer_job):
+        """
+        :return: The first serialized rule (by order_idx) that applies to the job or None
+        """
+        if not self.rules:
+            return None
+        locations = employer_job.locations.all()
+        job_props = {
+            'department_id': employer_job.job_department_id,
+            'job_title': employer_job.job_title or '',
+            'cities': {l.city_id for l in locations},
+            'states': {l.state_id for l in locations},
+            'countries': {l.country_id for l in locations}
+        }
+        return next((rule.rule for rule in self.rules if rule.is_match(job_props)), None)
+    
+    def match_jobs(self, employer_jobs):
+        """
+        :return: {<job_id>: <serialized rule or None>}
+        """
+        return {employer_job.id: self.match_job(employer_job) for employer_job in employer_jobs}
+
+
+def get_serialized_employer_job(employer_job: EmployerJob, is_include_bonus=False, rules=None, job_rules=None):
+    """
+    :param job_rules: Rules already matched to many jobs with BonusRuleSet.match_jobs. Used instead of rules
+    """
     data = {
         'id': employer_job.id,
         'employer_name': employer_job.employer.employer_name,
@@ -190,59 +274,20 @@ def get_serialized_employer_job(employer_job: EmployerJob, is_include_bonus=Fals
         'job_source': 'website' if employer_job.is_scraped else ('ats' if employer_job.ats_job_key else 'manual')
     }
     
-    if is_include_bonus and rules:
-        # Serialize the rules so inclusion/exclusion criteria are grouped
-        rules = [get_serialized_employer_bonus_rule(r, is_ids_only=True) for r in rules]
-        rules.sort(key=lambda x: x['order_idx'])
-        job_props = {
-            'cities': [l.city_id for l in employer_job.locations.all()],
-            'states': [l.state_id for l in employer_job.locations.all()],
-            'countries': [l.country_id for l in employer_job.locations.all()]
-        }
-        
-        # Loop through each rule in order (order_idx) and find the first rule
-        # that applies to this job
+    if is_include_bonus and (rules or job_rules is not None):
+        if job_rules is not None:
+            rule = job_rules.get(employer_job.id)
+        else:
+            rule = (rules if isinstance(rules, BonusRuleSet) else BonusRuleSet(rules)).match_job(employer_job)
         data['bonus_rule'] = None
-        for rule in rules:
-            is_match = True
-            for ruleKey, negateFn in (
-                    ('inclusion_criteria', lambda x: not x),
-                    ('exclusion_criteria', lambda x: x),
-            ):
-                for criteriaKey, criteriaVal in rule[ruleKey].items():
-                    if not criteriaVal:
-                        continue
-                    
-                    if criteriaKey == 'departments' and negateFn(int(employer_job.job_department_id) in criteriaVal):
-                        is_match = False
-                        break
-                    
-                    if (
-                            criteriaKey in ['cities', 'states', 'countries']
-                            and negateFn(get_list_intersection(job_props[criteriaKey], criteriaVal))
-                    ):
-                        is_match = False
-                        break
-                    
-                    if (
-                            criteriaKey == 'job_titles_regex'
-                            and negateFn(re.search(criteriaVal, employer_job.job_title, flags=re.IGNORECASE))
-                    ):
-                        is_match = False
-                        break
-                
-                if not is_match:
-                    break
-            
-            if is_match:
-                data['bonus_rule'] = {
-                    'id': rule['id'],
-                    'base_bonus_amount': rule['base_bonus_amount'],
-                    'bonus_currency': rule['bonus_currency'],
-                    'days_after_hire_payout': rule['days_after_hire_payout']
-                }
-                data['bonus'] = calculate_bonus_amount(employer_job, bonus_rule=rule)
-                break
+        if rule:
+            data['bonus_rule'] = {
+                'id': rule['id'],
+                'base_bonus_amount': rule['base_bonus_amount'],
+                'bonus_currency': rule['bonus_currency'],
+                'days_after_hire_payout': rule['days_after_hire_payout']
+            }
+            data['bonus'] = calculate_bonus_amount(employer_job, bonus_rule=rule)
     
     if is_include_bonus and not data.get('bonus'):
         data['bonus'] = calculate_bonus_amount(employer_job)
@@ -5,7 +5,7 @@ import re
 from django.core.files import File
 from django.db import IntegrityError
 from django.db.models import Q
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -13,13 +13,17 @@ from jvapp.apis.employer import EmployerInfoView
 from jvapp.apis.job_seeker import ApplicationTemplateView
 from jvapp.apis.job_subscription import JobSubscriptionView
 from jvapp.apis.social import SocialLinkView
-from jvapp.models.employer import Employer, EmployerAuthGroup, EmployerJobApplicationRequirement, is_default_auth_group
+from jvapp.models.employer import Employer, EmployerAuthGroup, EmployerConnection, EmployerJob, \
+    EmployerJobApplicationRequirement, is_default_auth_group
 from jvapp.models.job_seeker import JobApplication, JobApplicationTemplate
+from jvapp.models.job_subscription import JobSubscription
 from jvapp.models.social import SocialLink
 from jvapp.models.tracking import PageView
-from jvapp.models.user import JobVyneUser, UserEmployerPermissionGroup
+from jvapp.models.user import JobVyneUser, UserConnection, UserEmployerPermissionGroup
 from jvapp.utils.file import get_file_extension, get_file_name
 from jvapp.utils.image import resize_image_with_fill
+from jvapp.utils.response_cache import bump_jobs_version
+from jvapp.utils.rollup import add_application_rollups
 
 
 def _get_default_user_groups(employer_id):
@@ -231,6 +235,13 @@ def parse_social_link(sender, instance, *args, **kwargs):
         instance.referrer_user_id = instance.referrer_user_id or instance.social_link.owner_id
         
         
+@receiver(post_save, sender=JobApplication)
+def add_application_rollup(sender, instance, created, *args, **kwargs):
+    # Edits to existing applications are picked up by the rollup correction task
+    if created:
+        add_application_rollups([instance])
+        
+        
 @receiver(pre_save, sender=PageView)
 def parse_social_link(sender, instance, *args, **kwargs):
     if instance.social_link_id:
@@ -240,4 +251,42 @@ def parse_social_link(sender, instance, *args, **kwargs):
             instance.page_owner_id = instance.page_owner_id or social_link.owner_id
         except SocialLink.DoesNotExist:
             instance.social_link = None
-        
\ No newline at end of file
+        
+
+
+# Models that are part of cached job board responses (see jvapp.utils.response_cache)
+JOB_BOARD_MODELS = (Employer, EmployerConnection, EmployerJob, JobSubscription, SocialLink, UserConnection)
+# User fields that are part of cached job board responses. Other user changes (e.g. logins) don't affect them
+JOB_BOARD_USER_FIELDS = ('first_name', 'last_name', 'user_key', 'is_share_connections', 'home_location')
+
+
+def bump_job_board_version(sender, instance, *args, **kwargs):
+    bump_jobs_version()
+
+
+for job_board_model in JOB_BOARD_MODELS:
+    post_save.connect(bump_job_board_version, sender=job_board_model)
+    post_delete.connect(bump_job_board_version, sender=job_board_model)
+
+
+@receiver(pre_save, sender=JobVyneUser)
+def set_job_board_user_values(sender, instance, *args, update_fields=None, **kwargs):
+    instance.job_board_values = None
+    if not instance.id:
+        return
+    if update_fields and not set(JOB_BOARD_USER_FIELDS) & set(update_fields):
+        return
+    attnames = [JobVyneUser._meta.get_field(field).attname for field in JOB_BOARD_USER_FIELDS]
+    instance.job_board_values = JobVyneUser.objects.filter(id=instance.id).values(*attnames).first()
+
+
+@receiver(post_save, sender=JobVyneUser)
+def bump_job_board_version_for_user(sender, instance, created, *args, **kwargs):
+    if created or not (job_board_values := getattr(instance, 'job_board_values', None)):
+        return
+    changed_fields = {field for field, val in job_board_values.items() if getattr(instance, field) != val}
+    # A new user's key is set right after they are created so it can't be part of any cached response yet
+    if not job_board_values['user_key']:
+        changed_fields.discard('user_key')
+    if changed_fields:
+        bump_jobs_version()
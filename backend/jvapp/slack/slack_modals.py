@@ -1,6 +1,7 @@
 import json
 
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
@@ -23,6 +24,7 @@ from jvapp.slack.slack_blocks_specific import FIRST_NAME_KEY, LAST_NAME_KEY, Sel
 from jvapp.utils.data import capitalize, coerce_float, coerce_int
 from jvapp.utils.datetime import TIME_INTERVAL_DAYS, get_datetime_diff, get_datetime_format_or_none
 from jvapp.utils.email import EMAIL_ADDRESS_SUPPORT, send_django_email
+from jvapp.utils.job_search import refresh_job_search
 from jvapp.utils.oauth import OauthProviders
 from jvapp.slack.slack_blocks import Button, Divider, InputCheckbox, InputEmail, InputNumber, InputOption, \
     InputRadioButton, InputText, \
@@ -938,6 +940,7 @@ class JobModalViews(SlackMultiViewModal):
         self.job.salary_ceiling = coerce_float(self.metadata['salary-max'])
         self.job.salary_interval = self.metadata['salary-interval']['value']
         self.job.save()
+        refresh_job_search(job_filter=Q(id=self.job.id))
 
 
 class SaveJobModalViews(SlackMultiViewModal):
@@ -4,6 +4,8 @@ from celery.utils.log import get_task_logger
 from jobVyne.celery import app as celery_app
 from jvapp.apis.ats import get_ats_api
 from jvapp.models.employer import EmployerAts
+from jvapp.utils.job_search import refresh_job_search
+from jvapp.utils.rollup import refresh_recent_rollups
 from scrape.scraper import run_job_scrapers
 
 logger = get_task_logger(__name__)
@@ -31,6 +33,20 @@ def refresh_all_ats_credentials():
         ats_api.refresh_ats_credentials()
 
 
+@shared_task
+def task_refresh_job_search():
+    # Nightly reconcile of the job search table and profession job counts
+    logger.info('Starting job search refresh task')
+    refresh_job_search()
+
+
+@shared_task
+def task_refresh_recent_rollups():
+    # Corrects analytics rollups for late or edited page views and applications
+    logger.info('Starting rollup correction task')
+    refresh_recent_rollups()
+
+
 @celery_app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -5,6 +5,7 @@ import names
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
+from django.db.models import Q
 from django.test import TestCase
 from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
 from django.utils import timezone
@@ -16,6 +17,7 @@ from jvapp.models.employer import Employer, EmployerAuthGroup, EmployerJob, Empl
 from jvapp.models.location import City, Country, Location, State
 from jvapp.models.social import SocialLink
 from jvapp.models.user import JobVyneUser, StandardPermissionGroups, UserEmployerPermissionGroup
+from jvapp.utils.job_search import refresh_job_search
 
 
 class BaseTestCase(TestCase):
@@ -231,6 +233,7 @@ class BaseTestCase(TestCase):
         job.save()
         for location in locations:
             job.locations.add(location)
+        refresh_job_search(job_filter=Q(id=job.id))
         return job
     
     def create_referral_bonus_rule(
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from jvapp.apis import ats
+from jvapp.apis.ats import GreenhouseAts, JobData
+from jvapp.models.employer import EmployerJob, JobDepartment
+from jvapp.tests.base import BaseTestCase
+
+
+class GreenhouseSyncTestCase(SimpleTestCase):
+
+    def setUp(self):
+        # Skip the constructor, which looks up the Greenhouse user
+        self.ats_api = GreenhouseAts.__new__(GreenhouseAts)
+        self.ats_api.ats_cfg = SimpleNamespace(jobs_sync_dt=None, jobs_full_sync_dt=None)
+
+    def get_job(self, job_id, status='open', is_confidential=False):
+        return {'id': job_id, 'status': status, 'confidential': is_confidential}
+
+    def get_post(self, job_id, is_live=True):
+        return {'job_id': job_id, 'live': is_live, 'content': f'Job {job_id}', 'questions': []}
+
+    def test_job_changes(self):
+        updated_jobs = [self.get_job(1), self.get_job(2, status='closed'), self.get_job(3, is_confidential=True)]
+        job_posts = {
+            1: [self.get_post(1, is_live=False), self.get_post(1)],
+            2: [self.get_post(2)],
+            3: [self.get_post(3)],
+            4: [self.get_post(4, is_live=False)],
+        }
+
+        def get_paginated_data(url, params):
+            return updated_jobs if url == GreenhouseAts.jobs_url else [self.get_post(4, is_live=False)]
+
+        def get_data(url, params):
+            job_id = int(url.split('/')[-2 if url.endswith('job_posts') else -1])
+            return job_posts[job_id] if url.endswith('job_posts') else self.get_job(job_id)
+
+        with patch.object(self.ats_api, 'get_paginated_data', side_effect=get_paginated_data), \
+                patch.object(self.ats_api, 'get_data', side_effect=get_data):
+            jobs, closed_job_keys = self.ats_api.get_job_changes(timezone.now())
+
+        self.assertEqual([1], [job['id'] for job in jobs])
+        self.assertEqual('Job 1', jobs[0]['content'])
+        self.assertEqual(['2', '3', '4'], sorted(closed_job_keys))
+
+    def test_full_sync_is_due(self):
+        now = timezone.now()
+        self.assertTrue(self.ats_api.is_full_jobs_sync_due(now))
+        self.ats_api.ats_cfg.jobs_sync_dt = now - timedelta(minutes=30)
+        self.ats_api.ats_cfg.jobs_full_sync_dt = now - timedelta(hours=2)
+        self.assertFalse(self.ats_api.is_full_jobs_sync_due(now))
+        self.ats_api.ats_cfg.jobs_full_sync_dt = now - timedelta(hours=GreenhouseAts.FULL_SYNC_HOURS)
+        self.assertTrue(self.ats_api.is_full_jobs_sync_due(now))
+
+
+class SaveAtsJobsTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ats_api = GreenhouseAts.__new__(GreenhouseAts)
+        self.ats_api.ats_cfg = SimpleNamespace(employer_id=self.employer.id)
+
+    def save_jobs(self, jobs, closed_job_keys=None):
+        with patch.object(self.ats_api, 'get_normalized_job_data', side_effect=lambda job: job), \
+                patch.object(ats, 'run_job_title_standardization'):
+            self.ats_api.save_jobs(jobs, closed_job_keys=closed_job_keys)
+
+    def get_ats_jobs(self):
+        return {
+            job.ats_job_key: job for job in
+            EmployerJob.objects.prefetch_related('locations').filter(employer=self.employer, ats_job_key__isnull=False)
+        }
+
+    def test_save_jobs(self):
+        self.save_jobs([
+            JobData(ats_job_key='1', job_title='Account Executive', department_name='Sales', locations=[self.locations[0]]),
+            JobData(ats_job_key='2', job_title='Sales Manager', department_name='sales', locations=self.locations[1:3]),
+            JobData(ats_job_key='3', job_title='Software Engineer', department_name='Software', locations=[]),
+        ])
+        jobs = self.get_ats_jobs()
+        self.assertEqual({'1', '2', '3'}, set(jobs.keys()))
+        self.assertEqual(jobs['1'].job_department_id, jobs['2'].job_department_id)
+        self.assertEqual(1, JobDepartment.objects.filter(name='Sales').count())
+        self.assertEqual({self.locations[1].id, self.locations[2].id}, {l.id for l in jobs['2'].locations.all()})
+        self.assertIsNone(jobs['1'].close_date)
+
+        # Jobs missing from a full sync are closed. Jobs outside the sync are left alone
+        self.save_jobs([
+            JobData(ats_job_key='1', job_title='Account Executive', department_name='Sales', locations=[self.locations[3]]),
+        ])
+        jobs = self.get_ats_jobs()
+        self.assertEqual([self.locations[3].id], [l.id for l in jobs['1'].locations.all()])
+        self.assertIsNone(jobs['1'].close_date)
+        self.assertEqual(timezone.now().date(), jobs['2'].close_date)
+        self.assertEqual(timezone.now().date(), jobs['3'].close_date)
+        self.assertIsNone(EmployerJob.objects.get(id=self.jobs[0].id).close_date)
+
+        # Incremental syncs only close the jobs they are given and only load those jobs
+        with patch.object(self.ats_api, 'get_current_jobs', wraps=self.ats_api.get_current_jobs) as get_current_jobs:
+            self.save_jobs([], closed_job_keys=['1'])
+        get_current_jobs.assert_called_once_with(ats_job_keys={'1'})
+        self.assertEqual(timezone.now().date(), self.get_ats_jobs()['1'].close_date)
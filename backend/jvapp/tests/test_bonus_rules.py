@@ -1,5 +1,5 @@
 from jvapp.models.employer import EmployerReferralBonusRuleModifier
-from jvapp.serializers.employer import get_serialized_employer_job
+from jvapp.serializers.employer import BonusRuleSet, get_serialized_employer_job
 from jvapp.tests.base import BaseTestCase
 
 
@@ -72,4 +72,38 @@ class ReferralBonusRulesTestCase(BaseTestCase):
         # The second job should have the new bonus modifier applied
         job = get_serialized_employer_job(self.jobs[1], rules=[new_rule], is_include_bonus=True)
         self.assertEqual(new_rule.base_bonus_amount * (1 + (earlier_modifier.amount / 100)), job['bonus']['amount'])
-        
\ No newline at end of file
+        
+    def test_match_jobs(self):
+        engineer_rule = self.create_referral_bonus_rule(
+            exclude_states=[self.states[0]],
+            employer=self.employer,
+            order_idx=0,
+            include_job_titles_regex='engineer',
+            base_bonus_amount=2000,
+            bonus_currency=self.currency,
+            days_after_hire_payout=90
+        )
+        boston_rule = self.create_referral_bonus_rule(
+            include_cities=[self.cities[0]],
+            employer=self.employer,
+            order_idx=1,
+            base_bonus_amount=1000,
+            bonus_currency=self.currency,
+            days_after_hire_payout=90
+        )
+        
+        # Rules are matched in order regardless of the order they are passed in
+        job_rules = BonusRuleSet([boston_rule, engineer_rule]).match_jobs(self.jobs)
+        self.assertEqual(
+            [boston_rule.id, engineer_rule.id, boston_rule.id, None, None],
+            [job_rules[job.id]['id'] if job_rules[job.id] else None for job in self.jobs]
+        )
+        # Serializing with the matched rules gives the same bonuses as matching each job
+        rule_set = BonusRuleSet([boston_rule, engineer_rule])
+        self.assertEqual(
+            self.get_serialized_jobs(self.jobs, rule_set),
+            [
+                get_serialized_employer_job(job, rules=rule_set, job_rules=job_rules, is_include_bonus=True)
+                for job in self.jobs
+            ]
+        )
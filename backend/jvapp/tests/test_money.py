@@ -0,0 +1,97 @@
+import re
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from jvapp.management.commands.benchmark_salary_extraction import REFERENCE_COMPENSATION_PATTERN, \
+    parse_compensation_text_reference
+from jvapp.utils import money
+from jvapp.utils.money import parse_compensation_text, salary_extractor
+from jvapp.utils.sanitize import sanitize_html
+
+DESCRIPTION_PARTS = [
+    '<h2>About us</h2><p>We are a fast growing company with 350 employees and offices in 4 cities.</p>',
+    '<h3>Responsibilities</h3><ul><li>Build and maintain services used by 2,000,000 customers</li><li>Mentor 3-5 engineers</li></ul>',
+    '<h3>Qualifications</h3><ul><li>5+ years of experience</li><li>Experience with AWS, Python 3 and SQL</li></ul>',
+    '<p>Benefits include a 401(k) with 4% match, 20 days of PTO and a $1,500 learning stipend.</p>',
+    '<p>The salary range for this position is $110,000 - $145,000 per year.</p>',
+    '<p>Pay transparency: the base pay range is USD 95,000 to 120,000.</p>',
+    '<p>We are an equal opportunity employer.</p>' * 5,
+    '<p style="font-weight: bold">Location: Remote (US)</p>',
+]
+
+# (description part indexes, expected salary) for results produced before the salary extractor
+GOLDEN_DESCRIPTIONS = [
+    ((0,), None), ((0, 3), None), ((0, 4), ('USD', 110000, 145000)), ((0, 4, 1, 3, 6), ('USD', 110000, 145000)),
+    ((0, 5, 7, 4), ('USD', 110000, 145000)), ((1,), None), ((1, 2, 4, 0, 5), ('USD', 110000, 145000)),
+    ((1, 3), None), ((1, 7), None), ((2, 3, 5), ('USD', 95000, 120000)), ((2, 5, 1), ('USD', 95000, 120000)),
+    ((2, 7, 6, 0, 1), None), ((3,), None), ((3, 5), ('USD', 95000, 120000)), ((4, 1, 6), ('USD', 110000, 145000)),
+    ((4, 3), ('USD', 110000, 145000)), ((5,), ('USD', 95000, 120000)), ((5, 4, 6, 2), ('USD', 110000, 145000)),
+    ((5, 7, 3, 1), ('USD', 95000, 120000)), ((6, 0, 1, 7), None), ((6, 1, 2, 7, 3), None),
+    ((6, 3, 7, 5, 0), ('USD', 95000, 120000)), ((7, 0, 6, 2, 3), None), ((7, 4, 3), ('USD', 110000, 145000)),
+]
+
+GOLDEN_SALARY_TEXTS = [
+    ('$120,000 - $150,000', 'year', ('USD', 120000, 150000)),
+    ('The base salary range for this role is $157,300.00 to $344,200.00 per year.', 'year', ('USD', 157300, 344200)),
+    ('Minimum: $157,300.00 Maximum: $344,200.00', 'year', ('USD', 157300, 344200)),
+    ('Salary: 90k-120k USD', 'year', None),
+    ('Pay range: $50K - $70K', 'year', ('USD', 50000, 70000)),
+    ('<p>Compensation</p><ul><li>$95,000 &ndash; $125,000 annually</li></ul>', 'year', ('USD', 95000, 125000)),
+    ('<div style="font-size: 20px">Salary</div><p>£45,000 - £55,000 per annum</p>', 'year', ('GBP', 45000, 55000)),
+    ('€60.000 - €80.000', 'year', None),
+    ('The hourly rate for this position is $25.00 - $32.50 per hour.', 'hour', ('USD', 25, 32.5)),
+    ('$18/hr', 'hour', ('USD', 18, 18)),
+    ('We have 250 employees in 12 offices and were founded in 2009.', 'year', None),
+    ('Join our team of 10,000+ people across 40 countries.', 'year', None),
+    ('Salary: 120000 CAD per year', 'year', ('CAD', 120000, 120000)),
+    ('CAD 85,000 - 100,000', 'year', ('CAD', 85000, 100000)),
+    ('Base pay of ₹1,200,000 to ₹1,800,000', 'year', None),
+    ('Target salary $180,000; 401k match up to 6%; 20 days PTO', 'year', None),
+    ('Expected range $130,000-$170,000 plus equity and a $5,000 signing bonus', 'year', ('USD', 130000, 170000)),
+    ('This role pays USD 140,000 to 160,000 depending on experience.', 'year', ('USD', 140000, 160000)),
+    ('Range: 60 - 75k', 'year', None),
+    ('$1,000,000 in funding raised and a salary of $75,000', 'year', None),
+    ('', 'year', None),
+    ('Salary between $40,000 and $39,000', 'year', None),
+    ('$600,000 - $700,000 OTE', 'year', None),
+    ('Pay: $20 - $25', 'hour', ('USD', 20, 25)),
+    ('Starting at $22.50 an hour, up to $28.75 with experience', 'hour', ('USD', 22.5, 22.5)),
+    ('Salary $ 110,000 - $ 130,000', 'year', ('USD', 110000, 130000)),
+    ('AUD 120k - 140k + super', 'year', ('AUD', 120000, 140000)),
+]
+
+def get_salary(compensation_data):
+    if not compensation_data['salary_currency']:
+        return None
+    return compensation_data['salary_currency'], compensation_data['salary_floor'], compensation_data['salary_ceiling']
+
+
+class SalaryExtractorTestCase(SimpleTestCase):
+
+    def get_description(self, part_idxs):
+        return ''.join(DESCRIPTION_PARTS[idx] for idx in part_idxs)
+
+    def test_golden_salary_texts(self):
+        for text, salary_interval, expected_salary in GOLDEN_SALARY_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(expected_salary, get_salary(parse_compensation_text(text, salary_interval)))
+
+    def test_golden_descriptions(self):
+        descriptions = [self.get_description(part_idxs) for part_idxs, _ in GOLDEN_DESCRIPTIONS]
+        for description, (part_idxs, expected_salary) in zip(descriptions, GOLDEN_DESCRIPTIONS):
+            with self.subTest(part_idxs=part_idxs):
+                self.assertEqual(expected_salary, get_salary(parse_compensation_text(description)))
+        self.assertEqual(
+            [expected_salary for _, expected_salary in GOLDEN_DESCRIPTIONS],
+            [get_salary(compensation_data) for compensation_data in salary_extractor.extract_many(descriptions)]
+        )
+
+    def test_matches_reference_parser(self):
+        # The reference runs with the compensation pattern from before the salary extractor
+        # Speed is compared with the benchmark_salary_extraction command
+        descriptions = [sanitize_html(self.get_description(part_idxs)) for part_idxs, _ in GOLDEN_DESCRIPTIONS]
+        with patch.object(money, 'compensation_pattern', re.compile(REFERENCE_COMPENSATION_PATTERN)):
+            expected = [parse_compensation_text_reference(description) for description in descriptions]
+        results = [salary_extractor.extract(description, is_sanitized=True) for description in descriptions]
+        self.assertEqual(expected, results)
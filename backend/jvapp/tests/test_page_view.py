@@ -0,0 +1,60 @@
+import uuid
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from jvapp.models.tracking import PageView
+from jvapp.utils.page_view import PageViewBuffer, RecentViewSet
+
+
+def get_event(ip_address='1.1.1.1', relative_url='/jobs-link/abc'):
+    return {'ip_address': ip_address, 'relative_url': relative_url, 'access_dt': timezone.now()}
+
+
+class PageViewBufferTestCase(SimpleTestCase):
+
+    def test_recent_views_expire(self):
+        recent_views = RecentViewSet(ttl_seconds=60)
+        with patch('jvapp.utils.page_view.time.monotonic', return_value=0):
+            self.assertTrue(recent_views.add('1.1.1.1', '/a'))
+            self.assertFalse(recent_views.add('1.1.1.1', '/a'))
+            self.assertTrue(recent_views.add('1.1.1.1', '/b'))
+        with patch('jvapp.utils.page_view.time.monotonic', return_value=61):
+            self.assertTrue(recent_views.add('1.1.1.1', '/a'))
+
+    def test_duplicates_are_dropped_and_batches_are_saved(self):
+        buffer = PageViewBuffer(batch_size=2)
+        saved_batches = []
+        with patch.object(buffer, 'start_consumer'), patch.object(buffer, 'save_page_views', saved_batches.append):
+            self.assertTrue(buffer.add(get_event()))
+            self.assertFalse(buffer.add(get_event()))
+            self.assertTrue(buffer.add(get_event(ip_address='2.2.2.2')))
+            self.assertTrue(buffer.add(get_event(ip_address='3.3.3.3')))
+            buffer.close()
+        self.assertEqual([2, 1], [len(batch) for batch in saved_batches])
+
+    def test_full_buffer_saves_on_request_thread(self):
+        buffer = PageViewBuffer(max_queue_size=1)
+        saved_batches = []
+        with patch.object(buffer, 'start_consumer'), patch.object(buffer, 'save_page_views', saved_batches.append):
+            buffer.add(get_event(ip_address='1.1.1.1'))
+            buffer.add(get_event(ip_address='2.2.2.2'))
+            self.assertEqual(1, len(saved_batches))
+            self.assertEqual(1, buffer.events.qsize())
+
+    def test_malformed_social_link_is_dropped(self):
+        social_link_id = uuid.uuid4()
+        events = [
+            {**get_event(), 'social_link_id': str(social_link_id)},
+            {**get_event(ip_address='2.2.2.2'), 'social_link_id': 'not-a-uuid'},
+        ]
+        page_views = [PageView(social_link_id=event['social_link_id']) for event in events]
+        with patch('jvapp.utils.page_view.SocialLink.objects') as social_links:
+            social_links.filter.return_value.values.return_value = [
+                {'id': social_link_id, 'employer_id': 1, 'owner_id': None}
+            ]
+            PageViewBuffer.set_related_objects(page_views, events)
+            social_links.filter.assert_called_once_with(id__in={social_link_id})
+        self.assertEqual([social_link_id, None], [page_view.social_link_id for page_view in page_views])
+        self.assertEqual([1, None], [page_view.employer_id for page_view in page_views])
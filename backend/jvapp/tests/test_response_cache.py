@@ -0,0 +1,53 @@
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+
+from jvapp.utils.response_cache import ResponseCache
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ResponseCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.response_cache = ResponseCache(max_local_entries=2)
+        self.response_cache.shared_cache.clear()
+
+    def test_query_param_order_is_normalized(self):
+        key = self.response_cache.get_cache_key('jobs', QueryDict('page_count=2&profession_key=eng'))
+        same_key = self.response_cache.get_cache_key('jobs', QueryDict('profession_key=eng&page_count=2'))
+        other_key = self.response_cache.get_cache_key('jobs', QueryDict('profession_key=eng&page_count=3'))
+        self.assertEqual(key, same_key)
+        self.assertNotEqual(key, other_key)
+
+    def test_jobs_version_bump_invalidates_responses(self):
+        query_params = QueryDict('page_count=1')
+        cache_key = self.response_cache.get_cache_key('jobs', query_params)
+        self.response_cache.set(cache_key, {'jobs': [1]})
+        self.assertEqual({'jobs': [1]}, self.response_cache.get(cache_key))
+
+        self.response_cache.bump_jobs_version()
+        new_cache_key = self.response_cache.get_cache_key('jobs', query_params)
+        self.assertNotEqual(cache_key, new_cache_key)
+        self.assertIsNone(self.response_cache.get(new_cache_key))
+
+    def test_shared_tier_and_stats(self):
+        other_process_cache = ResponseCache()
+        cache_key = self.response_cache.get_cache_key('jobs', QueryDict('page_count=1'))
+        other_process_cache.set(cache_key, {'jobs': []})
+
+        self.assertEqual({'jobs': []}, self.response_cache.get(cache_key))  # Shared hit
+        self.assertEqual({'jobs': []}, self.response_cache.get(cache_key))  # Local hit
+        self.assertIsNone(self.response_cache.get('missing'))
+        stats = self.response_cache.get_stats()
+        self.assertEqual(1, stats['shared_hits'])
+        self.assertEqual(1, stats['local_hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_local_tier_is_lru(self):
+        for idx in range(3):
+            self.response_cache.set_local(f'key{idx}', idx)
+        self.assertEqual(['key1', 'key2'], list(self.response_cache.local_responses.keys()))
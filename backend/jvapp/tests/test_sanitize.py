@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from jvapp.utils import sanitize
+from jvapp.utils.sanitize import get_sanitize_key, sanitize_html, sanitize_html_many, sanitized_html_cache
+
+
+class SanitizeHtmlTestCase(SimpleTestCase):
+
+    def setUp(self):
+        sanitized_html_cache.clear()
+
+    def test_sanitized_html_is_cached(self):
+        html_text = '<div><b>Bold</b> <a href="http://example.com">Link</a></div>'
+        sanitized_html = sanitize_html(html_text)
+        self.assertIn('<strong>Bold</strong>', sanitized_html)
+        self.assertIn('https://example.com', sanitized_html)
+        with patch.object(sanitize, '_sanitize_html') as mock_sanitize:
+            self.assertEqual(sanitized_html, sanitize_html(html_text))
+            mock_sanitize.assert_not_called()
+        self.assertNotEqual(
+            sanitized_html_cache.get_key(html_text, False), sanitized_html_cache.get_key(html_text, True)
+        )
+
+    def test_sanitize_many_keeps_order(self):
+        html_texts = ['<p>One</p>', None, '<h1>Two</h1>', '', '<p>One</p>']
+        expected = [sanitize_html(html_text) if html_text else html_text for html_text in html_texts]
+        sanitized_html_cache.clear()
+        with patch.object(sanitize, 'PROCESS_POOL_MIN_TEXTS', 2):
+            self.assertEqual(expected, sanitize_html_many(html_texts, max_workers=2))
+        self.assertEqual(expected, sanitize_html_many(html_texts))
+
+    def test_sanitize_many_skips_known_texts(self):
+        html_texts = ['<p>Known</p>', '<p>New</p>']
+        known_sanitized_texts = {get_sanitize_key(html_texts[0]): '<p>Saved</p>'}
+        with patch.object(sanitize, '_sanitize_html', side_effect=lambda html_text, is_email=False: html_text) as mock_sanitize:
+            self.assertEqual(
+                ['<p>Saved</p>', '<p>New</p>'],
+                sanitize_html_many(html_texts, known_sanitized_texts=known_sanitized_texts)
+            )
+            mock_sanitize.assert_called_once_with('<p>New</p>', is_email=False)
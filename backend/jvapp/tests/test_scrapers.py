@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from scrape.base_scrapers import Scraper
+from scrape.job_processor import JobItem
+
+RESPONSE_DELAY_SECONDS = 0.5
+
+
+class DelayedApiScraper(Scraper):
+    IS_API = True
+    employer_name = 'Delayed API'
+    start_url = 'http://127.0.0.1/'
+    api_url = None
+
+    async def scrape_jobs(self):
+        for job_id in range(self.MAX_CONCURRENT_PAGES):
+            await self.add_job_links_to_queue(f'{self.api_url}/jobs/{job_id}', meta_data={'job_id': job_id})
+        await self.close()
+
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_json(f'{self.api_url}/jobs/{job_id}')
+
+    def get_job_data_from_html(self, html, job_url=None, job_id=None, detail_data=None):
+        return JobItem(employer_name=self.employer_name, application_url=job_url, job_title=detail_data['title'])
+
+
+class ApiScraperConcurrencyTestCase(SimpleTestCase):
+
+    async def run_scraper(self):
+        async def get_job(request):
+            await asyncio.sleep(RESPONSE_DELAY_SECONDS)
+            return web.json_response({'title': f'Job {request.match_info["job_id"]}'})
+
+        app = web.Application()
+        app.router.add_get('/jobs/{job_id}', get_job)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        scraper_class = type('LocalApiScraper', (DelayedApiScraper,), {'api_url': f'http://127.0.0.1:{port}'})
+        scraper = scraper_class(None, None, [])
+        try:
+            start_time = time.perf_counter()
+            await scraper.scrape_jobs()
+            return scraper, time.perf_counter() - start_time
+        finally:
+            await scraper.close_connections()
+            await runner.cleanup()
+
+    def test_job_detail_requests_are_concurrent(self):
+        scraper, elapsed_seconds = asyncio.run(self.run_scraper())
+        self.assertEqual(Scraper.MAX_CONCURRENT_PAGES, len(scraper.job_items))
+
+        # Serial requests would take MAX_CONCURRENT_PAGES round trips
+        self.assertLess(elapsed_seconds, RESPONSE_DELAY_SECONDS * 3)
@@ -1,5 +1,4 @@
 from django.urls import path, re_path
-from django.views.decorators.cache import cache_page
 
 from jvapp.apis import (
     admin, ats, auth, community, content, currency, data, donation_org, email, employer, job_seeker, job, jobs,
@@ -14,6 +13,7 @@ urlpatterns = [
     path('admin/ats-jobs/', admin.AdminAtsJobsView.as_view()),
     re_path('^admin/employer/(?P<employer_id>[0-9]+)?/?$', admin.AdminEmployerView.as_view()),
     path('admin/job-scraper/', admin.AdminJobScrapersView.as_view()),
+    path('admin/response-cache/', admin.AdminResponseCacheView.as_view()),
     path('admin/taxonomy-update/', admin.AdminTaxonomyView.as_view()),
     re_path('^admin/user/(?P<user_id>[0-9]+)?/?$', admin.AdminUserView.as_view()),
     path('admin/user-connections/', admin.AdminUserConnectionsView.as_view()),
@@ -57,7 +57,7 @@ urlpatterns = [
     re_path('^job-subscription/(?P<subscription_id>[0-9]+)?/?$', job_subscription.JobSubscriptionView.as_view()),
     path('notification-preference/', notification.UserNotificationPreferenceView.as_view()),
     path('page-view/', tracking.PageTrackView.as_view()),
-    path('search/entity/', cache_page(60 * 60 * 24)(search.SearchEntityView.as_view())),
+    path('search/entity/', search.SearchEntityView.as_view()),
     re_path('^social-content-item/(?P<item_id>[0-9]+)?/?$', content.SocialContentItemView.as_view()),
     path('social-link/share/', social.ShareSocialLinkView.as_view()),
     re_path('^social-link/(?P<link_id>\S+)?/?$', social.SocialLinkView.as_view()),
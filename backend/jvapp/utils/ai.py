@@ -1,8 +1,11 @@
+import asyncio
 import datetime
 import hashlib
 import json
 import math
 import os
+import random
+import threading
 import time
 
 import json5
@@ -14,6 +17,7 @@ from django.utils import timezone
 from openai import InvalidRequestError
 
 from jvapp.models.tracking import AIRequest
+from jvapp.utils.data import coerce_float
 
 logger = logging.getLogger(__name__)
 openai.api_key = os.getenv('OPEN_AI_API_KEY')
@@ -21,6 +25,11 @@ openai.api_key = os.getenv('OPEN_AI_API_KEY')
 M4K = 'gpt-3.5-turbo'
 M16K = 'gpt-3.5-turbo-16k'
 DEFAULT_MODEL = M4K
+# USD per 1K tokens for (prompt, completion)
+MODEL_COSTS_PER_1K_TOKENS = {
+    M4K: (0.0015, 0.002),
+    M16K: (0.003, 0.004),
+}
 
 
 class PromptError(Exception):
@@ -60,15 +69,108 @@ async def parse_response(openai_response, request_tracker=None):
     logger.info('Model response successfully parsed')
     return data
 
+
+def get_request_usage(request_tracker):
+    """
+    :return: (prompt tokens, completion tokens, cost in USD) of the model response saved in the request tracker
+    """
+    try:
+        response = json.loads(request_tracker.response)
+    except (TypeError, json.JSONDecodeError):
+        return 0, 0, 0
+    usage = response.get('usage') or {}
+    prompt_tokens = usage.get('prompt_tokens') or 0
+    completion_tokens = usage.get('completion_tokens') or 0
+    # Responses include the model version (e.g. gpt-3.5-turbo-0613) so the longest matching model is used
+    model = max((m for m in MODEL_COSTS_PER_1K_TOKENS if (response.get('model') or '').startswith(m)), key=len, default=None)
+    prompt_cost, completion_cost = MODEL_COSTS_PER_1K_TOKENS.get(model, (0, 0))
+    return prompt_tokens, completion_tokens, (prompt_tokens * prompt_cost + completion_tokens * completion_cost) / 1000
+
+
 WAIT_MULTIPLE_SECONDS = 5
+MAX_RETRIES = 3
+# OpenAI account limits. Shared by every caller in the process so concurrent workers stay under them together
+REQUESTS_PER_MINUTE = int(os.getenv('OPEN_AI_REQUESTS_PER_MINUTE', 3500))
+TOKENS_PER_MINUTE = int(os.getenv('OPEN_AI_TOKENS_PER_MINUTE', 90000))
+CHARS_PER_TOKEN = 4
+COMPLETION_TOKENS_ESTIMATE = 500
+
+
+class RateLimiter:
+    """Token buckets for requests per minute and tokens per minute
+    State is guarded by a thread lock rather than an asyncio lock so one limiter can be shared
+    by every event loop (each asyncio.run call creates a new one)
+    """
+    
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.capacities = (requests_per_minute, tokens_per_minute)
+        self.available = [requests_per_minute, tokens_per_minute]
+        self.update_ts = time.monotonic()
+        self.paused_until_ts = 0
+        self.lock = threading.Lock()
+    
+    def reserve(self, token_count):
+        """
+        :return: Seconds to wait before trying again or 0 if the request was reserved
+        """
+        # A request larger than the bucket could never be reserved
+        needed = (1, min(token_count, self.capacities[1]))
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until_ts:
+                return self.paused_until_ts - now
+            elapsed_seconds = now - self.update_ts
+            self.update_ts = now
+            for idx, capacity in enumerate(self.capacities):
+                self.available[idx] = min(capacity, self.available[idx] + elapsed_seconds * capacity / 60)
+            wait_seconds = max(
+                (needed[idx] - self.available[idx]) * 60 / capacity for idx, capacity in enumerate(self.capacities)
+            )
+            if wait_seconds > 0:
+                return wait_seconds
+            for idx in range(len(self.capacities)):
+                self.available[idx] -= needed[idx]
+            return 0
+    
+    async def acquire(self, token_count):
+        while wait_seconds := self.reserve(token_count):
+            await asyncio.sleep(wait_seconds)
+    
+    def add_token_usage(self, token_count):
+        """Correct the token bucket once the actual usage of a request is known. Can be negative
+        """
+        with self.lock:
+            self.available[1] -= token_count
+    
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until_ts = max(self.paused_until_ts, time.monotonic() + seconds)
+
 
+rate_limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
 
-async def send_request(model, prompt, retries=2):
+
+def estimate_token_count(prompt):
+    return sum(len(message['content']) for message in prompt) // CHARS_PER_TOKEN + COMPLETION_TOKENS_ESTIMATE
+
+
+def get_backoff_seconds(try_count):
+    # Jitter keeps workers that failed together from retrying together
+    return WAIT_MULTIPLE_SECONDS * (2 ** try_count) + random.uniform(0, 1)
+
+
+def get_retry_after_seconds(error):
+    headers = getattr(error, 'headers', None) or {}
+    return coerce_float(headers.get('retry-after'))
+
+
+async def send_request(model, prompt, retries=MAX_RETRIES):
     """ OpenAI has frequent service interruptions so we use exponential backoff
+    Waits are async so other requests on the event loop keep running
     """
-    try_count = 0
-    e = openai.error.APIError
-    while try_count <= retries:
+    estimated_token_count = estimate_token_count(prompt)
+    for try_count in range(retries + 1):
+        await rate_limiter.acquire(estimated_token_count)
         try:
             resp = await openai.ChatCompletion.acreate(
                 model=model,
@@ -78,28 +180,72 @@ async def send_request(model, prompt, retries=2):
                 frequency_penalty=0,
                 presence_penalty=0
             )
-            return resp
-        except (openai.error.ServiceUnavailableError, openai.error.APIError) as e:
-            try_count += 1
-            wait_seconds = WAIT_MULTIPLE_SECONDS * try_count
-            logger.warning(f'Experienced service error with OpenAI. Retrying request in {wait_seconds} seconds.')
-            time.sleep(wait_seconds)
-    raise e
+        except openai.error.RateLimitError as e:
+            if try_count == retries:
+                raise e
+            wait_seconds = get_retry_after_seconds(e) or get_backoff_seconds(try_count)
+            logger.warning(f'Experienced rate limit with OpenAI. Pausing requests for {wait_seconds:.1f} seconds.')
+            # All requests are over the limit, not just this one
+            rate_limiter.pause(wait_seconds)
+            continue
+        except (openai.error.ServiceUnavailableError, openai.error.APIError, openai.error.Timeout) as e:
+            if try_count == retries:
+                raise e
+            wait_seconds = get_backoff_seconds(try_count)
+            logger.warning(f'Experienced service error with OpenAI. Retrying request in {wait_seconds:.1f} seconds.')
+            await asyncio.sleep(wait_seconds)
+            continue
+        
+        if usage := resp.get('usage'):
+            rate_limiter.add_token_usage(usage.get('total_tokens', estimated_token_count) - estimated_token_count)
+        return resp
+
 
+def get_prompt_hash(prompt, model=DEFAULT_MODEL):
+    return hashlib.md5(bytes(json.dumps(prompt) + model, 'UTF-8')).hexdigest()
 
-async def ask(prompt, model=DEFAULT_MODEL, is_test=False):
+
+def get_cached_requests_sync(prompts, model=DEFAULT_MODEL):
+    prompt_hashes = {get_prompt_hash(prompt, model) for prompt in prompts}
+    cached_requests = {}
+    for request in AIRequest.objects.filter(prompt_hash__in=prompt_hashes).order_by('id'):
+        cached_requests.setdefault(request.prompt_hash, request)
+    if cached_requests:
+        # Bump up modified_dt so we can prune prompts that are no longer used after certain time period
+        AIRequest.objects.filter(id__in=[request.id for request in cached_requests.values()]).update(
+            modified_dt=timezone.now()
+        )
+    return cached_requests
+
+
+async def get_cached_requests(prompts, model=DEFAULT_MODEL):
+    """Look up previous requests for a batch of prompts with one query
+    :return: Dict of prompt hash to AIRequest. Pass to ask so it doesn't query for each prompt
+    """
+    return await sync_to_async(get_cached_requests_sync)(prompts, model=model)
+
+
+async def ask(prompt, model=DEFAULT_MODEL, is_test=False, cached_requests=None):
     """Make a request to OpenAI and return a structured result.
 
     Model descriptions: https://platform.openai.com/docs/models/gpt-3-5
 
+    Args:
+        cached_requests: Result of get_cached_requests for a batch of prompts that includes this one.
+            If not provided, previous requests are looked up individually
+
     Returns:
         dict that is a parse of the response text from JSON
         AIRequest object with information about
     """
     # Check to see if we've made this prompt before
-    prompt_hash = hashlib.md5(bytes(json.dumps(prompt) + model, 'UTF-8')).hexdigest()
-    if existing := await sync_to_async(AIRequest.objects.filter(prompt_hash=prompt_hash).first)():
-        sync_to_async(existing.save)()  # Bump up modified_dt so we can prune prompts that are no longer used after certain time period
+    prompt_hash = get_prompt_hash(prompt, model)
+    if cached_requests is not None:
+        existing = cached_requests.get(prompt_hash)
+    elif existing := await sync_to_async(AIRequest.objects.filter(prompt_hash=prompt_hash).first)():
+        await sync_to_async(existing.save)()  # Bump up modified_dt so we can prune prompts that are no longer used after certain time period
+    if existing:
+        existing.is_cached = True
         if existing.result_status == AIRequest.RESULT_STATUS_SUCCESS:
             resp = await parse_response(json.loads(existing.response))
             return resp, existing
@@ -1,4 +1,5 @@
 import re
+import uuid
 from collections.abc import Callable
 from dataclasses import dataclass
 from urllib.parse import urlsplit
@@ -72,6 +73,17 @@ def coerce_int(val, default=None, is_raise_error=False):
         return default
 
 
+def coerce_uuid(val, default=None, is_raise_error=False):
+    if isinstance(val, uuid.UUID):
+        return val
+    try:
+        return uuid.UUID(str(val))
+    except (ValueError, TypeError) as e:
+        if is_raise_error:
+            raise e
+        return default
+
+
 def coerce_float(val, default=None, is_raise_error=False):
     try:
         return float(val)
@@ -0,0 +1,174 @@
+import hashlib
+import html
+import logging
+import re
+
+from django.db.models import Count, Prefetch, Q
+from django.db.transaction import atomic
+from django.utils import timezone
+
+from jvapp.models.employer import EmployerJob, JobSearch, JobSearchLocation, JobTaxonomy, ProfessionJobCount, Taxonomy
+from jvapp.models.location import Location
+from jvapp.utils.response_cache import bump_jobs_version
+
+logger = logging.getLogger(__name__)
+
+REFRESH_BATCH_SIZE = 2000
+
+
+def get_open_job_filter():
+    return Q(close_date__isnull=True) | Q(close_date__gt=timezone.now().date())
+
+
+def get_description_text(job_description):
+    if not job_description:
+        return None
+    return re.sub(r'\s+', ' ', html.unescape(re.sub('<[^>]+>', ' ', job_description))).strip()
+
+
+def get_description_fingerprint(job_description):
+    """Hash of the description text that ignores HTML, whitespace, and case
+    Employers often post the same description for many jobs (e.g. one per location)
+    """
+    if not (description_text := get_description_text(job_description)):
+        return None
+    return hashlib.sha1(description_text.lower().encode('utf-8')).hexdigest()
+
+
+def refresh_job_search(job_filter=None):
+    """Update the denormalized job search rows for all jobs matching the filter
+    Open jobs are upserted and closed jobs are removed. If no filter is provided, all jobs are refreshed
+    and all profession job counts are reconciled
+    """
+    # A full refresh only needs open jobs. Rows for closed jobs are removed below
+    job_ids = list(EmployerJob.objects.filter(job_filter or get_open_job_filter()).values_list('id', flat=True))
+    logger.info(f'Refreshing job search for {len(job_ids)} jobs')
+    profession_ids = set()
+    for start_idx in range(0, len(job_ids), REFRESH_BATCH_SIZE):
+        profession_ids |= refresh_job_search_batch(job_ids[start_idx:start_idx + REFRESH_BATCH_SIZE])
+
+    if not job_filter:
+        # Remove rows for jobs that closed since the last refresh
+        JobSearch.objects.filter(~get_open_job_filter()).delete()
+        refresh_profession_job_counts()
+    else:
+        refresh_profession_job_counts(profession_ids=profession_ids)
+    
+    # Cached job board responses are now stale
+    bump_jobs_version()
+
+
+def refresh_job_search_batch(job_ids):
+    """Upsert the job search rows for a batch of jobs
+    :return: IDs of professions whose job counts may have changed
+    """
+    locations_prefetch = Prefetch(
+        'locations', queryset=Location.objects.select_related('city', 'state', 'country')
+    )
+    jobs = (
+        EmployerJob.objects
+        .select_related('employer', 'job_department')
+        .prefetch_related(locations_prefetch, 'taxonomy', 'taxonomy__taxonomy')
+        .filter(get_open_job_filter(), id__in=job_ids)
+    )
+
+    job_searches = []
+    job_search_locations = []
+    for job in jobs:
+        profession = job.profession
+        job_searches.append(JobSearch(
+            job_id=job.id,
+            employer_id=job.employer_id,
+            employer_name=job.employer.employer_name,
+            job_title=job.job_title,
+            job_department=job.job_department.name if job.job_department else None,
+            job_description=get_description_text(job.job_description),
+            profession_id=profession.id if profession else None,
+            is_remote=job.is_remote,
+            salary_floor=job.salary_floor,
+            salary_ceiling=job.salary_ceiling,
+            open_date=job.open_date,
+            close_date=job.close_date,
+            is_job_approved=job.is_job_approved
+        ))
+        for location in job.locations.all():
+            job_search_locations.append(JobSearchLocation(
+                job_search_id=job.id,
+                location_id=location.id,
+                is_remote=location.is_remote,
+                city=location.city.name if location.city else None,
+                state=location.state.name if location.state else None,
+                country=location.country.name if location.country else None,
+                geometry=location.geometry
+            ))
+
+    open_job_ids = [job_search.job_id for job_search in job_searches]
+    # Includes the professions of jobs that are closing
+    profession_ids = set(
+        JobTaxonomy.objects
+        .filter(job_id__in=job_ids, taxonomy__tax_type=Taxonomy.TAX_TYPE_PROFESSION)
+        .values_list('taxonomy_id', flat=True).distinct()
+    )
+    with atomic():
+        # Jobs may be moving out of a profession so the old professions need new counts too
+        profession_ids |= set(
+            JobSearch.objects.filter(job_id__in=job_ids).values_list('profession_id', flat=True).distinct()
+        )
+        JobSearch.objects.filter(job_id__in=set(job_ids) - set(open_job_ids)).delete()
+        JobSearch.objects.bulk_create(
+            job_searches,
+            update_conflicts=True,
+            update_fields=[
+                'employer', 'employer_name', 'job_title', 'job_department', 'job_description', 'profession', 'is_remote', 'salary_floor',
+                'salary_ceiling', 'open_date', 'close_date', 'is_job_approved'
+            ]
+        )
+        JobSearchLocation.objects.filter(job_search_id__in=open_job_ids).delete()
+        JobSearchLocation.objects.bulk_create(job_search_locations)
+    
+    profession_ids.discard(None)
+    return profession_ids
+
+
+def refresh_profession_job_counts(profession_ids=None):
+    """Recalculate the open job counts for professions. Counts are from all of an open job's profession
+    taxonomies (a job can have more than one) so they match the job board's profession filter
+    :param profession_ids: If None, the counts for all professions are rebuilt
+    """
+    job_taxonomies = JobTaxonomy.objects.filter(
+        taxonomy__tax_type=Taxonomy.TAX_TYPE_PROFESSION,
+        job__search__isnull=False  # Only open jobs are in the job search table
+    )
+    count_filter = Q()
+    if profession_ids is not None:
+        if not profession_ids:
+            return
+        job_taxonomies = job_taxonomies.filter(taxonomy_id__in=profession_ids)
+        count_filter &= Q(taxonomy_id__in=profession_ids)
+    
+    job_counts = [
+        ProfessionJobCount(taxonomy_id=row['taxonomy_id'], job_count=row['job_count'])
+        for row in job_taxonomies.values('taxonomy_id').annotate(job_count=Count('job_id', distinct=True))
+    ]
+    job_counts += [
+        ProfessionJobCount(taxonomy_id=row['taxonomy_id'], is_remote=row['job__search__is_remote'], job_count=row['job_count'])
+        for row in (
+            job_taxonomies
+            .values('taxonomy_id', 'job__search__is_remote')
+            .annotate(job_count=Count('job_id', distinct=True))
+        )
+    ]
+    job_counts += [
+        ProfessionJobCount(taxonomy_id=row['taxonomy_id'], country=row['job__search__locations__country'], job_count=row['job_count'])
+        for row in (
+            job_taxonomies
+            .filter(job__search__locations__country__isnull=False)
+            .values('taxonomy_id', 'job__search__locations__country')
+            .annotate(job_count=Count('job_id', distinct=True))
+        )
+    ]
+    
+    with atomic():
+        ProfessionJobCount.objects.filter(count_filter).delete()
+        ProfessionJobCount.objects.bulk_create(job_counts)
+    logger.info(f'Refreshed {len(job_counts)} profession job counts')
@@ -1,11 +1,13 @@
-__all__ = ['compensation_data_template', 'parse_compensation_text', 'merge_compensation_data']
+__all__ = [
+    'compensation_data_template', 'parse_compensation_text', 'merge_compensation_data', 'SalaryExtractor',
+    'salary_extractor'
+]
 
 
 import re
-from functools import reduce
 
 from jvapp.models.currency import currencies, currency_lookup
-from jvapp.utils.sanitize import sanitize_html
+from jvapp.utils.sanitize import sanitize_html, sanitize_html_many
 
 # Example -- Minimum: $157,300.00 Maximum: $344,200.00
 CURRENCY_RANGE_MAX_CHAR_COUNT = 10
@@ -20,30 +22,76 @@ compensation_data_template = {
 }
 
 
+# The lookahead skips positions that can't start a match without trying the full pattern at every character
+compensation_pattern = re.compile(
+    f'(?=[\\s0-9]|{currency_characters})(?P<currency>{currency_characters})?\\s?(?P<first_numbers>[0-9]+((\\.?[0-9]+)|([0-9]*?))),?(?P<second_numbers>[0-9]+(\\.?[0-9]+)?)?\\s?(?P<thousand_marker>[kK])?'
+)
+
+
+class SalaryExtractor:
+    """Finds the salary range in a job description or compensation text
+    A salary needs a currency and, for yearly salaries, a number with at least 5 digits or a thousand
+    marker (e.g. 50k). Most descriptions have neither so they are rejected with a quick search
+    before every number in the text is grouped
+    """
+    CURRENCY_CODE_PATTERN = re.compile(f'({"|".join(currencies)})\\s')
+    CURRENCY_CHARACTER_PATTERN = re.compile(currency_characters)
+    YEARLY_SALARY_NUMBER_PATTERN = re.compile('[0-9][0-9.,]{4,}|[0-9]\\s?[kK]')
+    BAD_YEARLY_SALARY_FLOOR = 40000
+    BAD_SALARY_FLOOR = 1
+    BAD_SALARY_CEILING = 500000
+    
+    def extract(self, text, salary_interval='year', is_sanitized=False):
+        if not text:
+            return {**compensation_data_template}
+        if not is_sanitized:
+            text = sanitize_html(text)
+        bad_salary_floor = self.BAD_YEARLY_SALARY_FLOOR if salary_interval == 'year' else self.BAD_SALARY_FLOOR
+        if not self.has_salary_signal(text, bad_salary_floor):
+            return {**compensation_data_template}
+        
+        grouped_compensation_matches = get_grouped_compensation_matches(text, bad_salary_floor, self.BAD_SALARY_CEILING)
+        best_compensation_match = get_best_compensation_group(
+            grouped_compensation_matches, bad_salary_floor, self.BAD_SALARY_CEILING
+        )
+        currency = None
+        if best_compensation_match and best_compensation_match['currency']:
+            currency = currency_lookup.get(best_compensation_match['currency'], None)
+        elif currency_match := self.CURRENCY_CODE_PATTERN.search(text):
+            currency = currency_match.group(0).strip()
+        if not all((best_compensation_match, currency)):
+            return {**compensation_data_template}
+        
+        return {
+            'salary_interval': salary_interval,
+            'salary_currency': currency,
+            'salary_floor': best_compensation_match['salary'][0],
+            'salary_ceiling': best_compensation_match['salary'][-1]
+        }
+    
+    def extract_many(self, texts, salary_interval='year'):
+        """
+        :return: The compensation data for each text in the same order
+        """
+        sanitized_texts = sanitize_html_many(texts)
+        return [
+            self.extract(text, salary_interval=salary_interval, is_sanitized=True) for text in sanitized_texts
+        ]
+    
+    def has_salary_signal(self, text, bad_salary_floor):
+        # A salary's currency is either part of the matched numbers or a currency code found anywhere in the text
+        if not (self.CURRENCY_CHARACTER_PATTERN.search(text) or self.CURRENCY_CODE_PATTERN.search(text)):
+            return False
+        if bad_salary_floor >= 10000 and not self.YEARLY_SALARY_NUMBER_PATTERN.search(text):
+            return False
+        return True
+
+
+salary_extractor = SalaryExtractor()
+
+
 def parse_compensation_text(text, salary_interval='year'):
-    if not text:
-        return {**compensation_data_template}
-    text = sanitize_html(text)
-    currency_pattern = reduce(lambda full_pattern, currency: f'{full_pattern}{"|" if full_pattern else ""}{currency}', currencies, '')
-    currency_match = re.search(f'({currency_pattern})\s', text)
-    bad_salary_floor = 40000 if salary_interval == 'year' else 1
-    bad_salary_ceiling = 500000
-    grouped_compensation_matches = get_grouped_compensation_matches(text, bad_salary_floor, bad_salary_ceiling)
-    best_compensation_match = get_best_compensation_group(grouped_compensation_matches, bad_salary_floor, bad_salary_ceiling)
-    currency = None
-    if best_compensation_match and best_compensation_match['currency']:
-        currency = currency_lookup.get(best_compensation_match['currency'], None)
-    elif currency_match:
-        currency = currency_match.group(0).strip()
-    if not all((best_compensation_match, currency)):
-        return {**compensation_data_template}
-
-    return {
-        'salary_interval': salary_interval,
-        'salary_currency': currency,
-        'salary_floor': best_compensation_match['salary'][0],
-        'salary_ceiling': best_compensation_match['salary'][-1]
-    }
+    return salary_extractor.extract(text, salary_interval=salary_interval)
 
 
 def get_best_compensation_group(compensation_groups, bad_salary_floor, bad_salary_ceiling):
@@ -94,8 +142,7 @@ def is_good_salary_range(salary_group_data, min_salary, max_salary):
 
 
 def get_grouped_compensation_matches(text, min_salary, max_salary):
-    compensation_pattern = f'(?P<currency>{currency_characters})?\s?(?P<first_numbers>[0-9]+((\.?[0-9]+)|([0-9]*?))),?(?P<second_numbers>[0-9]+(\.?[0-9]+)?)?\s?(?P<thousand_marker>[kK])?'
-    compensation_matches = list(re.finditer(compensation_pattern, text))
+    compensation_matches = list(compensation_pattern.finditer(text))
     groups = []
     combined_group = []
     last_end_position = 0
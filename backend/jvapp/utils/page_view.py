@@ -0,0 +1,280 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.gis.geoip2 import GeoIP2
+from django.db import DataError, IntegrityError, close_old_connections
+from user_agents import parse
+
+from jvapp.models.employer import Employer
+from jvapp.models.social import SocialLink, SocialPlatform
+from jvapp.models.tracking import PageView
+from jvapp.models.user import JobVyneUser
+from jvapp.utils.data import coerce_int, coerce_uuid
+from jvapp.utils.rollup import add_page_view_rollups
+
+geo_locator = GeoIP2()
+logger = logging.getLogger(__name__)
+
+# Check whether the same IP address viewed the page within this number of minutes
+# If so, don't save a new view record. The assumption is that this is just a page refresh
+UNIQUE_VIEW_LOOKBACK_MINUTES = 30
+
+
+@lru_cache(maxsize=10000)
+def get_ip_location_data(ip_address):
+    try:
+        location_data = geo_locator.city(ip_address)
+    except Exception:
+        return None
+    return {
+        'city': location_data['city'],
+        'country': location_data['country_name'],
+        'region': location_data['region'],
+        'latitude': location_data['latitude'],
+        'longitude': location_data['longitude'],
+    }
+
+
+@lru_cache(maxsize=2000)
+def get_user_agent_data(user_agent_str):
+    user_agent = parse(user_agent_str)
+    return {
+        'browser': user_agent.browser.family,
+        'browser_version': user_agent.browser.version_string,
+        'operating_system': user_agent.os.family,
+        'device_type': user_agent.device.family,
+        'device_brand': user_agent.device.brand,
+        'device_model': user_agent.device.model,
+        'is_mobile': user_agent.is_mobile,
+        'is_tablet': user_agent.is_tablet,
+        'is_pc': user_agent.is_pc,
+        'is_bot': user_agent.is_bot,
+    }
+
+
+class RecentViewSet:
+    """Per-process set of (IP address, URL) pairs seen within the lookback window
+    Replaces the "recent view" query that used to run for every page view
+    """
+    MAX_ENTRIES = 100000
+
+    def __init__(self, ttl_seconds=UNIQUE_VIEW_LOOKBACK_MINUTES * 60, max_entries=MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.view_ts = OrderedDict()
+        self.lock = threading.Lock()
+
+    def add(self, ip_address, relative_url):
+        """
+        :return: False if the view was already seen within the lookback window
+        """
+        key = (ip_address, relative_url)
+        now = time.monotonic()
+        with self.lock:
+            # Entries are in insertion order so expired entries are always at the front
+            while self.view_ts and (
+                len(self.view_ts) >= self.max_entries
+                or now - next(iter(self.view_ts.values())) > self.ttl_seconds
+            ):
+                self.view_ts.popitem(last=False)
+            if (view_ts := self.view_ts.get(key)) is not None and now - view_ts <= self.ttl_seconds:
+                return False
+            self.view_ts.pop(key, None)
+            self.view_ts[key] = now
+            return True
+
+    def clear(self):
+        with self.lock:
+            self.view_ts.clear()
+
+
+class PageViewBuffer:
+    """Accepts page view events from request threads and saves them in batches from a background thread
+    Events are plain dicts with the raw request data. Enrichment (GeoIP, user agent) and lookups
+    happen in the consumer so the request only pays for a queue insert
+    """
+    MAX_QUEUE_SIZE = 10000
+    BATCH_SIZE = 500
+    FLUSH_INTERVAL_SECONDS = 2
+
+    def __init__(self, max_queue_size=MAX_QUEUE_SIZE, batch_size=BATCH_SIZE, is_background=True):
+        self.events = queue.Queue(maxsize=max_queue_size)
+        self.batch_size = batch_size
+        self.is_background = is_background
+        self.recent_views = RecentViewSet()
+        self.consumer = None
+        self.consumer_lock = threading.Lock()
+
+    def add(self, event):
+        """
+        :return: False if the event was a duplicate view and was not queued
+        """
+        if not self.recent_views.add(event['ip_address'], event['relative_url']):
+            return False
+        if not self.is_background:
+            self.save_page_views([event])
+            return True
+
+        self.start_consumer()
+        while True:
+            try:
+                self.events.put_nowait(event)
+                return True
+            except queue.Full:
+                # Backpressure: the consumer is behind so the producer saves a batch itself
+                logger.warning('Page view buffer is full. Saving a batch on the request thread')
+                self.flush(max_batches=1)
+
+    def start_consumer(self):
+        if self.consumer and self.consumer.is_alive():
+            return
+        with self.consumer_lock:
+            if self.consumer and self.consumer.is_alive():
+                return
+            self.consumer = threading.Thread(target=self.consume, name='page-view-buffer', daemon=True)
+            self.consumer.start()
+
+    def consume(self):
+        while True:
+            events = self.get_batch(timeout=self.FLUSH_INTERVAL_SECONDS)
+            if not events:
+                continue
+            close_old_connections()
+            try:
+                self.save_page_views(events)
+            except Exception as e:
+                logger.exception(f'Unable to save {len(events)} page views: {e}')
+            finally:
+                self.mark_done(events)
+
+    def get_batch(self, timeout=None):
+        """Wait up to the timeout for the first event and then take whatever else is queued, up to the batch size
+        """
+        events = []
+        try:
+            events.append(self.events.get(timeout=timeout) if timeout else self.events.get_nowait())
+        except queue.Empty:
+            return events
+        while len(events) < self.batch_size:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def flush(self, max_batches=None):
+        """Save all queued events on the calling thread
+        """
+        batch_count = 0
+        while (max_batches is None or batch_count < max_batches) and (events := self.get_batch()):
+            try:
+                self.save_page_views(events)
+            finally:
+                self.mark_done(events)
+            batch_count += 1
+
+    def close(self):
+        """Save everything that is queued and wait for batches the consumer already took off the queue
+        """
+        self.flush()
+        self.events.join()
+
+    def mark_done(self, events):
+        for _ in events:
+            self.events.task_done()
+
+    def save_page_views(self, events):
+        page_views = [self.get_page_view(event) for event in events]
+        self.set_related_objects(page_views, events)
+        try:
+            PageView.objects.bulk_create(page_views)
+        except (DataError, IntegrityError, ValueError) as e:
+            # One bad row fails the whole insert. Save individually so the rest of the batch is kept
+            logger.error(e)
+            saved_page_views = []
+            for page_view in page_views:
+                try:
+                    page_view.save()
+                    saved_page_views.append(page_view)
+                except (DataError, IntegrityError, ValueError) as e:
+                    logger.error(e)
+            page_views = saved_page_views
+        add_page_view_rollups(page_views)
+        logger.info(f'Saved {len(page_views)} page views')
+        return page_views
+
+    @staticmethod
+    def get_page_view(event):
+        page_view = PageView(
+            viewer_id=event.get('viewer_id'),
+            relative_url=event['relative_url'],
+            social_link_id=event.get('social_link_id'),
+            page_owner_id=event.get('page_owner_id'),
+            ip_address=event['ip_address'],
+            access_dt=event['access_dt'],
+        )
+        if page_view.ip_address and (location_data := get_ip_location_data(page_view.ip_address)):
+            for key, val in location_data.items():
+                setattr(page_view, key, val)
+        if user_agent_str := event.get('user_agent'):
+            for key, val in get_user_agent_data(user_agent_str).items():
+                setattr(page_view, key, val)
+        return page_view
+
+    @staticmethod
+    def set_related_objects(page_views, events):
+        """Resolve employers, platforms, social links, and page owners for the whole batch at once
+        bulk_create skips the pre_save signal so the social link defaults are set here
+        """
+        employer_keys = {event['employer_key'] for event in events if event.get('employer_key')}
+        employer_ids = {
+            employer_key: employer_id for employer_key, employer_id in
+            Employer.objects.filter(employer_key__in=employer_keys).values_list('employer_key', 'id')
+        } if employer_keys else {}
+        platform_ids = {
+            name.lower(): platform_id for name, platform_id in SocialPlatform.objects.values_list('name', 'id')
+        } if any(event.get('platform_name') for event in events) else {}
+        # The social link and page owner come from query params so they may not be valid
+        for page_view in page_views:
+            page_view.social_link_id = coerce_uuid(page_view.social_link_id) if page_view.social_link_id else None
+            page_view.page_owner_id = coerce_int(page_view.page_owner_id)
+        social_link_ids = {page_view.social_link_id for page_view in page_views if page_view.social_link_id}
+        social_links = {
+            social_link['id']: social_link for social_link in
+            SocialLink.objects.filter(id__in=social_link_ids).values('id', 'employer_id', 'owner_id')
+        } if social_link_ids else {}
+        page_owner_ids = {page_view.page_owner_id for page_view in page_views if page_view.page_owner_id}
+        page_owner_ids = set(
+            JobVyneUser.objects.filter(id__in=page_owner_ids).values_list('id', flat=True)
+        ) if page_owner_ids else set()
+
+        for page_view, event in zip(page_views, events):
+            if page_view.page_owner_id not in page_owner_ids:
+                page_view.page_owner_id = None
+            if employer_key := event.get('employer_key'):
+                page_view.employer_id = employer_ids.get(employer_key)
+            if platform_name := event.get('platform_name'):
+                page_view.platform_id = platform_ids.get(platform_name.lower())
+            if page_view.social_link_id:
+                if social_link := social_links.get(page_view.social_link_id):
+                    page_view.employer_id = page_view.employer_id or social_link['employer_id']
+                    page_view.page_owner_id = page_view.page_owner_id or social_link['owner_id']
+                else:
+                    page_view.social_link_id = None
+
+
+page_view_buffer = PageViewBuffer(is_background=settings.IS_PAGE_VIEW_BUFFERED)
+
+
+@atexit.register
+def flush_page_views():
+    try:
+        page_view_buffer.close()
+    except Exception as e:
+        logger.exception(f'Unable to flush page views on shutdown: {e}')
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+JOBS_VERSION_KEY = 'jobs_version'
+SHARED_CACHE_ALIAS = 'shared'
+
+
+class ResponseCache:
+    """Two tier cache for public GET responses
+    Responses are stored in a per-process LRU and in a shared cache (any Django cache backend) so other
+    processes can reuse them. Keys include the "jobs version" which is bumped whenever jobs or the data served
+    with them (employers, connections, job summaries) are written, so cached responses never outlive that data
+    """
+    MAX_LOCAL_ENTRIES = 1000
+    SHARED_TIMEOUT_SECONDS = 60 * 60
+    # How long a process trusts its copy of the jobs version before re-reading it from the shared cache
+    JOBS_VERSION_TTL_SECONDS = 5
+
+    def __init__(self, max_local_entries=MAX_LOCAL_ENTRIES, shared_cache_alias=SHARED_CACHE_ALIAS):
+        self.max_local_entries = max_local_entries
+        self.shared_cache_alias = shared_cache_alias
+        self.local_responses = OrderedDict()
+        self.lock = threading.Lock()
+        self.jobs_version = None
+        self.jobs_version_check_ts = 0
+        self.stats = defaultdict(int)
+
+    @property
+    def shared_cache(self):
+        return caches[self.shared_cache_alias]
+
+    def get_jobs_version(self):
+        if self.jobs_version is None or (time.monotonic() - self.jobs_version_check_ts) > self.JOBS_VERSION_TTL_SECONDS:
+            try:
+                self.jobs_version = self.shared_cache.get_or_set(JOBS_VERSION_KEY, 1, timeout=None)
+            except Exception as e:
+                logger.warning(f'Unable to get jobs version from shared cache: {e}')
+                self.jobs_version = self.jobs_version or 1
+            self.jobs_version_check_ts = time.monotonic()
+        return self.jobs_version
+
+    def bump_jobs_version(self):
+        try:
+            try:
+                self.jobs_version = self.shared_cache.incr(JOBS_VERSION_KEY)
+            except ValueError:
+                # The key doesn't exist yet
+                self.shared_cache.set(JOBS_VERSION_KEY, 2, timeout=None)
+                self.jobs_version = 2
+        except Exception as e:
+            logger.warning(f'Unable to bump jobs version in shared cache: {e}')
+            self.jobs_version = (self.jobs_version or 1) + 1
+        self.jobs_version_check_ts = time.monotonic()
+        with self.lock:
+            self.local_responses.clear()
+
+    def get_cache_key(self, name, query_params):
+        # Normalize so the same query with params in a different order shares a cache entry
+        params = sorted((key, query_params.getlist(key)) for key in query_params.keys())
+        params_hash = hashlib.sha1(json.dumps(params).encode('utf-8')).hexdigest()
+        return f'response:{name}:{self.get_jobs_version()}:{params_hash}'
+
+    def get(self, cache_key):
+        with self.lock:
+            if (data := self.local_responses.get(cache_key)) is not None:
+                self.local_responses.move_to_end(cache_key)
+                self.stats['local_hits'] += 1
+                return data
+
+        try:
+            data = self.shared_cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f'Unable to get response from shared cache: {e}')
+            data = None
+        if data is None:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['shared_hits'] += 1
+        self.set_local(cache_key, data)
+        return data
+
+    def set_local(self, cache_key, data):
+        with self.lock:
+            self.local_responses[cache_key] = data
+            self.local_responses.move_to_end(cache_key)
+            while len(self.local_responses) > self.max_local_entries:
+                self.local_responses.popitem(last=False)
+
+    def set(self, cache_key, data):
+        self.set_local(cache_key, data)
+        try:
+            self.shared_cache.set(cache_key, data, timeout=self.SHARED_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f'Unable to save response to shared cache: {e}')
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        request_count = stats.get('local_hits', 0) + stats.get('shared_hits', 0) + stats.get('misses', 0)
+        return {
+            'local_hits': stats.get('local_hits', 0),
+            'shared_hits': stats.get('shared_hits', 0),
+            'misses': stats.get('misses', 0),
+            'hit_rate': ((request_count - stats.get('misses', 0)) / request_count) if request_count else None,
+            'local_entries': len(self.local_responses),
+            'jobs_version': self.jobs_version,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def bump_jobs_version():
+    response_cache.bump_jobs_version()
+
+
+def cache_public_response(name):
+    """Cache successful GET responses of an API view for anonymous users
+    Responses for logged in users can include user specific data (e.g. applications) so they are not cached
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.user and request.user.is_authenticated:
+                return view_method(view, request, *args, **kwargs)
+
+            cache_key = response_cache.get_cache_key(name, request.query_params)
+            if (data := response_cache.get(cache_key)) is not None:
+                return Response(status=status.HTTP_200_OK, data=data)
+
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response_cache.set(cache_key, response.data)
+            return response
+        return wrapper
+    return decorator
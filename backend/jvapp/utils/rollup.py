@@ -0,0 +1,159 @@
+import logging
+from collections import Counter
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError
+from django.db.models import Count, Min
+from django.db.models.functions import TruncHour
+from django.db.transaction import atomic
+from django.utils import timezone
+
+from jvapp.models.job_seeker import JobApplication
+from jvapp.models.tracking import ApplicationRollup, PageView, PageViewRollup
+
+logger = logging.getLogger(__name__)
+
+# Late data (e.g. edited applications or delayed page view batches) is corrected by re-counting this many hours
+CORRECTION_LOOKBACK_HOURS = 48
+REFRESH_CHUNK_DAYS = 7
+
+
+class RollupConfig:
+    """How raw rows are counted in a rollup table. Dimension fields have the same name on both models
+    """
+
+    def __init__(self, rollup_model, raw_model, dt_field, count_field, dimension_fields):
+        self.rollup_model = rollup_model
+        self.raw_model = raw_model
+        self.dt_field = dt_field
+        self.count_field = count_field
+        self.dimension_fields = dimension_fields
+
+    def get_key(self, bucket_dt, dimensions):
+        return ':'.join([bucket_dt.strftime('%Y%m%d%H'), *('' if val is None else str(val) for val in dimensions)])
+
+    def get_raw_dimensions(self, raw_object):
+        return tuple(getattr(raw_object, field) for field in self.dimension_fields)
+
+    def get_rollup(self, bucket_dt, dimensions, count):
+        return self.rollup_model(
+            rollup_key=self.get_key(bucket_dt, dimensions),
+            bucket_dt=bucket_dt,
+            **dict(zip(self.dimension_fields, dimensions)),
+            **{self.count_field: count}
+        )
+
+
+PAGE_VIEW_ROLLUP = RollupConfig(
+    PageViewRollup, PageView, 'access_dt', 'view_count',
+    ('employer_id', 'page_owner_id', 'social_link_id', 'platform_id', 'is_mobile', 'is_tablet')
+)
+APPLICATION_ROLLUP = RollupConfig(
+    ApplicationRollup, JobApplication, 'created_dt', 'application_count',
+    ('referrer_employer_id', 'referrer_user_id', 'social_link_id', 'platform_id')
+)
+
+
+def get_bucket_dt(dt):
+    return dt.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def add_rollup_counts(rollup_config, raw_objects):
+    """Increment the rollup counts for newly created raw rows
+    """
+    counts = Counter(
+        (get_bucket_dt(getattr(raw_object, rollup_config.dt_field)), rollup_config.get_raw_dimensions(raw_object))
+        for raw_object in raw_objects
+    )
+    if not counts:
+        return
+    new_rollups = {
+        rollup.rollup_key: rollup for rollup in
+        (rollup_config.get_rollup(bucket_dt, dimensions, count) for (bucket_dt, dimensions), count in counts.items())
+    }
+
+    # A concurrent writer can create the same new bucket. Retry once so the second attempt updates it instead
+    for attempt in range(2):
+        try:
+            with atomic():
+                existing_rollups = list(
+                    rollup_config.rollup_model.objects.select_for_update().filter(rollup_key__in=new_rollups.keys())
+                )
+                for rollup in existing_rollups:
+                    setattr(rollup, rollup_config.count_field, (
+                        getattr(rollup, rollup_config.count_field)
+                        + getattr(new_rollups[rollup.rollup_key], rollup_config.count_field)
+                    ))
+                rollup_config.rollup_model.objects.bulk_update(existing_rollups, [rollup_config.count_field])
+                existing_keys = {rollup.rollup_key for rollup in existing_rollups}
+                rollup_config.rollup_model.objects.bulk_create(
+                    [rollup for key, rollup in new_rollups.items() if key not in existing_keys]
+                )
+            return
+        except IntegrityError as e:
+            if attempt:
+                logger.error(f'Unable to update {rollup_config.rollup_model.__name__} counts: {e}')
+
+
+def add_page_view_rollups(page_views):
+    add_rollup_counts(PAGE_VIEW_ROLLUP, page_views)
+
+
+def add_application_rollups(applications):
+    add_rollup_counts(APPLICATION_ROLLUP, applications)
+
+
+def refresh_rollups(rollup_config, start_dt=None, end_dt=None):
+    """Re-count all rollup buckets in the date range from the raw rows
+    Used to backfill and to correct counts for rows that were edited or deleted after they were counted
+    :param start_dt: Defaults to the earliest raw row
+    :param end_dt: Defaults to now
+    """
+    start_dt = start_dt or rollup_config.raw_model.objects.aggregate(start_dt=Min(rollup_config.dt_field))['start_dt']
+    if not start_dt:
+        return
+    end_dt = end_dt or timezone.now()
+    # Buckets are re-counted whole so the range is expanded to hour boundaries
+    start_dt = get_bucket_dt(start_dt)
+    if (end_bucket_dt := get_bucket_dt(end_dt)) != end_dt:
+        end_dt = end_bucket_dt + timedelta(hours=1)
+    chunk_start_dt = start_dt
+    rollup_count = 0
+    while chunk_start_dt < end_dt:
+        chunk_end_dt = min(chunk_start_dt + timedelta(days=REFRESH_CHUNK_DAYS), end_dt)
+        with atomic():
+            rollup_config.rollup_model.objects.filter(
+                bucket_dt__gte=chunk_start_dt, bucket_dt__lt=chunk_end_dt
+            ).delete()
+            rollups = [
+                rollup_config.get_rollup(
+                    row['bucket_dt'], tuple(row[field] for field in rollup_config.dimension_fields), row['count']
+                )
+                for row in (
+                    rollup_config.raw_model.objects
+                    .filter(**{
+                        f'{rollup_config.dt_field}__gte': chunk_start_dt,
+                        f'{rollup_config.dt_field}__lt': chunk_end_dt
+                    })
+                    .annotate(bucket_dt=TruncHour(rollup_config.dt_field, tzinfo=dt_timezone.utc))
+                    .values('bucket_dt', *rollup_config.dimension_fields)
+                    .annotate(count=Count('id'))
+                )
+            ]
+            rollup_config.rollup_model.objects.bulk_create(rollups)
+        rollup_count += len(rollups)
+        chunk_start_dt = chunk_end_dt
+    logger.info(
+        f'Refreshed {rollup_count} {rollup_config.rollup_model.__name__} rows from {start_dt} to {end_dt}'
+    )
+
+
+def refresh_all_rollups(start_dt=None, end_dt=None):
+    refresh_rollups(PAGE_VIEW_ROLLUP, start_dt, end_dt)
+    refresh_rollups(APPLICATION_ROLLUP, start_dt, end_dt)
+
+
+def refresh_recent_rollups(lookback_hours=CORRECTION_LOOKBACK_HOURS):
+    # The current hour is still receiving increments from the ingestion path so it isn't re-counted
+    end_dt = get_bucket_dt(timezone.now())
+    refresh_all_rollups(end_dt - timedelta(hours=lookback_hours), end_dt)
@@ -1,9 +1,20 @@
+import hashlib
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 from html_sanitizer import Sanitizer
 from html_sanitizer.sanitizer import bold_span_to_strong, italic_span_to_em, tag_replacer, target_blank_noopener
 
-__all__ = ('sanitize_html',)
+__all__ = ('get_sanitize_key', 'sanitize_html', 'sanitize_html_many')
+
+MAX_CACHED_HTML = 5000
+# Below this many uncached texts, starting worker processes costs more than it saves
+PROCESS_POOL_MIN_TEXTS = 200
 
 text_align_class_map = {
     'left': 'text-left',
@@ -140,8 +151,106 @@ default_sanitizer = get_sanitizer(
 )
 
 
-def sanitize_html(html_text, is_email=False, sanitizer=default_sanitizer):
+class SanitizedHtmlCache:
+    """LRU of sanitized HTML keyed by a hash of the input so large inputs aren't kept in memory
+    The same description is often sanitized several times (e.g. when parsing compensation and again
+    when saving the job) and again on every sync even when it hasn't changed
+    """
+    
+    def __init__(self, max_entries=MAX_CACHED_HTML):
+        self.max_entries = max_entries
+        self.sanitized_html = OrderedDict()
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def get_key(html_text, is_email):
+        return hashlib.sha1(f'{int(is_email)}:{html_text}'.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        with self.lock:
+            if (sanitized_html := self.sanitized_html.get(key)) is not None:
+                self.sanitized_html.move_to_end(key)
+            return sanitized_html
+    
+    def set(self, key, sanitized_html):
+        with self.lock:
+            self.sanitized_html[key] = sanitized_html
+            self.sanitized_html.move_to_end(key)
+            while len(self.sanitized_html) > self.max_entries:
+                self.sanitized_html.popitem(last=False)
+    
+    def clear(self):
+        with self.lock:
+            self.sanitized_html.clear()
+
+
+sanitized_html_cache = SanitizedHtmlCache()
+
+
+def _sanitize_html(html_text, is_email=False, sanitizer=default_sanitizer):
     if is_email:
         # New lines are not honored in html interpreters like email
         html_text = html_text.replace('\n', '<br/>')
     return sanitizer.sanitize(html_text)
+
+
+def get_sanitize_key(html_text, is_email=False):
+    """Hash of the unsanitized text. Persist it with the sanitized text so a later run can skip unchanged text
+    """
+    return sanitized_html_cache.get_key(html_text, is_email)
+
+
+def sanitize_html(html_text, is_email=False, sanitizer=default_sanitizer):
+    # Custom sanitizers aren't part of the cache key so only the default sanitizer is cached
+    if not html_text or sanitizer is not default_sanitizer:
+        return _sanitize_html(html_text, is_email=is_email, sanitizer=sanitizer)
+    
+    cache_key = sanitized_html_cache.get_key(html_text, is_email)
+    if (sanitized_html := sanitized_html_cache.get(cache_key)) is None:
+        sanitized_html = _sanitize_html(html_text, is_email=is_email)
+        sanitized_html_cache.set(cache_key, sanitized_html)
+    return sanitized_html
+
+
+def sanitize_html_many(html_texts, is_email=False, max_workers=None, known_sanitized_texts=None):
+    """Sanitize many HTML texts with the default sanitizer
+    Texts that are cached or known are skipped and large batches of the rest are split across processes
+    :param known_sanitized_texts: Previously sanitized texts keyed by get_sanitize_key of the unsanitized text.
+    Typically loaded from the database so texts that haven't changed since the last run aren't sanitized again
+    :return: The sanitized texts in the same order. Empty texts are returned as is
+    """
+    known_sanitized_texts = known_sanitized_texts or {}
+    cache_keys = [get_sanitize_key(html_text, is_email) if html_text else None for html_text in html_texts]
+    sanitized_texts = {}
+    uncached_texts = {}
+    for html_text, cache_key in zip(html_texts, cache_keys):
+        if not cache_key or cache_key in sanitized_texts or cache_key in uncached_texts:
+            continue
+        if (sanitized_html := known_sanitized_texts.get(cache_key)) is not None:
+            sanitized_html_cache.set(cache_key, sanitized_html)
+            sanitized_texts[cache_key] = sanitized_html
+        elif (sanitized_html := sanitized_html_cache.get(cache_key)) is not None:
+            sanitized_texts[cache_key] = sanitized_html
+        else:
+            uncached_texts[cache_key] = html_text
+    
+    # Daemon processes (e.g. Celery workers) can't start child processes
+    if len(uncached_texts) >= PROCESS_POOL_MIN_TEXTS and not multiprocessing.current_process().daemon:
+        max_workers = max_workers or os.cpu_count() or 1
+        # Forking a threaded web or cron process can deadlock the children on locks held by other threads
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            new_sanitized_texts = list(executor.map(
+                _sanitize_html, uncached_texts.values(), repeat(is_email),
+                chunksize=max(1, len(uncached_texts) // (max_workers * 4))
+            ))
+    else:
+        new_sanitized_texts = [_sanitize_html(html_text, is_email=is_email) for html_text in uncached_texts.values()]
+    
+    for cache_key, sanitized_html in zip(uncached_texts.keys(), new_sanitized_texts):
+        sanitized_html_cache.set(cache_key, sanitized_html)
+        sanitized_texts[cache_key] = sanitized_html
+    
+    return [
+        sanitized_texts[cache_key] if cache_key else html_text
+        for html_text, cache_key in zip(html_texts, cache_keys)
+    ]
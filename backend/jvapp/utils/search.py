@@ -0,0 +1,91 @@
+import re
+from functools import reduce
+
+from django.db.models import FloatField, Func, Q
+from django.db.models.lookups import GreaterThan
+
+# Columns with a FULLTEXT index. MATCH requires the exact column list of an index
+JOB_SEARCH_FIELDS = ('job_title', 'employer_name', 'job_department', 'job_description')
+JOB_TITLE_FIELDS = ('job_title',)
+APPLICANT_NAME_FIELDS = ('first_name', 'last_name')
+APPLICANT_EMAIL_FIELDS = ('email',)
+TAXONOMY_NAME_FIELDS = ('name',)
+
+# MySQL defaults for innodb_ft_min_token_size and the InnoDB stopword list
+FULLTEXT_MIN_TOKEN_SIZE = 3
+FULLTEXT_STOPWORDS = {
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how', 'i', 'in', 'is',
+    'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'who', 'will',
+    'with', 'und', 'www'
+}
+
+
+class SearchMatch(Func):
+    """MySQL full text relevance score for a boolean mode query
+    """
+    output_field = FloatField()
+    template = 'MATCH (%(expressions)s) AGAINST (%%s IN BOOLEAN MODE)'
+
+    def __init__(self, *expressions, query):
+        self.query = query
+        super().__init__(*expressions)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, (*params, self.query)
+
+
+def get_search_tokens(search_text):
+    return re.findall(r'\w+', (search_text or '').lower())
+
+
+def get_fulltext_tokens(search_text):
+    """Tokens that can be matched by a FULLTEXT index. Stopwords and short tokens are never indexed
+    so requiring them would make every query that includes one return nothing
+    """
+    return [
+        token for token in get_search_tokens(search_text)
+        if len(token) >= FULLTEXT_MIN_TOKEN_SIZE and token not in FULLTEXT_STOPWORDS
+    ]
+
+
+def get_boolean_query(search_text):
+    """Every indexed word is required and the last characters of each word can be anything (prefix matching)
+    Special characters are dropped so user input can't change the query syntax
+    """
+    return ' '.join(f'+{token}*' for token in get_fulltext_tokens(search_text))
+
+
+def get_search_rank(fields, search_text, field_prefix=''):
+    return SearchMatch(*[f'{field_prefix}{field}' for field in fields], query=get_boolean_query(search_text))
+
+
+def get_substring_filter(fields, search_text, field_prefix=''):
+    """Matches rows where any of the fields contain the search text"""
+    return reduce(
+        lambda search_filter, field: search_filter | Q(**{f'{field_prefix}{field}__icontains': search_text}),
+        fields, Q()
+    )
+
+
+def get_search_filter(fields, search_text, field_prefix=''):
+    """Full text filter which matches rows containing every word (or word prefix) in the search text
+    Short words that aren't indexed (e.g. "qa") must be contained in one of the fields. Stopwords are ignored
+    :param fields: Columns of a FULLTEXT index
+    :param field_prefix: Relation path to the model with the index (e.g. "employer_job__")
+    """
+    fulltext_tokens = get_fulltext_tokens(search_text)
+    short_tokens = [
+        token for token in get_search_tokens(search_text)
+        if len(token) < FULLTEXT_MIN_TOKEN_SIZE and token not in FULLTEXT_STOPWORDS
+    ]
+    if not (fulltext_tokens or short_tokens):
+        # Nothing to search on (e.g. only punctuation or stopwords). Fall back to a substring match
+        return get_substring_filter(fields, search_text, field_prefix=field_prefix)
+    
+    search_filter = Q()
+    if fulltext_tokens:
+        search_filter &= Q(GreaterThan(get_search_rank(fields, search_text, field_prefix=field_prefix), 0))
+    for token in short_tokens:
+        search_filter &= get_substring_filter(fields, token, field_prefix=field_prefix)
+    return search_filter
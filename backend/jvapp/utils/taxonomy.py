@@ -1,6 +1,7 @@
 # https://docs.google.com/spreadsheets/d/1G5-9y6bp0QHjZmxIWmGtjI6F_AbuqfHmYYFmQC6p_UU/edit#gid=0
 import logging
 import re
+import time
 from collections import namedtuple
 
 from django.db.models import Count, Prefetch, Q, Subquery
@@ -285,6 +286,8 @@ def update_taxonomies(*args, **kwargs):
     for profession_key, profession in parent_professions.items():
         if profession_key not in used_profession_keys:
             profession.delete()
+    
+    job_title_classifier.load_taxonomies()
 
 
 def get_or_create_taxonomy(tax_name, tax_type):
@@ -314,13 +317,20 @@ def run_job_title_standardization(job_filter=None, is_non_standardized_only=True
     job_taxes_to_save = []
     if limit:
         jobs = jobs[:limit]
-    for idx, job in enumerate(jobs):
-        standardized_job_tax = get_standardized_job_taxonomy(job['job_title'], is_test=is_test)
-        if not standardized_job_tax:
+    jobs = list(jobs)
+    if is_test:
+        taxonomy_ids = []
+        for job in jobs:
+            taxonomy = get_standardized_job_taxonomy(job['job_title'], is_test=True)
+            taxonomy_ids.append(taxonomy.id if taxonomy else None)
+    else:
+        taxonomy_ids = job_title_classifier.classify([job['job_title'] for job in jobs])
+    for idx, (job, taxonomy_id) in enumerate(zip(jobs, taxonomy_ids)):
+        if not taxonomy_id:
             # logger.info(f'Could not find standardized title for {job.job_title}')
             continue
         job_taxes_to_save.append(JobTaxonomy(
-            taxonomy=standardized_job_tax,
+            taxonomy_id=taxonomy_id,
             job_id=job['id'],
             created_dt=timezone.now(),
             modified_dt=timezone.now()
@@ -363,11 +373,13 @@ class TaxonomyTest:
         self.test_pattern = test_pattern
         self.confidence_weights = confidence_weights
         self.test_negate_pattern = test_negate_pattern
+        self.test_re = re.compile(test_pattern, re.IGNORECASE)
+        self.test_negate_re = re.compile(test_negate_pattern, re.IGNORECASE) if test_negate_pattern else None
     
     def is_match(self, job_title):
-        is_match = bool(re.match(self.test_pattern, job_title, re.IGNORECASE))
-        if self.test_negate_pattern:
-            is_match = is_match and not bool(re.match(self.test_negate_pattern, job_title, re.IGNORECASE))
+        is_match = bool(self.test_re.match(job_title))
+        if self.test_negate_re:
+            is_match = is_match and not bool(self.test_negate_re.match(job_title))
         return is_match
     
     def get_updated_weights(self, job_title, current_weights):
@@ -978,11 +990,18 @@ JOB_TAXONOMY_TESTS = [
 ]
 
 
-def get_standardized_job_taxonomy(job_title: str, is_test=False):
+def get_profession_weights(job_title: str):
     profession_weights = {}
     for tax_test in JOB_TAXONOMY_TESTS:
         profession_weights = tax_test.get_updated_weights(job_title, profession_weights)
+    return profession_weights
+
+
+def get_standardized_job_taxonomy(job_title: str, is_test=False):
+    if not is_test:
+        return job_title_classifier.get_taxonomy(job_title)
     
+    profession_weights = get_profession_weights(job_title)
     if not profession_weights:
         if is_test:
             print(f'Could not find a profession for {job_title}')
@@ -998,3 +1017,82 @@ def get_standardized_job_taxonomy(job_title: str, is_test=False):
     best_profession = ordered_profession_weights[0]
     raw_profession = JOB_PROFESSION_KEY_MAP[best_profession['key']]
     return get_or_create_job_title_tax(raw_profession.name)
+
+
+class JobTitleClassifier:
+    """Classifies job titles into a profession taxonomy
+    Taxonomy tests are compiled once, results are memoized by normalized job title, and profession
+    taxonomies are loaded in one query so classifying many titles doesn't require a query per title
+    """
+    MAX_CACHE_SIZE = 100000
+    # Taxonomies can be updated by another process so they are reloaded after this long
+    TAXONOMY_TTL_SECONDS = 300
+    
+    def __init__(self, max_cache_size=MAX_CACHE_SIZE):
+        self.max_cache_size = max_cache_size
+        self.profession_keys = {}
+        self.taxonomies_by_name = None
+        self.taxonomies_load_time = None
+    
+    @staticmethod
+    def normalize_job_title(job_title):
+        # All taxonomy tests are case insensitive
+        return (job_title or '').lower()
+    
+    def get_profession_key(self, job_title):
+        normalized_title = self.normalize_job_title(job_title)
+        try:
+            return self.profession_keys[normalized_title]
+        except KeyError:
+            pass
+        
+        profession_key = None
+        if profession_weights := get_profession_weights(normalized_title):
+            # Ties go to the first profession to be weighted, same as a stable sort
+            profession_key = max(profession_weights.items(), key=lambda x: x[1])[0]
+        
+        if len(self.profession_keys) >= self.max_cache_size:
+            self.profession_keys.clear()
+        self.profession_keys[normalized_title] = profession_key
+        return profession_key
+    
+    def load_taxonomies(self):
+        self.taxonomies_by_name = {
+            tax.name: tax for tax in Taxonomy.objects.filter(tax_type=Taxonomy.TAX_TYPE_PROFESSION)
+        }
+        self.taxonomies_load_time = time.monotonic()
+    
+    def is_taxonomies_stale(self):
+        return (
+            self.taxonomies_by_name is None
+            or time.monotonic() - self.taxonomies_load_time > self.TAXONOMY_TTL_SECONDS
+        )
+    
+    def get_taxonomy_by_key(self, profession_key):
+        if not profession_key:
+            return None
+        if self.is_taxonomies_stale():
+            self.load_taxonomies()
+        tax_name = JOB_PROFESSION_KEY_MAP[profession_key].name
+        if not (taxonomy := self.taxonomies_by_name.get(tax_name)):
+            taxonomy = get_or_create_job_title_tax(tax_name)
+            self.taxonomies_by_name[tax_name] = taxonomy
+        return taxonomy
+    
+    def get_taxonomy(self, job_title):
+        return self.get_taxonomy_by_key(self.get_profession_key(job_title))
+    
+    def classify(self, job_titles):
+        """Classify many job titles
+        :return: A list of profession taxonomy ids (or None if there is no match) in the same order as job_titles
+        """
+        # Taxonomy ids are saved as foreign keys so each batch starts with the current taxonomies
+        self.load_taxonomies()
+        taxonomy_ids = []
+        for job_title in job_titles:
+            taxonomy = self.get_taxonomy(job_title)
+            taxonomy_ids.append(taxonomy.id if taxonomy else None)
+        return taxonomy_ids
+
+
+job_title_classifier = JobTitleClassifier()
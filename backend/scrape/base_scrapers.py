@@ -11,8 +11,7 @@ from json import JSONDecodeError
 from math import ceil
 from urllib.parse import unquote
 
-import requests
-from aiohttp import ClientSession, ServerDisconnectedError
+from aiohttp import ClientSession, ServerDisconnectedError, TCPConnector, TraceConfig
 from django.conf import settings
 from django.utils import timezone
 from parsel import Selector
@@ -92,7 +91,10 @@ class Scraper:
     USE_HEADERS = True
     USE_ADVANCED_HEADERS = False
     MAX_CONCURRENT_PAGES = 10
+    IS_SHARE_CLIENT_SESSION = True  # Reuse connections (keep-alive) across requests for the scraper run
+    MAX_CONNECTIONS_PER_HOST = 10
     IS_JS_REQUIRED = False
+    IS_JS_START_PAGE = False  # The start page needs a browser, but job pages don't
     IS_API = False
     DEFAULT_JOB_DEPARTMENT = 'General'
     DEFAULT_EMPLOYMENT_TYPE = 'Full Time'
@@ -105,7 +107,7 @@ class Scraper:
     employer_name = None
     job_item_page_wait_sel = None
     
-    def __init__(self, playwright, browser, skip_urls):
+    def __init__(self, playwright, browser, skip_urls, page_cache=None):
         self.job_page_count = 0
         self.skipped_urls = []
         self.job_items = []
@@ -114,9 +116,16 @@ class Scraper:
         self.browser = browser
         self.base_url = get_base_url(self.get_start_url())
         self.skip_urls = [] if settings.IS_LOCAL else skip_urls
+        self.page_cache = page_cache
+        self.client_session = None
+        self.connection_stats = {'connections_created': 0, 'connections_reused': 0}
         self.job_processors = [asyncio.create_task(self.get_job_item_from_url()) for _ in
                                range(self.MAX_CONCURRENT_PAGES)]
         
+    @classmethod
+    def is_browser_required(cls):
+        return cls.IS_JS_REQUIRED or cls.IS_JS_START_PAGE
+        
     def get_client_session(self):
         headers = {
             'User-Agent': get_random_user_agent(),
@@ -129,7 +138,30 @@ class Scraper:
         if self.USE_ADVANCED_HEADERS:
             headers = {**headers, **ADVANCED_REQUEST_HEADERS}
             
-        return ClientSession(headers=headers)
+        return ClientSession(
+            headers=headers,
+            connector=TCPConnector(limit_per_host=self.MAX_CONNECTIONS_PER_HOST),
+            trace_configs=[self.get_connection_trace_config()]
+        )
+    
+    def get_connection_trace_config(self):
+        """Count new connections (each requires a TCP + TLS handshake) vs reused keep-alive connections
+        """
+        async def on_connection_create_end(session, trace_config_ctx, params):
+            self.connection_stats['connections_created'] += 1
+        
+        async def on_connection_reuseconn(session, trace_config_ctx, params):
+            self.connection_stats['connections_reused'] += 1
+        
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+    
+    def get_shared_client_session(self):
+        if (not self.client_session) or self.client_session.closed:
+            self.client_session = self.get_client_session()
+        return self.client_session
     
     async def update_browser_context(self):
         await self.browser.set_extra_http_headers({
@@ -138,6 +170,8 @@ class Scraper:
         })
     
     async def get_new_page(self):
+        if not self.browser:
+            raise ValueError(f'{self.__class__.__name__} has no browser. Set IS_JS_REQUIRED or IS_JS_START_PAGE')
         page = await self.browser.new_page()
         page.on('dialog', lambda dialog: dialog.accept())
         return page
@@ -180,7 +214,8 @@ class Scraper:
         error = None
         
         logger.info(f'Attempting to visit: "{url}"')
-        logger.info(f'Number of open pages: {len(self.browser.pages)}')
+        if self.browser:
+            logger.info(f'Number of open pages: {len(self.browser.pages)}')
         page = None
         e = None
         error_pages = []
@@ -239,29 +274,60 @@ class Scraper:
         """
         while True:
             url, meta_data = await self.queue.get()
-            current_page = self.job_page_count = self.job_page_count + 1
-            logger.info(f'Fetching new job page ({current_page}): {url}')
-            if self.IS_API:
-                page_html = None
-            elif self.IS_JS_REQUIRED:
-                page = await self.visit_page_with_retry(url)
-                if self.job_item_page_wait_sel:
-                    page = await self.wait_for_el(page, self.job_item_page_wait_sel, max_retries=2)
-                new_url = await self.do_job_page_js(page)
-                if new_url:
-                    url = new_url
-                    page_html = await self.get_html_from_url_with_retry(url)
-                else:
-                    page_html = await self.get_page_html(page)
-                await page.close()
-            else:
-                page_html = await self.get_html_from_url_with_retry(url)
-            meta_data = meta_data or {}
-            job_item = self.get_job_data_from_html(page_html, job_url=url, **meta_data)
-            if job_item:
-                self.job_items.append(job_item)
-            logger.info(f'Job page scraped ({current_page}) -- {(job_item and job_item.job_title) or "no job found"}')
+            await self.process_job_url(url, meta_data or {})
             self.queue.task_done()
+    
+    async def process_job_url(self, url, meta_data):
+        current_page = self.job_page_count = self.job_page_count + 1
+        logger.info(f'Fetching new job page ({current_page}): {url}')
+        cache_content = None
+        cache_headers = {}
+        if self.IS_API:
+            page_html = None
+        elif self.IS_JS_REQUIRED:
+            page = await self.visit_page_with_retry(url)
+            if self.job_item_page_wait_sel:
+                page = await self.wait_for_el(page, self.job_item_page_wait_sel, max_retries=2)
+            new_url = await self.do_job_page_js(page)
+            if new_url:
+                url = new_url
+                page_html = await self.get_html_from_url_with_retry(url)
+            else:
+                page_html = await self.get_page_html(page)
+            await page.close()
+        else:
+            page_text, cache_headers = await self.get_job_page_with_retry(url)
+            if page_text is None:
+                self.skip_unchanged_job_url(url)
+                return
+            page_html = Selector(text=page_text)
+            cache_content = page_text
+        detail_data = await self.get_job_detail_data(**meta_data)
+        if detail_data is not None:
+            meta_data = {**meta_data, 'detail_data': detail_data}
+        if self.IS_API:
+            cache_content = json.dumps(meta_data, sort_keys=True, default=str)
+        
+        content_hash = None
+        if self.page_cache and cache_content is not None:
+            content_hash = self.page_cache.get_content_hash(cache_content)
+            if self.page_cache.is_unchanged(url, content_hash):
+                self.skip_unchanged_job_url(url)
+                return
+        
+        job_item = self.get_job_data_from_html(page_html, job_url=url, **meta_data)
+        if job_item:
+            self.job_items.append(job_item)
+            if content_hash:
+                self.page_cache.add(
+                    url, content_hash, etag=cache_headers.get('ETag'), last_modified=cache_headers.get('Last-Modified')
+                )
+        logger.info(f'Job page scraped ({current_page}) -- {(job_item and job_item.job_title) or "no job found"}')
+    
+    def skip_unchanged_job_url(self, url):
+        # Skipped URLs are treated as still open when the job data is finalized
+        logger.info(f'URL {url} is unchanged since it was last scraped; skipping')
+        self.skipped_urls.append(url)
             
     async def get_html_from_url_with_retry(self, url):
         try:
@@ -271,17 +337,61 @@ class Scraper:
             resp = await self.get_html_from_url(url)
             return resp
     
+    async def get_job_page_with_retry(self, url):
+        try:
+            return await self.get_job_page_from_url(url)
+        except ServerDisconnectedError:
+            return await self.get_job_page_from_url(url)
+    
+    async def get_job_page_from_url(self, url):
+        """Return the page text and response headers. If the page is cached, a conditional request
+        is made and the page text will be None if the server responds with 304 Not Modified
+        """
+        request_headers = self.page_cache.get_conditional_headers(url) if self.page_cache else {}
+        if self.IS_SHARE_CLIENT_SESSION:
+            return await self.get_page_from_client(self.get_shared_client_session(), url, headers=request_headers)
+        
+        async with self.get_client_session() as client:
+            return await self.get_page_from_client(client, url, headers=request_headers)
+    
+    async def get_page_from_client(self, client, url, headers=None):
+        async with client.get(url, headers=headers) as resp:
+            if resp.status == 304 and self.page_cache:
+                self.page_cache.add_not_modified(url)
+                return None, resp.headers
+            if not resp.ok:
+                logger.warning(f'Failed to load page: {url}\n({resp.status}) {resp.reason}')
+            return await resp.text(), resp.headers
+    
     async def get_html_from_url(self, url):
         """Return an HTML selector. If no JavaScript interaction is needed, this method should
         be used since it is more lightweight than get_page_html
         """
+        if self.IS_SHARE_CLIENT_SESSION:
+            return await self.get_html_from_client(self.get_shared_client_session(), url)
+        
         async with self.get_client_session() as client:
-            async with client.get(url) as resp:
-                if not resp.ok:
-                    logger.warning(f'Failed to load page: {url}\n({resp.status}) {resp.reason}')
-                # resp.raise_for_status()
-                html = await resp.text()
-                return Selector(text=html)
+            return await self.get_html_from_client(client, url)
+    
+    async def get_html_from_client(self, client, url):
+        html, _ = await self.get_page_from_client(client, url)
+        return Selector(text=html)
+    
+    async def get_json(self, url, method='GET', **kwargs):
+        """Make a non-blocking API request using the scraper's shared client session.
+        kwargs are passed to aiohttp (e.g. params, json, data, headers)
+        """
+        async with self.get_shared_client_session().request(method, url, **kwargs) as resp:
+            if not resp.ok:
+                logger.warning(f'Failed API request: {url}\n({resp.status}) {resp.reason}')
+            return await resp.json(content_type=None)
+    
+    async def get_job_detail_data(self, **meta_data):
+        """Override to fetch job data from an API before the job is parsed. This runs inside
+        the job page workers so that detail requests for multiple jobs are made concurrently.
+        A non-None result is passed to get_job_data_from_html as `detail_data`
+        """
+        return None
     
     async def wait_for_el(self, page, selector, max_retries=0, state='visible', timeout=30000):
         retries = 0
@@ -318,20 +428,34 @@ class Scraper:
         logger.info('Cancelling job processors')
         for job_processor in self.job_processors:
             job_processor.cancel()
+        if self.client_session and not self.client_session.closed:
+            await self.client_session.close()
+        logger.info(
+            f'HTTP connections for {self.employer_name}: {self.connection_stats["connections_created"]} created, '
+            f'{self.connection_stats["connections_reused"]} reused'
+        )
+        if self.page_cache:
+            logger.info(f'Page cache for {self.employer_name}: {self.page_cache.get_stats_text()}')
     
     async def close(self, page=None):
-        if not self.queue.empty():
-            logger.info(f'Waiting for job queue to finish - Currently {self.queue.qsize()}')
-            # wait for either `queue.join()` to complete or a consumer to raise
-            done, _ = await asyncio.wait([self.queue.join(), *self.job_processors],
+        # Always wait for the queue to be joined. Even when the queue is empty, job processors
+        # may still be working on jobs they already took from it (e.g. waiting on API requests)
+        logger.info(f'Waiting for job queue to finish - Currently {self.queue.qsize()}')
+        # wait for either `queue.join()` to complete or a consumer to raise
+        queue_join = asyncio.ensure_future(self.queue.join())
+        try:
+            done, _ = await asyncio.wait([queue_join, *self.job_processors],
                                          return_when=asyncio.FIRST_COMPLETED)
-            # The set of tasks that are 'done' but have not been removed from
-            # `self.job_processors` are exceptions. There is only one (since we
-            # used FIRST_COMPLETED), so we `await` it to propagate the exception.
-            consumers_raised = set(done) & set(self.job_processors)
-            if consumers_raised:
-                logger.info(f'Found {len(consumers_raised)} consumers that raised exceptions')
-                await consumers_raised.pop()  # propagate the exception
+        finally:
+            if not queue_join.done():
+                queue_join.cancel()
+        # The set of tasks that are 'done' but have not been removed from
+        # `self.job_processors` are exceptions. There is only one (since we
+        # used FIRST_COMPLETED), so we `await` it to propagate the exception.
+        consumers_raised = set(done) & set(self.job_processors)
+        if consumers_raised:
+            logger.info(f'Found {len(consumers_raised)} consumers that raised exceptions')
+            await consumers_raised.pop()  # propagate the exception
         await self.close_connections(page=page)
     
     def get_absolute_url(self, url):
@@ -449,7 +573,7 @@ class BambooHrScraper(Scraper):
     
     async def scrape_jobs(self):
         await self.update_browser_context()
-        jobs = self.get_jobs()
+        jobs = await self.get_jobs()
         for job in jobs:
             await self.add_job_links_to_queue(self.get_job_url(job), meta_data={'job_id': job['id']})
         await self.close()
@@ -457,18 +581,19 @@ class BambooHrScraper(Scraper):
     def get_job_url(self, job):
         return f'https://{self.EMPLOYER_KEY}.bamboohr.com/careers/{job["id"]}'
     
-    def get_job_data(self, job_id):
-        job_resp = requests.get(f'https://{self.EMPLOYER_KEY}.bamboohr.com/careers/{job_id}/detail')
-        job = json.loads(job_resp.content)
+    async def get_job_data(self, job_id):
+        job = await self.get_json(f'https://{self.EMPLOYER_KEY}.bamboohr.com/careers/{job_id}/detail')
         return job['result']['jobOpening']
     
-    def get_jobs(self):
-        jobs_resp = requests.get(f'https://{self.EMPLOYER_KEY}.bamboohr.com/careers/list')
-        jobs = json.loads(jobs_resp.content)
+    async def get_jobs(self):
+        jobs = await self.get_json(f'https://{self.EMPLOYER_KEY}.bamboohr.com/careers/list')
         return jobs['result']
     
-    def get_job_data_from_html(self, html, job_url=None, job_id=None, **kwargs):
-        job_data = self.get_job_data(job_id)
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_job_data(job_id)
+    
+    def get_job_data_from_html(self, html, job_url=None, job_id=None, detail_data=None, **kwargs):
+        job_data = detail_data
         standard_job_item = self.get_google_standard_job_item(html)
         job_description = job_data['description']
         description_compensation_data = parse_compensation_text(job_description)
@@ -667,30 +792,31 @@ class GreenhouseApiScraper(GreenhouseScraper):
     IS_API = True
     
     async def scrape_jobs(self):
-        jobs_list = self.get_jobs()
+        jobs_list = await self.get_jobs()
         
         for job in jobs_list:
             await self.add_job_links_to_queue(job['absolute_url'], meta_data={'job_id': job['id']})
         
         await self.close()
     
-    def get_jobs(self):
-        jobs_resp = requests.get(
+    async def get_jobs(self):
+        jobs_data = await self.get_json(
             f'https://api.greenhouse.io/v1/boards/{self.EMPLOYER_KEY}/jobs',
-            params={'content': True}
+            params={'content': 'true'}
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['jobs']
     
-    def get_job_data(self, job_id):
-        job_resp = requests.get(
+    async def get_job_data(self, job_id):
+        return await self.get_json(
             f'https://boards-api.greenhouse.io/v1/boards/{self.EMPLOYER_KEY}/jobs/{job_id}',
-            params={'pay_transparency': True}
+            params={'pay_transparency': 'true'}
         )
-        return json.loads(job_resp.content)
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None):
-        job_data = self.get_job_data(job_id)
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_job_data(job_id)
+    
+    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, detail_data=None):
+        job_data = detail_data
         pay_ranges = [
             {
                 'salary_floor': coerce_int(range['min_cents']) / 60,
@@ -969,7 +1095,7 @@ class WorkdayApiScraper(Scraper):
         total_jobs = None
         start_job_idx = 0
         while (not has_started) or (start_job_idx < total_jobs):
-            jobs_list, total_jobs = self.get_jobs(start_job_idx)
+            jobs_list, total_jobs = await self.get_jobs(start_job_idx)
             for job in jobs_list:
                 await self.add_job_links_to_queue(self.get_job_link(job['externalPath']), meta_data={'external_path': job['externalPath']})
             start_job_idx += self.JOBS_PER_PAGE
@@ -977,9 +1103,10 @@ class WorkdayApiScraper(Scraper):
         
         await self.close()
     
-    def get_jobs(self, start_job_idx):
-        jobs_resp = requests.post(
+    async def get_jobs(self, start_job_idx):
+        jobs_data = await self.get_json(
             f'{self.JOBS_BASE_API_URL}/jobs',
+            method='POST',
             json={
                 'appliedFacets': {},
                 'limit': self.JOBS_PER_PAGE,
@@ -987,21 +1114,25 @@ class WorkdayApiScraper(Scraper):
                 'searchText': ''
             }
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['jobPostings'], jobs_data['total']
     
     def get_job_link(self, external_path):
         return f'{self.get_start_url()}{external_path}'
     
-    def get_job_data(self, external_path):
-        job_resp = requests.get(
+    async def get_job_data(self, external_path):
+        job_data = await self.get_json(
             f'{self.JOBS_BASE_API_URL}{external_path}',
-            params={'pay_transparency': True}
+            params={'pay_transparency': 'true'}
         )
-        return json.loads(job_resp.content)['jobPostingInfo']
+        return job_data['jobPostingInfo']
+    
+    async def get_job_detail_data(self, external_path=None, **kwargs):
+        return await self.get_job_data(external_path)
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, external_path=None):
-        job_data = self.get_job_data(external_path)
+    def get_job_data_from_html(
+            self, html, job_url=None, job_department=None, job_id=None, external_path=None, detail_data=None
+    ):
+        job_data = detail_data
         job_description = html_parser.unescape(job_data['jobDescription'])
         description_compensation_data = parse_compensation_text(job_description)
         
@@ -1150,7 +1281,7 @@ class WorkableScraper(Scraper):
         next_page_key = None
         jobs = []
         while has_more:
-            jobs_list, next_page_key = self.get_jobs(next_page_key=next_page_key)
+            jobs_list, next_page_key = await self.get_jobs(next_page_key=next_page_key)
             jobs += jobs_list
             has_more = bool(next_page_key)
         
@@ -1162,23 +1293,29 @@ class WorkableScraper(Scraper):
     def get_job_link(self, job_data):
         return f'https://apply.workable.com/{self.EMPLOYER_KEY}/j/{job_data["shortcode"]}/'
     
-    def get_jobs(self, next_page_key=None):
+    async def get_jobs(self, next_page_key=None):
         request_data = {**self.BASE_FILTER_DATA}
         if next_page_key:
             request_data['token'] = next_page_key
-        jobs_resp = requests.post(
+        jobs_data = await self.get_json(
             f'https://apply.workable.com/api/v3/accounts/{self.EMPLOYER_KEY}/jobs',
-            data=request_data
+            method='POST',
+            # Form encode lists as repeated keys (empty lists are omitted)
+            data=[
+                (key, val) for key, vals in request_data.items()
+                for val in (vals if isinstance(vals, list) else [vals])
+            ]
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['results'], jobs_data.get('nextPage')
     
-    def get_raw_job_data(self, job_shortcode):
-        job_resp = requests.get(f'https://apply.workable.com/api/v2/accounts/{self.EMPLOYER_KEY}/jobs/{job_shortcode}')
-        return json.loads(job_resp.content)
+    async def get_raw_job_data(self, job_shortcode):
+        return await self.get_json(f'https://apply.workable.com/api/v2/accounts/{self.EMPLOYER_KEY}/jobs/{job_shortcode}')
+    
+    async def get_job_detail_data(self, job_shortcode=None, **kwargs):
+        return await self.get_raw_job_data(job_shortcode)
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_shortcode=None):
-        job_data = self.get_raw_job_data(job_shortcode)
+    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_shortcode=None, detail_data=None):
+        job_data = detail_data
         job_description = job_data['description']
         job_requirements = job_data['requirements']
         job_benefits = job_data['benefits']
@@ -1290,8 +1427,8 @@ class AshbyHQApiScraper(Scraper):
     IS_API = True
     
     async def scrape_jobs(self):
-        jobs = self.get_jobs()
-        company_data = self.get_company_data()
+        jobs = await self.get_jobs()
+        company_data = await self.get_company_data()
         
         for job in jobs:
             await self.add_job_links_to_queue(
@@ -1303,50 +1440,55 @@ class AshbyHQApiScraper(Scraper):
     def get_job_link(self, job_data):
         return f'https://jobs.ashbyhq.com/{self.EMPLOYER_KEY}/{job_data["id"]}'
     
-    def get_jobs(self):
+    async def get_jobs(self):
         post_data = {
             'operationName': 'ApiJobBoardWithTeams',
             'query': 'query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {\n  jobBoard: jobBoardWithTeams(\n    organizationHostedJobsPageName: $organizationHostedJobsPageName\n  ) {\n    teams {\n      id\n      name\n      parentTeamId\n      __typename\n    }\n    jobPostings {\n      id\n      title\n      teamId\n      locationId\n      locationName\n      employmentType\n      secondaryLocations {\n        ...JobPostingSecondaryLocationParts\n        __typename\n      }\n      compensationTierSummary\n      __typename\n    }\n    __typename\n  }\n}\n\nfragment JobPostingSecondaryLocationParts on JobPostingSecondaryLocation {\n  locationId\n  locationName\n  __typename\n}',
             'variables': {'organizationHostedJobsPageName': self.EMPLOYER_KEY}
         }
         
-        resp = requests.post(
+        data = await self.get_json(
             f'https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobBoardWithTeams',
+            method='POST',
             json=post_data
         )
-        data = json.loads(resp.content)
         return data['data']['jobBoard']['jobPostings']
     
-    def get_company_data(self):
+    async def get_company_data(self):
         post_data = {
             'operationName': 'ApiOrganizationFromHostedJobsPageName',
             'query': 'query ApiOrganizationFromHostedJobsPageName($organizationHostedJobsPageName: String!) {\n  organization: organizationFromHostedJobsPageName(\n    organizationHostedJobsPageName: $organizationHostedJobsPageName\n  ) {\n    ...OrganizationParts\n    __typename\n  }\n}\n\nfragment OrganizationParts on Organization {\n  name\n  publicWebsite\n  customJobsPageUrl\n  allowJobPostIndexing\n  theme {\n    colors\n    showJobFilters\n    showTeams\n    showAutofillApplicationsBox\n    logoWordmarkImageUrl\n    logoSquareImageUrl\n    applicationSubmittedSuccessMessage\n    jobBoardTopDescriptionHtml\n    jobBoardBottomDescriptionHtml\n    __typename\n  }\n  appConfirmationTrackingPixelHtml\n  recruitingPrivacyPolicyUrl\n  activeFeatureFlags\n  timezone\n  __typename\n}',
             'variables': {'organizationHostedJobsPageName': self.EMPLOYER_KEY}
         }
         
-        resp = requests.post(
+        data = await self.get_json(
             f'https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiOrganizationFromHostedJobsPageName',
+            method='POST',
             json=post_data
         )
-        data = json.loads(resp.content)
         return data['data']['organization']
     
-    def get_raw_job_data(self, job_id):
+    async def get_raw_job_data(self, job_id):
         post_data = {
             'operationName': 'ApiJobPosting',
             'query': 'query ApiJobPosting($organizationHostedJobsPageName: String!, $jobPostingId: String!) {\n  jobPosting(\n    organizationHostedJobsPageName: $organizationHostedJobsPageName\n    jobPostingId: $jobPostingId\n  ) {\n    id\n    title\n    departmentName\n    locationName\n    employmentType\n    descriptionHtml\n    isListed\n    isConfidential\n    teamNames\n    applicationForm {\n      ...FormRenderParts\n      __typename\n    }\n    surveyForms {\n      ...FormRenderParts\n      __typename\n    }\n    secondaryLocationNames\n    compensationTierSummary\n    compensationTiers {\n      id\n      title\n      tierSummary\n      __typename\n    }\n    compensationTierGuideUrl\n    scrapeableCompensationSalarySummary\n    compensationPhilosophyHtml\n    applicationLimitCalloutHtml\n    __typename\n  }\n}\n\nfragment JSONBoxParts on JSONBox {\n  value\n  __typename\n}\n\nfragment FileParts on File {\n  id\n  filename\n  __typename\n}\n\nfragment FormFieldEntryParts on FormFieldEntry {\n  id\n  field\n  fieldValue {\n    ... on JSONBox {\n      ...JSONBoxParts\n      __typename\n    }\n    ... on File {\n      ...FileParts\n      __typename\n    }\n    ... on FileList {\n      files {\n        ...FileParts\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n  isRequired\n  descriptionHtml\n  isHidden\n  __typename\n}\n\nfragment FormRenderParts on FormRender {\n  id\n  formControls {\n    identifier\n    title\n    __typename\n  }\n  errorMessages\n  sections {\n    title\n    descriptionHtml\n    fieldEntries {\n      ...FormFieldEntryParts\n      __typename\n    }\n    isHidden\n    __typename\n  }\n  sourceFormDefinitionId\n  __typename\n}',
             'variables': {'organizationHostedJobsPageName': self.EMPLOYER_KEY, 'jobPostingId': str(job_id)}
         }
         
-        jobs_resp = requests.post(
+        data = await self.get_json(
             f'https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobPosting',
+            method='POST',
             json=post_data
         )
-        data = json.loads(jobs_resp.content)
         return data['data']['jobPosting']
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, website_url=None):
-        job_data = self.get_raw_job_data(job_id)
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_raw_job_data(job_id)
+    
+    def get_job_data_from_html(
+            self, html, job_url=None, job_department=None, job_id=None, website_url=None, detail_data=None
+    ):
+        job_data = detail_data
         job_description = job_data['descriptionHtml']
         description_compensation_data = parse_compensation_text(job_description)
         location = job_data['locationName']
@@ -1369,8 +1511,8 @@ class AshbyHQApiV2Scraper(Scraper):
     IS_API = True
     
     async def scrape_jobs(self):
-        jobs = self.get_jobs()
-        company_data = self.get_company_data()
+        jobs = await self.get_jobs()
+        company_data = await self.get_company_data()
         
         for job in jobs:
             await self.add_job_links_to_queue(
@@ -1379,26 +1521,25 @@ class AshbyHQApiV2Scraper(Scraper):
         
         await self.close()
     
-    def get_jobs(self):
-        resp = requests.get(
+    async def get_jobs(self):
+        data = await self.get_json(
             f'https://api.ashbyhq.com/posting-api/job-board/{self.EMPLOYER_KEY}',
-            params={'includeCompensation': True}
+            params={'includeCompensation': 'true'}
         )
-        data = json.loads(resp.content)
         return data['jobs']
     
-    def get_company_data(self):
+    async def get_company_data(self):
         post_data = {
             'operationName': 'ApiOrganizationFromHostedJobsPageName',
             'query': 'query ApiOrganizationFromHostedJobsPageName($organizationHostedJobsPageName: String!) {\n  organization: organizationFromHostedJobsPageName(\n    organizationHostedJobsPageName: $organizationHostedJobsPageName\n  ) {\n    ...OrganizationParts\n    __typename\n  }\n}\n\nfragment OrganizationParts on Organization {\n  name\n  publicWebsite\n  customJobsPageUrl\n  allowJobPostIndexing\n  theme {\n    colors\n    showJobFilters\n    showTeams\n    showAutofillApplicationsBox\n    logoWordmarkImageUrl\n    logoSquareImageUrl\n    applicationSubmittedSuccessMessage\n    jobBoardTopDescriptionHtml\n    jobBoardBottomDescriptionHtml\n    __typename\n  }\n  appConfirmationTrackingPixelHtml\n  recruitingPrivacyPolicyUrl\n  activeFeatureFlags\n  timezone\n  __typename\n}',
             'variables': {'organizationHostedJobsPageName': self.EMPLOYER_KEY}
         }
         
-        resp = requests.post(
+        data = await self.get_json(
             f'https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiOrganizationFromHostedJobsPageName',
+            method='POST',
             json=post_data
         )
-        data = json.loads(resp.content)
         return data['data']['organization']
     
     def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, job_data=None, website_url=None):
@@ -1494,7 +1635,7 @@ class SmartRecruitersScraper(Scraper):
     async def scrape_jobs(self):
         page_idx = 0
         while True:
-            jobs_html = self.get_page_data(page_idx)
+            jobs_html = await self.get_page_data(page_idx)
             if not jobs_html:
                 break
             job_links = jobs_html.xpath('//a/@href').getall()
@@ -1508,10 +1649,10 @@ class SmartRecruitersScraper(Scraper):
     def get_start_url(self):
         return f'https://careers.smartrecruiters.com/{self.EMPLOYER_KEY}/'
     
-    def get_page_data(self, page_idx):
+    async def get_page_data(self, page_idx):
         request_url = f'https://careers.smartrecruiters.com/{self.EMPLOYER_KEY}/api/more?page={page_idx}'
-        resp = requests.get(request_url)
-        html_text = resp.content
+        async with self.get_shared_client_session().get(request_url) as resp:
+            html_text = await resp.read()
         if not html_text:
             return None
         return Selector(text=html_text.decode('latin-1'))
@@ -1565,7 +1706,7 @@ class SmartRecruitersApiScraper(Scraper):
         start_job_idx = 0
         jobs = []
         while (not has_started) or (start_job_idx < total_jobs):
-            jobs_list, total_jobs = self.get_jobs(start_job_idx)
+            jobs_list, total_jobs = await self.get_jobs(start_job_idx)
             jobs += jobs_list
             start_job_idx += self.JOBS_PER_PAGE
             has_started = True
@@ -1578,27 +1719,28 @@ class SmartRecruitersApiScraper(Scraper):
     def get_job_link(self, job_id):
         return f'https://jobs.smartrecruiters.com/{self.EMPLOYER_KEY}/{job_id}'
     
-    def get_jobs(self, job_idx):
+    async def get_jobs(self, job_idx):
         request_data = {
             'limit': self.JOBS_PER_PAGE,
             'offset': job_idx
         }
-        jobs_resp = requests.get(
+        jobs_data = await self.get_json(
             f'https://api.smartrecruiters.com/v1/companies/{self.EMPLOYER_KEY}/postings',
             params=request_data
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['content'], jobs_data['totalFound']
     
-    def get_raw_job_data(self, job_id):
-        job_resp = requests.get(f'https://api.smartrecruiters.com/v1/companies/{self.EMPLOYER_KEY}/postings/{job_id}')
-        return json.loads(job_resp.content)
+    async def get_raw_job_data(self, job_id):
+        return await self.get_json(f'https://api.smartrecruiters.com/v1/companies/{self.EMPLOYER_KEY}/postings/{job_id}')
+    
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_raw_job_data(job_id)
     
     def get_job_description_section(self, jd_section):
         return f'<h6>{jd_section["title"]}</h6>{jd_section["text"]}'
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None):
-        job_data = self.get_raw_job_data(job_id)
+    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, detail_data=None):
+        job_data = detail_data
         job_description_data = job_data['jobAd']['sections']
         job_description = ''.join([
             self.get_job_description_section(s) for s in [
@@ -1729,7 +1871,7 @@ class EightfoldScraper(Scraper):
         start_job_idx = 0
         jobs = []
         while (not total_jobs) or (start_job_idx < total_jobs):
-            jobs_list, total_jobs = self.get_jobs(start_job_idx)
+            jobs_list, total_jobs = await self.get_jobs(start_job_idx)
             jobs += jobs_list
             start_job_idx += self.JOBS_PER_PAGE
         
@@ -1741,23 +1883,24 @@ class EightfoldScraper(Scraper):
     def get_job_link(self, job_data):
         return f'https://careers.{self.EMPLOYER_KEY}.com/careers?pid={job_data["id"]}'
     
-    def get_jobs(self, next_page_start):
+    async def get_jobs(self, next_page_start):
         request_data = {
             'sort_by': 'relevance',
             'num': self.JOBS_PER_PAGE,
             'start': next_page_start
         }
         request_url = f'https://careers.{self.EMPLOYER_KEY}.com/api/apply/v2/jobs'
-        jobs_resp = requests.get(request_url, params=request_data)
-        jobs_data = json.loads(jobs_resp.content)
+        jobs_data = await self.get_json(request_url, params=request_data)
         return jobs_data['positions'], jobs_data['count']
     
-    def get_raw_job_data(self, job_id):
-        job_resp = requests.get(f'https://careers.{self.EMPLOYER_KEY}.com/api/apply/v2/jobs/{job_id}')
-        return json.loads(job_resp.content)
+    async def get_raw_job_data(self, job_id):
+        return await self.get_json(f'https://careers.{self.EMPLOYER_KEY}.com/api/apply/v2/jobs/{job_id}')
+    
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_raw_job_data(job_id)
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None):
-        job_data = self.get_raw_job_data(job_id)
+    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, detail_data=None):
+        job_data = detail_data
         job_description = job_data['job_description']
         description_compensation_data = parse_compensation_text(job_description)
         locations = job_data['locations']
@@ -1837,7 +1980,7 @@ class RipplingScraper(Scraper):
     ATS_NAME = 'Rippling'
     
     async def scrape_jobs(self):
-        jobs = self.get_jobs()
+        jobs = await self.get_jobs()
         for job in jobs:
             await self.add_job_links_to_queue(job['url'], meta_data={
                 'job_department': job['department']['label'],
@@ -1847,12 +1990,11 @@ class RipplingScraper(Scraper):
         
         await self.close()
     
-    def get_jobs(self):
-        jobs_resp = requests.get(
+    async def get_jobs(self):
+        return await self.get_json(
             f'https://app.rippling.com/api/ats2_provisioning/api/v1/board/{self.EMPLOYER_KEY}/jobs',
             headers={'User-Agent': get_random_user_agent()},
         )
-        return json.loads(jobs_resp.content.decode('utf-8'))
     
     def get_job_data_from_html(self, html, job_url=None, job_department=None, job_title=None, location=None):
         description = html.xpath('//div[@class="ATS_htmlPreview"]').get()
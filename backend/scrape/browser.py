@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from playwright.async_api import async_playwright
+
+from scrape.base_scrapers import get_random_user_agent
+
+logger = logging.getLogger(__name__)
+JS_LOAD_WAIT_MS = 30000 if settings.DEBUG else 60000
+
+
+def get_default_headers():
+    return {
+        'User-Agent': get_random_user_agent(),
+        'Referer': 'https://www.google.com',
+        'Origin': 'https://www.google.com',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Accept': '*/*'
+    }
+
+
+class BrowserPool:
+    """A single long-lived Chromium instance which hands out reusable browser contexts.
+    Contexts are recycled after they have opened MAX_PAGES_PER_CONTEXT pages or if the
+    scraper using them fails. If the browser crashes, it is relaunched on the next request.
+    """
+    MAX_CONTEXTS = 4
+    MAX_PAGES_PER_CONTEXT = 250
+
+    def __init__(self, max_contexts=MAX_CONTEXTS, max_pages_per_context=MAX_PAGES_PER_CONTEXT):
+        self.max_pages_per_context = max_pages_per_context
+        self.playwright = None
+        self.browser = None
+        self.idle_contexts = []
+        self.context_page_counts = {}
+        self.context_sem = asyncio.Semaphore(max_contexts)
+        self.browser_lock = asyncio.Lock()
+
+    async def get_browser(self):
+        async with self.browser_lock:
+            if self.browser and self.browser.is_connected():
+                return self.browser
+
+            if self.browser:
+                logger.warning('Browser disconnected. Relaunching browser')
+                self.idle_contexts = []
+                self.context_page_counts = {}
+            if not self.playwright:
+                self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            return self.browser
+
+    async def new_context(self):
+        browser = await self.get_browser()
+        browser_context = await browser.new_context()
+        browser_context.set_default_timeout(JS_LOAD_WAIT_MS)
+        await browser_context.set_geolocation({'latitude': 34.02016, 'longitude': -118.44472})
+        await browser_context.set_extra_http_headers(get_default_headers())
+        self.context_page_counts[browser_context] = 0
+
+        def count_page(page):
+            self.context_page_counts[browser_context] = self.context_page_counts.get(browser_context, 0) + 1
+
+        browser_context.on('page', count_page)
+        return browser_context
+
+    async def acquire_context(self):
+        while self.idle_contexts:
+            browser_context = self.idle_contexts.pop()
+            if self.browser and self.browser.is_connected():
+                return browser_context
+            await self.close_context(browser_context)
+        return await self.new_context()
+
+    async def release_context(self, browser_context, is_healthy):
+        is_reusable = (
+            is_healthy
+            and self.browser and self.browser.is_connected()
+            and self.context_page_counts.get(browser_context, 0) < self.max_pages_per_context
+        )
+        if not is_reusable:
+            await self.close_context(browser_context)
+            return
+
+        try:
+            # Reset any state set by the previous scraper
+            for page in browser_context.pages:
+                await page.close()
+            await browser_context.clear_cookies()
+            await browser_context.set_extra_http_headers(get_default_headers())
+        except Exception as e:
+            logger.info(f'Unable to reset browser context. Recycling context: {e}')
+            await self.close_context(browser_context)
+            return
+        self.idle_contexts.append(browser_context)
+
+    async def close_context(self, browser_context):
+        self.context_page_counts.pop(browser_context, None)
+        try:
+            await browser_context.close()
+        except Exception:
+            # The browser may have crashed in which case the context is already gone
+            pass
+
+    @asynccontextmanager
+    async def get_context(self):
+        async with self.context_sem:
+            browser_context = await self.acquire_context()
+            is_healthy = True
+            try:
+                yield browser_context
+            except BaseException:
+                is_healthy = False
+                raise
+            finally:
+                await self.release_context(browser_context, is_healthy)
+
+    async def close(self):
+        for browser_context in self.idle_contexts:
+            await self.close_context(browser_context)
+        self.idle_contexts = []
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
@@ -1,7 +1,3 @@
-import json
-
-import requests
-
 from jvapp.utils.datetime import get_datetime_format_or_none, get_datetime_or_none
 from jvapp.utils.money import parse_compensation_text
 from scrape.base_scrapers import Scraper
@@ -19,7 +15,7 @@ class AmazonScraper(Scraper):
         start_job_idx = 0
         jobs = []
         while (not total_jobs) or (start_job_idx < total_jobs):
-            jobs_list, total_jobs = self.get_jobs(start_job_idx)
+            jobs_list, total_jobs = await self.get_jobs(start_job_idx)
             jobs += jobs_list
             start_job_idx += self.JOBS_PER_PAGE
         
@@ -31,18 +27,19 @@ class AmazonScraper(Scraper):
     def get_job_link(self, job_data):
         return f'https://www.amazon.jobs{job_data["job_path"]}'
     
-    def get_jobs(self, next_page_start):
-        request_data = {
-            'sort_by': 'relevance',
-            'result_limit': self.JOBS_PER_PAGE,
-            'offset': next_page_start,
-            'normalized_country_code[]': ['USA', 'CAN']
-        }
-        jobs_resp = requests.get(
+    async def get_jobs(self, next_page_start):
+        # aiohttp needs repeated query params as a list of pairs
+        request_data = [
+            ('sort_by', 'relevance'),
+            ('result_limit', self.JOBS_PER_PAGE),
+            ('offset', next_page_start),
+            ('normalized_country_code[]', 'USA'),
+            ('normalized_country_code[]', 'CAN'),
+        ]
+        jobs_data = await self.get_json(
             f'https://www.amazon.jobs/en/search.json',
             params=request_data
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['jobs'], jobs_data['hits']
     
     def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, job_data=None):
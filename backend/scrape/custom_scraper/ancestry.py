@@ -7,6 +7,7 @@ from scrape.job_processor import JobItem
 
 class AncestryScraper(Scraper):
     ATS_NAME = 'Custom'
+    IS_JS_START_PAGE = True
     USE_HEADERS = False
     employer_name = 'Ancestry'
     start_url = 'https://careers.ancestry.com/jobs/search'
@@ -1,7 +1,3 @@
-import json
-
-import requests
-
 from jvapp.utils.datetime import get_datetime_format_or_none, get_datetime_or_none
 from jvapp.utils.money import parse_compensation_text
 from scrape.base_scrapers import Scraper
@@ -19,7 +15,7 @@ class DocuSignScraper(Scraper):
         page_idx = 1
         jobs_count = 0
         while (not total_jobs) or (jobs_count < total_jobs):
-            jobs_list, total_jobs = self.get_jobs(page_idx)
+            jobs_list, total_jobs = await self.get_jobs(page_idx)
             page_idx += 1
             jobs_count += self.JOBS_PER_PAGE
         
@@ -31,18 +27,18 @@ class DocuSignScraper(Scraper):
     def get_job_link(self, job_id):
         return f'https://careers.docusign.com/jobs/{job_id}'
     
-    def get_jobs(self, page_idx):
+    async def get_jobs(self, page_idx):
+        # aiohttp doesn't accept booleans as query params
         request_data = {
             'page': page_idx,
             'sortBy': 'relevance',
-            'descending': False,
-            'internal': False
+            'descending': 'False',
+            'internal': 'False'
         }
-        jobs_resp = requests.get(
+        jobs_data = await self.get_json(
             f'https://careers.docusign.com/api/jobs',
             params=request_data
         )
-        jobs_data = json.loads(jobs_resp.content)
         return [j['data'] for j in jobs_data['jobs']], jobs_data['totalCount']
     
     def get_location_text(self, location_dict):
@@ -1,7 +1,3 @@
-import json
-
-import requests
-
 from jvapp.utils.datetime import get_datetime_format_or_none, get_datetime_or_none
 from jvapp.utils.money import parse_compensation_text
 from scrape.base_scrapers import Scraper
@@ -20,7 +16,7 @@ class MicrosoftScraper(Scraper):
         page_idx = 1
         jobs_count = 0
         while (not total_jobs) or (jobs_count < total_jobs):
-            jobs_list, total_jobs = self.get_jobs(page_idx)
+            jobs_list, total_jobs = await self.get_jobs(page_idx)
             page_idx += 1
             jobs_count += self.JOBS_PER_PAGE
             
@@ -32,27 +28,28 @@ class MicrosoftScraper(Scraper):
     def get_job_link(self, job_id):
         return f'https://jobs.careers.microsoft.com/global/en/job/{job_id}'
     
-    def get_jobs(self, page_idx):
+    async def get_jobs(self, page_idx):
         query_params = {
             'l': 'en_us',
             'pg': page_idx,
             'pgSz': self.JOBS_PER_PAGE,
             'o': 'Relevance'
         }
-        jobs_resp = requests.get(
+        jobs_data = await self.get_json(
             'https://gcsservices.careers.microsoft.com/search/api/v1/search',
             params=query_params
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['operationResult']['result']['jobs'], jobs_data['operationResult']['result']['totalJobs']
     
-    def get_raw_job_data(self, job_id):
-        job_resp = requests.get(f'https://gcsservices.careers.microsoft.com/search/api/v1/job/{job_id}')
-        data = json.loads(job_resp.content)
+    async def get_raw_job_data(self, job_id):
+        data = await self.get_json(f'https://gcsservices.careers.microsoft.com/search/api/v1/job/{job_id}')
         return data['operationResult']['result']
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, job_data=None):
-        extra_job_data = self.get_raw_job_data(job_data['jobId'])
+    async def get_job_detail_data(self, job_data=None, **kwargs):
+        return await self.get_raw_job_data(job_data['jobId'])
+    
+    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, job_data=None, detail_data=None):
+        extra_job_data = detail_data
         description = job_data['properties']['description']
         description_compensation_data = parse_compensation_text(description)
         description = ''.join([x for x in [description, extra_job_data['responsibilities'], extra_job_data['qualifications']] if x])
@@ -1,7 +1,3 @@
-import json
-
-import requests
-
 from jvapp.utils.datetime import get_datetime_format_or_none, get_datetime_or_none
 from jvapp.utils.money import parse_compensation_text
 from scrape.base_scrapers import Scraper
@@ -15,7 +11,7 @@ class PacksizeScraper(Scraper):
     IS_REMOVE_QUERY_PARAMS = False
     
     async def scrape_jobs(self):
-        jobs = self.get_jobs()
+        jobs = await self.get_jobs()
         for job in jobs:
             await self.add_job_links_to_queue(self.get_job_link(job), meta_data={'job_id': job['id']})
         
@@ -24,19 +20,20 @@ class PacksizeScraper(Scraper):
     def get_job_link(self, job_data):
         return f'{self.start_url}?jobId={job_data["id"]}/'
     
-    def get_jobs(self):
-        jobs_resp = requests.get(
+    async def get_jobs(self):
+        jobs_data = await self.get_json(
             'https://careers-api.clearcompany.com/v1/5f0810da-bb55-02f2-0b2e-336973c249e1'
         )
-        jobs_data = json.loads(jobs_resp.content)
         return jobs_data['results']
     
-    def get_raw_job_data(self, job_id):
-        job_resp = requests.get(f'https://careers-api.clearcompany.com/v1/5f0810da-bb55-02f2-0b2e-336973c249e1/{job_id}')
-        return json.loads(job_resp.content)
+    async def get_raw_job_data(self, job_id):
+        return await self.get_json(f'https://careers-api.clearcompany.com/v1/5f0810da-bb55-02f2-0b2e-336973c249e1/{job_id}')
+    
+    async def get_job_detail_data(self, job_id=None, **kwargs):
+        return await self.get_raw_job_data(job_id)
     
-    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None):
-        job_data = self.get_raw_job_data(job_id)
+    def get_job_data_from_html(self, html, job_url=None, job_department=None, job_id=None, detail_data=None):
+        job_data = detail_data
         description = job_data['description']
         description_compensation_data = parse_compensation_text(description)
         location_text = ', '.join([
@@ -149,7 +149,7 @@ def parse_workable_xml_jobs():
                 )
                 employer.save()
             skip_urls = get_recent_scraped_job_urls(employer.employer_name)
-            job_processor = ScrapedJobProcessor(employer)
+            job_processor = ScrapedJobProcessor(employer, is_batch=False)
         
         current_employer_name = job_row['employer_name']
         
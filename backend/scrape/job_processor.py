@@ -11,7 +11,8 @@ from jvapp.models.abstract import PermissionTypes
 from jvapp.models.employer import EmployerJob, JobDepartment
 from jvapp.utils.file import get_file_extension
 from jvapp.utils.image import convert_url_to_image
-from jvapp.utils.sanitize import sanitize_html
+from jvapp.utils.job_search import refresh_job_search
+from jvapp.utils.sanitize import get_sanitize_key, sanitize_html, sanitize_html_many
 from jvapp.utils.taxonomy import run_job_title_standardization
 
 
@@ -23,6 +24,7 @@ class JobItem:
     locations: list = None
     job_department: str = None
     job_description: str = None
+    description_source_hash: Union[str, None] = None  # Hash of the description before it was sanitized
     employment_type: Union[str, None] = None
     first_posted_date: Union[datetime.date, None] = None
     salary_currency: Union[str, None] = None
@@ -89,17 +91,28 @@ class JobProcessor:
             self.employer.save()
     
     def get_job_locations(self, job_item: JobItem):
-        if job_item.locations and (not isinstance(job_item.locations, list)):
-            job_item.locations = [job_item.locations]
-        locations = list(set([
-            self.location_parser.get_location(self.add_remote_to_location(loc, job_item.job_title))
-            for loc in set(job_item.locations) if loc
-        ]))
+        locations = list(set(self.location_parser.get_locations(
+            self.get_location_texts(job_item)
+        ).values()))
         location_ids = [l.id for l in locations]
         location_ids.sort()
         location_ids = tuple(location_ids)
         return locations, location_ids
     
+    def get_location_texts(self, job_item: JobItem):
+        if job_item.locations and (not isinstance(job_item.locations, list)):
+            job_item.locations = [job_item.locations]
+        return list({
+            self.add_remote_to_location(loc, job_item.job_title)
+            for loc in set(job_item.locations or []) if loc
+        })
+    
+    def resolve_job_locations(self, job_items):
+        """Geocode the locations of many jobs at once so uncached locations are resolved concurrently"""
+        self.location_parser.get_locations(list({
+            location_text for job_item in job_items for location_text in self.get_location_texts(job_item)
+        }))
+    
     def process_job(self, job_item: JobItem, user=None):
         raise NotImplemented()
     
@@ -110,6 +123,7 @@ class JobProcessor:
         if any([
             job.application_url != job_item.application_url,
             job.job_description != job_item.job_description,
+            job.description_source_hash != job_item.description_source_hash,
             job.employment_type != job_item.employment_type,
             job.job_department != job_department,
             job.salary_floor != job_item.salary_floor,
@@ -123,9 +137,15 @@ class JobProcessor:
         return True
     
     def update_job(self, job: EmployerJob, job_item: JobItem):
+        self.set_job_fields(job, job_item)
+        job.save()  # Updates the modified_dt even if the job is the same
+        return job
+    
+    def set_job_fields(self, job: EmployerJob, job_item: JobItem):
+        """Update the job's attributes from the job item without saving. Returns False if the job is unchanged
+        """
         if self.is_same_job(job, job_item):
-            job.save()  # Updates the modified_dt
-            return job
+            return False
         
         for field in (
             'application_url', 'job_description', 'employment_type', 'salary_floor', 'salary_ceiling', 'salary_interval'
@@ -134,6 +154,9 @@ class JobProcessor:
                 continue
             setattr(job, field, getattr(job_item, field))
         
+        if 'job_description' not in self.ignore_fields:
+            job.description_source_hash = job_item.description_source_hash
+        
         if 'job_department' not in self.ignore_fields:
             job.job_department = self.get_or_create_job_department(job_item)
         if 'salary_currency' not in self.ignore_fields:
@@ -147,8 +170,7 @@ class JobProcessor:
         
         job.open_date = job.open_date or job_item.first_posted_date or timezone.now().date()
         job.close_date = None
-        job.save()
-        return job
+        return True
     
     def get_or_create_job_department(self, job_item: JobItem):
         if not job_item.job_department:
@@ -194,18 +216,43 @@ class UserCreatedJobProcessor(JobProcessor):
             if existing_job_by_url:
                 existing_job.locations.set(locations)
             run_job_title_standardization(job_filter=Q(id=existing_job.id))
+            refresh_job_search(job_filter=Q(id=existing_job.id))
             return existing_job, False
         
         new_job.employer = self.employer
         self.update_job(new_job, job_item)
         new_job.locations.set(locations)
         run_job_title_standardization(job_filter=Q(id=new_job.id))
+        refresh_job_search(job_filter=Q(id=new_job.id))
         
         return new_job, True
 
 
 class ScrapedJobProcessor(JobProcessor):
+    """Jobs are saved in batches by default. Each batch is saved with a handful of queries
+    (bulk create, bulk update, location through table inserts, and a modified_dt bump for unchanged jobs)
+    """
     IS_JOB_SCRAPED = True
+    BATCH_SIZE = 500
+    BATCH_UPDATE_FIELDS = [
+        'application_url', 'job_description', 'description_source_hash', 'employment_type', 'salary_floor',
+        'salary_ceiling', 'salary_interval', 'job_department', 'is_job_approved', 'created_user', 'open_date', 'close_date',
+        'modified_dt'
+    ]
+    
+    def __init__(self, employer, ignore_fields=None, is_use_location_caching=True, is_batch=True):
+        super().__init__(employer, ignore_fields=ignore_fields, is_use_location_caching=is_use_location_caching)
+        self.is_batch = is_batch
+        self.reset_batch()
+    
+    def reset_batch(self):
+        self.new_jobs = []
+        self.updated_jobs = {}
+        self.unchanged_job_ids = set()
+        self.job_locations = {}
+    
+    def get_batch_size(self):
+        return len(self.new_jobs) + len(self.updated_jobs) + len(self.unchanged_job_ids)
     
     def get_existing_jobs(self, employer):
         return EmployerJob.objects.prefetch_related('locations').filter(
@@ -213,11 +260,13 @@ class ScrapedJobProcessor(JobProcessor):
             is_scraped=True
         )
     
-    def process_job(self, job_item: JobItem, user=None):
+    def process_job(self, job_item: JobItem, user=None, is_description_sanitized=False):
         """Create or update an EmployerJob
         """
         self.save_employer(job_item)
-        job_item.job_description = sanitize_html(job_item.job_description)
+        if not is_description_sanitized:
+            job_item.description_source_hash = self.get_description_source_hash(job_item.job_description)
+            job_item.job_description = sanitize_html(job_item.job_description)
         job_item.employment_type = job_item.employment_type or self.default_employment_type
         locations, location_ids = self.get_job_locations(job_item)
         
@@ -230,27 +279,110 @@ class ScrapedJobProcessor(JobProcessor):
         existing_job_by_key = self.get_job_by_key(new_job.job_title, location_ids)
         existing_job_by_url = self.jobs_by_url.get(job_item.application_url)
         if existing_job_by_key:
-            self.update_job(existing_job_by_key, job_item)
             job = existing_job_by_key
             is_update_locations = False
         elif existing_job_by_url:
-            self.update_job(existing_job_by_url, job_item)
             job = existing_job_by_url
         else:
             new_job.employer = self.employer
-            self.update_job(new_job, job_item)
-            self.jobs_by_key[EmployerJob.generate_job_key(new_job.job_title, location_ids)] = new_job
-            self.jobs_by_url[new_job.application_url] = new_job
             job = new_job
             is_new_job = True
         
+        if self.is_batch:
+            self.add_job_to_batch(job, job_item, is_new_job)
+        else:
+            self.update_job(job, job_item)
+        
+        if is_new_job:
+            self.jobs_by_key[EmployerJob.generate_job_key(new_job.job_title, location_ids)] = new_job
+            self.jobs_by_url[new_job.application_url] = new_job
+        
         if is_update_locations:
-            job.locations.set(locations)
+            if self.is_batch:
+                self.job_locations[id(job)] = (job, locations)
+            else:
+                job.locations.set(locations)
         self.found_job_keys.add(EmployerJob.generate_job_key(job.job_title, location_ids))
         self.found_job_urls.add(job.application_url)
         
         return job, is_new_job
     
+    def process_jobs(self, job_items):
+        if not self.is_batch:
+            return super().process_jobs(job_items)
+        
+        self.resolve_job_locations(job_items)
+        # Descriptions that haven't changed since the last scrape aren't sanitized again
+        # and large batches of the rest are sanitized across processes
+        known_job_descriptions = {
+            job.description_source_hash: job.job_description for job in self.jobs_by_url.values()
+            if job.description_source_hash and job.job_description is not None
+        }
+        job_descriptions = sanitize_html_many(
+            [job_item.job_description for job_item in job_items], known_sanitized_texts=known_job_descriptions
+        )
+        for job_item, job_description in zip(job_items, job_descriptions):
+            job_item.description_source_hash = self.get_description_source_hash(job_item.job_description)
+            job_item.job_description = job_description
+            self.process_job(job_item, is_description_sanitized=True)
+            if self.get_batch_size() >= self.BATCH_SIZE:
+                self.save_batch()
+        self.save_batch()
+    
+    @staticmethod
+    def get_description_source_hash(job_description):
+        return get_sanitize_key(job_description) if job_description else None
+    
+    def add_job_to_batch(self, job: EmployerJob, job_item: JobItem, is_new_job):
+        is_changed = self.set_job_fields(job, job_item)
+        if is_new_job:
+            self.new_jobs.append(job)
+        elif not job.id:
+            # This is a new job from the current batch. The job fields have been updated and it will be created
+            return
+        elif is_changed:
+            self.unchanged_job_ids.discard(job.id)
+            self.updated_jobs[job.id] = job
+        elif job.id not in self.updated_jobs:
+            self.unchanged_job_ids.add(job.id)
+    
+    def save_batch(self):
+        now = timezone.now()
+        
+        if self.new_jobs:
+            # Bulk create doesn't return primary keys for MySQL so we look them up using the unique job key
+            for job in self.new_jobs:
+                job.created_dt = now
+                job.modified_dt = now
+            EmployerJob.objects.bulk_create(self.new_jobs, batch_size=self.BATCH_SIZE)
+            job_ids_by_key = {
+                job_key: job_id for job_key, job_id in
+                EmployerJob.objects.filter(job_key__in=[j.job_key for j in self.new_jobs]).values_list('job_key', 'id')
+            }
+            for job in self.new_jobs:
+                job.id = job_ids_by_key[job.job_key]
+        
+        if self.updated_jobs:
+            for job in self.updated_jobs.values():
+                job.modified_dt = now
+            EmployerJob.objects.bulk_update(
+                list(self.updated_jobs.values()), self.BATCH_UPDATE_FIELDS, batch_size=self.BATCH_SIZE
+            )
+        
+        if self.unchanged_job_ids:
+            EmployerJob.objects.filter(id__in=self.unchanged_job_ids).update(modified_dt=now)
+        
+        if self.job_locations:
+            JobLocation = EmployerJob.locations.through
+            job_ids = [job.id for job, _ in self.job_locations.values()]
+            JobLocation.objects.filter(employerjob_id__in=job_ids).delete()
+            JobLocation.objects.bulk_create([
+                JobLocation(employerjob_id=job.id, location_id=location.id)
+                for job, locations in self.job_locations.values() for location in locations
+            ], batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        
+        self.reset_batch()
+    
     def finalize_data(self, skipped_job_urls):
         # Set the close date of a job if it no longer exists on the employers job page
         close_jobs = []
@@ -273,3 +405,4 @@ class ScrapedJobProcessor(JobProcessor):
         self.employer.save()
         
         run_job_title_standardization(job_filter=Q(employer_id=self.employer.id), is_non_standardized_only=True)
+        refresh_job_search(job_filter=Q(employer_id=self.employer.id))
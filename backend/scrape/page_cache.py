@@ -0,0 +1,135 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Union
+
+from django.utils import timezone
+
+from jvapp.models.employer import EmployerJob
+from jvapp.models.tracking import ScrapedPageCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageCacheEntry:
+    url: str
+    content_hash: str
+    etag: Union[str, None] = None
+    last_modified: Union[str, None] = None
+
+
+class PageCache:
+    """Cache of job pages from the previous scrape of an employer. If a page hasn't changed
+    (304 Not Modified or the same content hash), there is no need to parse it or update the job.
+    This object is passed to a worker process so it should only hold picklable data
+    """
+    MAX_ENTRIES_PER_EMPLOYER = 20000
+    MAX_AGE_DAYS = 30  # Pages that haven't been seen in this long are for jobs that have been removed
+    
+    def __init__(self, employer_id, entries):
+        self.employer_id = employer_id
+        self.entries = {entry.url: entry for entry in entries}
+        self.new_entries = {}
+        self.hit_urls = set()
+        self.stats = {'hits': 0, 'not_modified': 0, 'misses': 0}
+    
+    @classmethod
+    def load(cls, employer):
+        # Only open jobs can be skipped. Otherwise a job that was closed would never re-open
+        open_job_urls = EmployerJob.objects.filter(
+            employer=employer,
+            is_scraped=True,
+            close_date__isnull=True
+        ).values_list('application_url', flat=True)
+        return cls(employer.id, [
+            PageCacheEntry(
+                url=cache['url'],
+                content_hash=cache['content_hash'],
+                etag=cache['etag'],
+                last_modified=cache['last_modified']
+            ) for cache in ScrapedPageCache.objects.filter(
+                employer_id=employer.id, url__in=open_job_urls
+            ).values('url', 'content_hash', 'etag', 'last_modified')
+        ])
+    
+    @staticmethod
+    def get_content_hash(content: str):
+        return hashlib.sha1(bytes(content, 'UTF-8')).hexdigest()
+    
+    def get_conditional_headers(self, url):
+        if not (entry := self.entries.get(url)):
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+    
+    def add_not_modified(self, url):
+        """The server responded with a 304 to a conditional request"""
+        self.stats['not_modified'] += 1
+        self.hit_urls.add(url)
+    
+    def is_unchanged(self, url, content_hash):
+        entry = self.entries.get(url)
+        if entry and entry.content_hash == content_hash:
+            self.stats['hits'] += 1
+            self.hit_urls.add(url)
+            return True
+        self.stats['misses'] += 1
+        return False
+    
+    def add(self, url, content_hash, etag=None, last_modified=None):
+        self.new_entries[url] = PageCacheEntry(
+            url=url, content_hash=content_hash, etag=etag, last_modified=last_modified
+        )
+    
+    def get_stats_text(self):
+        return (
+            f'{self.stats["hits"]} unchanged, {self.stats["not_modified"]} not modified, '
+            f'{self.stats["misses"]} changed or new'
+        )
+    
+    def save(self):
+        now = timezone.now()
+        ScrapedPageCache.objects.bulk_create(
+            [
+                ScrapedPageCache(
+                    employer_id=self.employer_id,
+                    url=entry.url,
+                    content_hash=entry.content_hash,
+                    etag=entry.etag and entry.etag[:200],
+                    last_modified=entry.last_modified and entry.last_modified[:50],
+                    created_dt=now,
+                    modified_dt=now
+                ) for entry in self.new_entries.values() if len(entry.url) <= 300
+            ],
+            # MySQL upserts on any unique key (url) and doesn't support specifying unique_fields
+            update_conflicts=True,
+            update_fields=['employer', 'content_hash', 'etag', 'last_modified', 'modified_dt'],
+            batch_size=1000
+        )
+        if self.hit_urls:
+            ScrapedPageCache.objects.filter(url__in=self.hit_urls).update(modified_dt=now)
+        self.evict()
+    
+    def clear(self):
+        self.entries = {}
+        self.new_entries = {}
+        self.hit_urls = set()
+    
+    def evict(self):
+        """Remove this employer's pages that haven't been seen recently and the least recently
+        used pages once the employer's cache exceeds its max size
+        """
+        employer_pages = ScrapedPageCache.objects.filter(employer_id=self.employer_id)
+        employer_pages.filter(modified_dt__lt=timezone.now() - timedelta(days=self.MAX_AGE_DAYS)).delete()
+        cutoff_dts = list(
+            employer_pages.order_by('-modified_dt')
+            .values_list('modified_dt', flat=True)[self.MAX_ENTRIES_PER_EMPLOYER:self.MAX_ENTRIES_PER_EMPLOYER + 1]
+        )
+        if cutoff_dts:
+            employer_pages.filter(modified_dt__lte=cutoff_dts[0]).delete()
@@ -1,53 +1,132 @@
 import asyncio
 import logging
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import django
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import connections
 from django.utils import timezone
-from playwright.async_api import async_playwright
 
 from jvapp.models.employer import ApplicantTrackingSystem, Employer
-from scrape.base_scrapers import get_random_user_agent, get_recent_scraped_job_urls
+from scrape.base_scrapers import get_recent_scraped_job_urls
+from scrape.browser import BrowserPool
 from scrape.custom_scraper.workableAts import workable_scrapers
 from scrape.employer_scrapers import all_scrapers, test_scrapers
 from scrape.job_processor import ScrapedJobProcessor
+from scrape.page_cache import PageCache
 
 logger = logging.getLogger(__name__)
-JS_LOAD_WAIT_MS = 30000 if settings.DEBUG else 60000
+MAX_CONCURRENT_SCRAPERS = 8
+MAX_CONCURRENT_SCRAPERS_PER_ATS = 3  # Avoid hammering a single ATS host
+MAX_PROCESS_WORKERS = os.cpu_count() or 1
 
 
-async def get_browser(playwright):
-    browser = await playwright.chromium.launch(headless=True)
-    browser_context = await browser.new_context()
-    browser_context.set_default_timeout(JS_LOAD_WAIT_MS)
-    await browser_context.set_geolocation({'latitude': 34.02016, 'longitude': -118.44472})
-    await browser_context.set_extra_http_headers({
-        'User-Agent': get_random_user_agent(),
-        'Referer': 'https://www.google.com',
-        'Origin': 'https://www.google.com',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Accept': '*/*'
-    })
-    return browser, browser_context
+async def run_scraper(scraper):
+    try:
+        await scraper.scrape_jobs()
+    except Exception:
+        await scraper.close_connections()
+        raise
+    return scraper
 
-        
-async def launch_scraper(scraper_class, skip_urls):
+
+async def launch_scraper(scraper_class, skip_urls, page_cache, browser_pool):
+    # API and HTML scrapers never need a browser
+    if not scraper_class.is_browser_required():
+        return await run_scraper(scraper_class(None, None, skip_urls, page_cache=page_cache))
+    
     # Scrape jobs from web pages
-    async with async_playwright() as p:
-        browser, browser_context = await get_browser(p)
-        scraper = scraper_class(p, browser_context, skip_urls)
-        try:
-            async_scrapers = [scraper.scrape_jobs()]
-            await asyncio.gather(*async_scrapers)
-        except Exception:
-            await scraper.close_connections()
-            raise
-        await browser_context.close()
-        await browser.close()
-    return scraper
+    async with browser_pool.get_context() as browser_context:
+        return await run_scraper(
+            scraper_class(browser_pool.playwright, browser_context, skip_urls, page_cache=page_cache)
+        )
     
     
-def run_job_scrapers(employer_names=None):
+def process_scraped_jobs(employer_id, job_items, skipped_urls, page_cache):
+    """Save scraped jobs to the database. This runs in a worker process (or thread) so that
+    DB processing for multiple employers can run in parallel with scraping
+    """
+    employer = Employer.objects.get(id=employer_id)
+    try:
+        job_processor = ScrapedJobProcessor(employer)
+        logger.info(f'Processing jobs for {employer.employer_name}')
+        job_processor.process_jobs(job_items)
+        logger.info(f'Finalizing all data for {employer.employer_name}')
+        job_processor.finalize_data(skipped_urls)
+        if page_cache:
+            # Only cache pages once the jobs have been saved. Otherwise a failure would cause them to be skipped
+            page_cache.save()
+        logger.info(f'Scraping complete for {employer.employer_name}')
+    finally:
+        connections.close_all()
+
+
+async def run_employer_scraper(
+        scraper_class, employer, skip_urls, is_use_page_cache, scraper_semaphore, ats_semaphore, browser_pool,
+        process_pool
+):
+    # Allow scrapers to fail so it doesn't impact other scrapers
+    scraper = None
+    try:
+        # The ATS slot is taken first so employers waiting on a busy ATS don't hold slots other ATSs could use
+        async with ats_semaphore, scraper_semaphore:
+            logger.info(f'Starting scraper for {scraper_class.employer_name}')
+            try:
+                # The page cache is loaded once the employer has a slot so only running employers hold one in memory
+                page_cache = await sync_to_async(PageCache.load)(employer) if is_use_page_cache else None
+                scraper = await launch_scraper(scraper_class, skip_urls, page_cache, browser_pool)
+            finally:
+                logger.info(f'Running `finally` block for {scraper_class.employer_name}')
+                if scraper:
+                    await scraper.close_connections()
+        
+        # Process raw job data. The scraper slot is released so the next employer can start scraping
+        await asyncio.get_running_loop().run_in_executor(
+            process_pool, process_scraped_jobs, employer.id, scraper.job_items, scraper.skipped_urls,
+            scraper.page_cache
+        )
+        if scraper.page_cache:
+            # The page cache has been saved so its entries don't need to be kept while other employers finish
+            scraper.page_cache.clear()
+        return True
+    except Exception as e:
+        logger.exception(f'Error occurred while scraping jobs for {scraper_class.employer_name} ({scraper_class.ATS_NAME or "Unknown ATS"})', exc_info=e)
+        return False
+
+
+async def run_employer_scrapers(scraper_configs, process_pool):
+    scraper_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPERS)
+    ats_semaphores = defaultdict(lambda: asyncio.Semaphore(MAX_CONCURRENT_SCRAPERS_PER_ATS))
+    browser_pool = BrowserPool(max_contexts=MAX_CONCURRENT_SCRAPERS)
+    try:
+        return await asyncio.gather(*[
+            run_employer_scraper(
+                scraper_class, employer, skip_urls, is_use_page_cache, scraper_semaphore,
+                ats_semaphores[scraper_class.ATS_NAME], browser_pool, process_pool
+            ) for scraper_class, employer, skip_urls, is_use_page_cache in scraper_configs
+        ])
+    finally:
+        await browser_pool.close()
+
+
+def get_job_processing_executor(is_use_processes=True):
+    # Daemon processes (e.g. Celery workers) can't start child processes so jobs are processed in threads
+    if is_use_processes and not multiprocessing.current_process().daemon:
+        # Worker processes are spawned (not forked) so they don't inherit DB connections or the event loop
+        return ProcessPoolExecutor(
+            max_workers=MAX_PROCESS_WORKERS, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup
+        )
+    return ThreadPoolExecutor(max_workers=MAX_PROCESS_WORKERS)
+
+
+def run_job_scrapers(employer_names=None, is_use_processes=True):
+    """
+    :param is_use_processes: If False, scraped jobs are processed in threads instead of worker processes
+    """
     if not employer_names:
         if settings.IS_LOCAL and test_scrapers:
             scraper_classes = list(test_scrapers.values())
@@ -77,13 +156,13 @@ def run_job_scrapers(employer_names=None):
             applicant_tracking_systems[ats_name] = ats
             return ats
     
+    # Employer setup needs the database so it is done up front, before the event loop starts
+    scraper_configs = []
+    failed_employer_ids = []
     for scraper_class in scraper_classes:
-        # Allow scrapers to fail so it doesn't impact other scrapers
         employer = None
         ats = None
-        scraper = None
         try:
-            logger.info(f'Starting scraper for {scraper_class.employer_name}')
             ats = get_or_create_ats(scraper_class.ATS_NAME)
             try:
                 employer = Employer.objects.get(employer_name=scraper_class.employer_name)
@@ -105,23 +184,20 @@ def run_job_scrapers(employer_names=None):
                     continue
             
             skip_urls = []
-            if not employer_names:
+            is_use_page_cache = not employer_names
+            if is_use_page_cache:
                 skip_urls = get_recent_scraped_job_urls(employer.employer_name)
-            scraper = asyncio.run(launch_scraper(scraper_class, skip_urls))
-        
-            # Process raw job data
-            job_processor = ScrapedJobProcessor(employer)
-            logger.info(f'Processing jobs for {scraper_class.employer_name}')
-            job_processor.process_jobs(scraper.job_items)
-            logger.info(f'Finalizing all data for {scraper_class.employer_name}')
-            job_processor.finalize_data(scraper.skipped_urls)
-            logger.info(f'Scraping complete for {scraper_class.employer_name}')
+            scraper_configs.append((scraper_class, employer, skip_urls, is_use_page_cache))
         except Exception as e:
             logger.exception(f'Error occurred while scraping jobs for {scraper_class.employer_name} ({ats.name if ats else "Unknown ATS"})', exc_info=e)
-            if employer:
-                employer.has_job_scrape_failure = True
-                employer.save()
-        finally:
-            logger.info(f'Running `finally` block for {scraper_class.employer_name}')
-            if scraper:
-                asyncio.run(scraper.close_connections())
+            if employer and employer.id:
+                failed_employer_ids.append(employer.id)
+    
+    with get_job_processing_executor(is_use_processes=is_use_processes) as process_pool:
+        scraper_results = asyncio.run(run_employer_scrapers(scraper_configs, process_pool))
+    
+    failed_employer_ids += [
+        employer.id for (_, employer, _, _), is_success in zip(scraper_configs, scraper_results) if not is_success
+    ]
+    if failed_employer_ids:
+        Employer.objects.filter(id__in=failed_employer_ids).update(has_job_scrape_failure=True)